@@ -1,13 +1,28 @@
 import os
-import hashlib
 import json
-import base64
-from typing import Dict, Any, List
-from PIL import Image
-import io
-import requests
+import asyncio
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+from image_analysis import ImageContext, neighbor_variance, share_image, attach_image
+from app.services.gemini_client import get_gemini_client
+from app.services.analysis_pool import AnalysisPool, PoolSaturatedError
+from app.services.metrics import span, timed
+
+# Prompt for Gemini
+GEMINI_PROMPT = """
+            Analyze this image for authenticity and potential AI generation/manipulation.
+            
+            Focus on:
+            1. Content consistency and realism
+            2. Unusual patterns or artifacts
+            3. Text, logos, or watermarks
+            4. Overall image quality and naturalness
+            
+            Provide a detailed analysis with specific observations.
+            """
+
 class SimpleAIPipeline:
     """
     Simple and effective AI pipeline for APEX VERIFY AI.
@@ -16,7 +31,7 @@ class SimpleAIPipeline:
     
     def __init__(self):
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-        self.gemini_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro-vision:generateContent"
+        self.gemini_client = get_gemini_client()
         
     def analyze_image(self, image_data: bytes) -> Dict[str, Any]:
         """
@@ -29,85 +44,147 @@ class SimpleAIPipeline:
             Complete analysis result
         """
         try:
-            # Step 1: Basic image validation
-            image_info = self._validate_image(image_data)
+            ctx, features = self._run_local_analysis(image_data)
             
-            # Step 2: Calculate image hash
-            image_hash = hashlib.sha256(image_data).hexdigest()
+            # Step 4: Gemini Pro Vision analysis
+            gemini_analysis = self._analyze_with_gemini(ctx)
             
-            # Step 3: Extract features (simulated DINOv3)
-            features = self._extract_features(image_data)
+            return self._build_result(ctx, features, gemini_analysis)
             
-            # Step 4: Gemini Pro Vision analysis
-            gemini_analysis = self._analyze_with_gemini(image_data)
+        except Exception as e:
+            return self._failed_result(e)
+    
+    async def analyze_image_async(self, image_data: bytes, pool: Optional[AnalysisPool] = None) -> Dict[str, Any]:
+        """
+        Same pipeline as analyze_image, but the Gemini round trip is awaited
+        on the shared connection pool instead of blocking the event loop.
+        
+        Args:
+            image_data: Raw image bytes
+            pool: Runs decoding and feature extraction off the event loop
+                  (default: run them inline); a pool slot is held only for
+                  that CPU work, not for the Gemini call
+            
+        Returns:
+            Complete analysis result
             
-            # Step 5: Combine results and score
-            authenticity_score = self._calculate_score(features, gemini_analysis)
-            verdict = self._get_verdict(authenticity_score)
+        Raises:
+            PoolSaturatedError: If the pool has no free slot
+        """
+        try:
+            if pool is None:
+                ctx, features = self._run_local_analysis(image_data)
+            else:
+                ctx, features = await self._run_local_analysis_pooled(image_data, pool)
             
-            # Step 6: Create result
-            result = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "image_hash": image_hash,
-                "image_info": image_info,
-                "authenticity_score": authenticity_score,
-                "verdict": verdict,
-                "confidence": self._get_confidence(authenticity_score),
-                "analysis": {
-                    "features": features,
-                    "gemini_analysis": gemini_analysis
-                },
-                "recommendations": self._get_recommendations(verdict, authenticity_score)
-            }
+            # Step 4: Gemini Pro Vision analysis
+            gemini_analysis = await self._analyze_with_gemini_async(ctx)
             
-            return result
+            return self._build_result(ctx, features, gemini_analysis)
             
+        except PoolSaturatedError:
+            raise
         except Exception as e:
-            return {
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
-                "status": "failed"
-            }
+            return self._failed_result(e)
+    
+    def _run_local_analysis(self, image_data: bytes) -> Tuple[ImageContext, Dict[str, Any]]:
+        """Steps 1-3: decode, validate and extract features."""
+        # Step 1: Decode once and validate
+        ctx = self._validate_image(image_data)
+        
+        # Step 2: Image hash is computed lazily by the context (ctx.sha256)
+        
+        # Step 3: Extract features (simulated DINOv3)
+        features = self._extract_features(ctx)
+        
+        return ctx, features
+    
+    async def _run_local_analysis_pooled(self, image_data: bytes,
+                                         pool: AnalysisPool) -> Tuple[ImageContext, Dict[str, Any]]:
+        """Steps 1-3 on the analysis pool, holding one of its admission slots."""
+        with pool.admit():
+            if not pool.is_process_pool:
+                return await pool.run(self._run_local_analysis, image_data)
+            
+            # Decode once here (the context is needed for the result), then map
+            # the pixels into the worker instead of pickling them
+            ctx = await asyncio.to_thread(self._validate_image, image_data)
+            shared = share_image(ctx.image)
+            # Spans recorded in a worker process stay there; time the stage from here
+            with span("features"):
+                if shared is None:
+                    return ctx, await pool.run(_extract_features_from_bytes, image_data)
+                
+                shm, handle = shared
+                try:
+                    return ctx, await pool.run(_extract_features_shared, handle)
+                finally:
+                    shm.close()
+                    shm.unlink()
+    
+    @timed("scoring")
+    def _build_result(self, ctx: ImageContext, features: Dict[str, Any],
+                      gemini_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Steps 5-6: combine results, score and create the response."""
+        # Step 5: Combine results and score
+        authenticity_score = self._calculate_score(features, gemini_analysis)
+        verdict = self._get_verdict(authenticity_score)
+        
+        # Step 6: Create result
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "image_hash": ctx.sha256,
+            "image_info": ctx.info,
+            "authenticity_score": authenticity_score,
+            "verdict": verdict,
+            "confidence": self._get_confidence(authenticity_score),
+            "analysis": {
+                "features": features,
+                "gemini_analysis": gemini_analysis
+            },
+            "recommendations": self._get_recommendations(verdict, authenticity_score)
+        }
+    
+    def _failed_result(self, error: Exception) -> Dict[str, Any]:
+        return {
+            "error": str(error),
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "failed"
+        }
     
-    def _validate_image(self, image_data: bytes) -> Dict[str, Any]:
-        """Validate and get basic image information."""
+    @timed("decode")
+    def _validate_image(self, image_data: bytes) -> ImageContext:
+        """Decode the image once; the context is shared by every analyzer."""
         try:
-            with Image.open(io.BytesIO(image_data)) as img:
-                return {
-                    "format": img.format,
-                    "mode": img.mode,
-                    "size": img.size,
-                    "width": img.width,
-                    "height": img.height
-                }
+            return ImageContext(image_data)
         except Exception as e:
             raise Exception(f"Invalid image: {e}")
     
-    def _extract_features(self, image_data: bytes) -> Dict[str, Any]:
+    @timed("features")
+    def _extract_features(self, ctx: ImageContext) -> Dict[str, Any]:
         """
         Extract image features (simulated DINOv3 analysis).
         In production, this would use the actual DINOv3 model.
         """
         try:
-            with Image.open(io.BytesIO(image_data)) as img:
-                # Simulate feature extraction
-                features = {
-                    "resolution_analysis": self._analyze_resolution(img.size),
-                    "color_analysis": self._analyze_colors(img),
-                    "texture_analysis": self._analyze_texture(img),
-                    "composition_analysis": self._analyze_composition(img.size),
-                    "metadata_analysis": self._analyze_metadata(img)
-                }
-                
-                # Calculate anomaly score
-                anomaly_score = self._calculate_anomaly_score(features)
-                
-                return {
-                    "features": features,
-                    "anomaly_score": anomaly_score,
-                    "anomaly_detected": anomaly_score > 0.3
-                }
-                
+            # Simulate feature extraction
+            features = {
+                "resolution_analysis": self._analyze_resolution(ctx.size),
+                "color_analysis": self._analyze_colors(ctx),
+                "texture_analysis": self._analyze_texture(ctx),
+                "composition_analysis": self._analyze_composition(ctx.size),
+                "metadata_analysis": self._analyze_metadata(ctx)
+            }
+            
+            # Calculate anomaly score
+            anomaly_score = self._calculate_anomaly_score(features)
+            
+            return {
+                "features": features,
+                "anomaly_score": anomaly_score,
+                "anomaly_detected": anomaly_score > 0.3
+            }
+            
         except Exception as e:
             return {"error": f"Feature extraction failed: {e}"}
     
@@ -133,12 +210,10 @@ class SimpleAIPipeline:
             "suspicious": resolution_score > 0.5
         }
     
-    def _analyze_colors(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_colors(self, ctx: ImageContext) -> Dict[str, Any]:
         """Analyze color patterns for anomalies."""
         try:
-            # Convert to RGB if needed
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            img = ctx.rgb_image
             
             # Get color statistics
             colors = img.getcolors(maxcolors=img.width * img.height)
@@ -167,36 +242,13 @@ class SimpleAIPipeline:
         except Exception as e:
             return {"error": f"Color analysis failed: {e}"}
     
-    def _analyze_texture(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_texture(self, ctx: ImageContext) -> Dict[str, Any]:
         """Analyze texture patterns for anomalies."""
         try:
-            # Simple texture analysis
-            gray = img.convert('L')
-            pixels = list(gray.getdata())
-            
             # Calculate local variance (texture measure)
-            width, height = gray.size
-            variance_sum = 0
-            sample_count = 0
+            avg_variance = neighbor_variance(ctx.gray)
             
-            for y in range(1, height - 1):
-                for x in range(1, width - 1):
-                    center = pixels[y * width + x]
-                    neighbors = [
-                        pixels[(y-1) * width + x],
-                        pixels[(y+1) * width + x],
-                        pixels[y * width + (x-1)],
-                        pixels[y * width + (x+1)]
-                    ]
-                    
-                    if neighbors:
-                        variance = sum((center - n) ** 2 for n in neighbors) / len(neighbors)
-                        variance_sum += variance
-                        sample_count += 1
-            
-            if sample_count > 0:
-                avg_variance = variance_sum / sample_count
-                
+            if avg_variance is not None:
                 # Check for AI generation patterns
                 texture_score = 0
                 if avg_variance < 100:  # Very smooth texture
@@ -245,13 +297,13 @@ class SimpleAIPipeline:
             "suspicious": composition_score > 0.2
         }
     
-    def _analyze_metadata(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_metadata(self, ctx: ImageContext) -> Dict[str, Any]:
         """Analyze image metadata for anomalies."""
         metadata = {}
         
         # Check for common AI generation metadata
-        if hasattr(img, 'info'):
-            info = img.info
+        if ctx.metadata:
+            info = ctx.metadata
             
             # Check for AI software indicators
             if 'Software' in info:
@@ -285,107 +337,78 @@ class SimpleAIPipeline:
             return sum(scores) / len(scores)
         return 0.0
     
-    def _analyze_with_gemini(self, image_data: bytes) -> Dict[str, Any]:
+    @timed("gemini")
+    def _analyze_with_gemini(self, ctx: ImageContext) -> Dict[str, Any]:
         """Analyze image content with Gemini Pro Vision."""
         if not self.gemini_api_key:
-            return {
-                "error": "Gemini API key not configured",
-                "fallback_analysis": self._fallback_content_analysis(image_data)
-            }
+            return self._gemini_not_configured(ctx)
         
         try:
-            # Encode image to base64
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
-            
-            # Prepare prompt for Gemini
-            prompt = """
-            Analyze this image for authenticity and potential AI generation/manipulation.
-            
-            Focus on:
-            1. Content consistency and realism
-            2. Unusual patterns or artifacts
-            3. Text, logos, or watermarks
-            4. Overall image quality and naturalness
-            
-            Provide a detailed analysis with specific observations.
-            """
-            
-            # Prepare request payload
-            payload = {
-                "contents": [{
-                    "parts": [
-                        {"text": prompt},
-                        {
-                            "inline_data": {
-                                "mime_type": "image/jpeg",
-                                "data": image_base64
-                            }
-                        }
-                    ]
-                }],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                }
-            }
-            
-            # Make request to Gemini
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(
-                f"{self.gemini_url}?key={self.gemini_api_key}",
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
+            analysis_text = self.gemini_client.generate_sync(GEMINI_PROMPT, ctx.data)
+            return self._gemini_result(ctx, analysis_text)
             
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and result['candidates']:
-                    content = result['candidates'][0]['content']
-                    if 'parts' in content and content['parts']:
-                        analysis_text = content['parts'][0]['text']
-                        
-                        return {
-                            "analysis": analysis_text,
-                            "confidence": "high",
-                            "source": "gemini_pro_vision"
-                        }
-            
-            # Fallback if Gemini fails
-            return self._fallback_content_analysis(image_data)
+        except Exception as e:
+            return self._gemini_failed(ctx, e)
+    
+    @timed("gemini")
+    async def _analyze_with_gemini_async(self, ctx: ImageContext) -> Dict[str, Any]:
+        """Analyze image content with Gemini Pro Vision without blocking the event loop."""
+        if not self.gemini_api_key:
+            return self._gemini_not_configured(ctx)
+        
+        try:
+            analysis_text = await self.gemini_client.generate(GEMINI_PROMPT, ctx.data)
+            return self._gemini_result(ctx, analysis_text)
             
         except Exception as e:
+            return self._gemini_failed(ctx, e)
+    
+    def _gemini_result(self, ctx: ImageContext, analysis_text: Optional[str]) -> Dict[str, Any]:
+        if analysis_text:
             return {
-                "error": f"Gemini analysis failed: {e}",
-                "fallback_analysis": self._fallback_content_analysis(image_data)
+                "analysis": analysis_text,
+                "confidence": "high",
+                "source": "gemini_pro_vision"
             }
+        
+        # Fallback if Gemini fails
+        return self._fallback_content_analysis(ctx)
+    
+    def _gemini_not_configured(self, ctx: ImageContext) -> Dict[str, Any]:
+        return {
+            "error": "Gemini API key not configured",
+            "fallback_analysis": self._fallback_content_analysis(ctx)
+        }
+    
+    def _gemini_failed(self, ctx: ImageContext, error: Exception) -> Dict[str, Any]:
+        return {
+            "error": f"Gemini analysis failed: {error}",
+            "fallback_analysis": self._fallback_content_analysis(ctx)
+        }
     
-    def _fallback_content_analysis(self, image_data: bytes) -> Dict[str, Any]:
+    def _fallback_content_analysis(self, ctx: ImageContext) -> Dict[str, Any]:
         """Fallback content analysis when Gemini is unavailable."""
         try:
-            with Image.open(io.BytesIO(image_data)) as img:
-                # Basic content analysis
-                analysis = {
-                    "image_type": "analyzed",
-                    "content_notes": "Basic analysis performed (Gemini unavailable)",
-                    "confidence": "medium",
-                    "source": "fallback_analysis"
-                }
-                
-                # Add basic observations
-                if img.mode == 'RGB':
-                    analysis["color_mode"] = "color"
-                elif img.mode == 'L':
-                    analysis["color_mode"] = "grayscale"
-                else:
-                    analysis["color_mode"] = "other"
-                
-                analysis["dimensions"] = f"{img.width}x{img.height}"
-                
-                return analysis
-                
+            # Basic content analysis
+            analysis = {
+                "image_type": "analyzed",
+                "content_notes": "Basic analysis performed (Gemini unavailable)",
+                "confidence": "medium",
+                "source": "fallback_analysis"
+            }
+            
+            # Add basic observations
+            if ctx.mode == 'RGB':
+                analysis["color_mode"] = "color"
+            elif ctx.mode == 'L':
+                analysis["color_mode"] = "grayscale"
+            else:
+                analysis["color_mode"] = "other"
+            
+            analysis["dimensions"] = f"{ctx.width}x{ctx.height}"
+            
+            return analysis
+            
         except Exception as e:
             return {
                 "error": f"Fallback analysis failed: {e}",
@@ -492,3 +515,25 @@ class SimpleAIPipeline:
 
 # Global instance
 ai_pipeline = SimpleAIPipeline()
+
+
+# Process-pool workers (module level so they can be pickled by reference)
+
+def _extract_features_shared(handle: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract features from pixels placed in shared memory by share_image."""
+    shm = shared_memory.SharedMemory(name=handle["name"])
+    try:
+        return _extract_features_from_buffer(shm.buf, handle)
+    finally:
+        # Every view of the buffer died with the call above
+        shm.close()
+
+
+def _extract_features_from_buffer(buffer: memoryview, handle: Dict[str, Any]) -> Dict[str, Any]:
+    ctx = ImageContext.from_image(attach_image(buffer, handle))
+    return ai_pipeline._extract_features(ctx)
+
+
+def _extract_features_from_bytes(image_data: bytes) -> Dict[str, Any]:
+    """Fallback for image modes that cannot be shared: decode in the worker."""
+    return ai_pipeline._extract_features(ai_pipeline._validate_image(image_data))
@@ -1,17 +1,27 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import uvicorn
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import os
+import json
 import time
+import asyncio
+import hashlib
 import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal, Optional
 from dotenv import load_dotenv
 from PIL import Image
 import io
 
-# Import our services
-from models.dinov3_model import DINOv3Analyzer
-from services.gemini_service import GeminiReportService
+# Import our services (DINOv3Analyzer, and with it torch, is imported at startup)
+from app.models.batch_scheduler import DINOv3BatchScheduler
+from app.models.warmup import ModelWarmup
+from app.services.gemini_service import GeminiReportService
+from app.services.gemini_prober import GeminiStatusProber
+from app.services.result_cache import ResultCache
+from app.services.near_duplicate_index import NearDuplicateIndex, perceptual_hash_bytes
+from app.services.batch_inputs import iter_upload_images
+from app.services.job_queue import Job, JobWorker, create_job_queue
+from app.services.metrics import CONTENT_TYPE_LATEST, render_latest, span, stage_breakdown, timed
 
 # Load environment variables
 load_dotenv()
@@ -43,37 +53,101 @@ app.add_middleware(
 
 # Global service instances
 dinov3_analyzer = None
+batch_scheduler = None
+model_warmup = None
 gemini_service = None
+gemini_prober = None
+result_cache = ResultCache(namespace="api_verify")
+near_duplicate_index = NearDuplicateIndex()
+job_queue = None
+job_worker = None
+# Keeps fire-and-forget startup tasks referenced until they finish
+_background_tasks = set()
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
-    global dinov3_analyzer, gemini_service
+async def init_services():
+    """Open the job queue, load DINOv3, start its warm-up and connect Gemini (shared by the API and worker.py)"""
+    global job_queue, dinov3_analyzer, batch_scheduler, model_warmup, gemini_service, gemini_prober
     
     logger.info("Starting APEX VERIFY AI Backend...")
     
     try:
+        # Opening the queue creates its SQLite file or Redis connection
+        job_queue = create_job_queue()
+        
         # Initialize DINOv3 analyzer
+        from app.models.dinov3_model import DINOv3Analyzer
+        
         model_path = os.getenv('DINOV3_MODEL_PATH', './models/dinov3_vit7b16b.pth')
         logger.info(f"Loading DINOv3 model from: {model_path}")
         
         dinov3_analyzer = DINOv3Analyzer(model_path)
         logger.info("DINOv3 analyzer initialized successfully")
         
+        # Micro-batch concurrent requests into shared forward passes
+        if os.getenv('DINOV3_BATCHING', 'true').lower() in ('1', 'true', 'yes'):
+            batch_scheduler = DINOv3BatchScheduler(dinov3_analyzer)
+            batch_scheduler.start()
+        
+        # Pay first-call costs before reporting ready; runs in the background
+        # so liveness keeps answering while a large model warms up
+        model_warmup = ModelWarmup(
+            dinov3_analyzer,
+            max_batch_size=batch_scheduler.max_batch_size if batch_scheduler else 1
+        )
+        model_warmup.start()
+        
         # Initialize Gemini service
         gemini_service = GeminiReportService()
         logger.info("Gemini service initialized successfully")
         
-        # Test Gemini connection
-        gemini_status = gemini_service.test_connection()
+        # Test Gemini connection, then keep the status fresh in the background
+        gemini_prober = GeminiStatusProber(gemini_service)
+        gemini_status = await gemini_prober.refresh()
         logger.info(f"Gemini API status: {gemini_status['status']}")
-        
-        logger.info("Backend startup completed successfully")
+        gemini_prober.start()
         
     except Exception as e:
         logger.error(f"Backend startup failed: {e}")
         raise
 
+@app.on_event("startup")
+async def startup_event():
+    """Initialize services on startup"""
+    global job_worker
+    
+    await init_services()
+    
+    # Jobs are normally run by worker.py processes; this is for single-process setups
+    if os.getenv('JOB_WORKER_IN_PROCESS', 'false').lower() in ('1', 'true', 'yes'):
+        job_worker = JobWorker(job_queue, run_job)
+        _background_tasks.add(asyncio.get_running_loop().create_task(_start_job_worker_when_warm()))
+    
+    logger.info("Backend startup completed successfully")
+
+async def _start_job_worker_when_warm():
+    """Claim jobs only once the model is warm, as worker.py does"""
+    await model_warmup.wait()
+    if model_warmup.ready:
+        job_worker.start()
+    else:
+        logger.error("DINOv3 warm-up failed; the in-process job worker will not start")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and release pooled Gemini connections"""
+    if job_worker:
+        await job_worker.stop()
+    if model_warmup:
+        await model_warmup.stop()
+    if gemini_prober:
+        await gemini_prober.stop()
+    if batch_scheduler:
+        await batch_scheduler.stop()
+    if gemini_service:
+        await gemini_service.client.aclose()
+    if job_queue:
+        job_queue.close()
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -83,8 +157,14 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready",
             "verify": "/api/verify",
-            "status": "/status"
+            "verify_batch": "/api/verify/batch",
+            "verify_stream": "/api/verify/stream",
+            "jobs": "/api/jobs",
+            "status": "/status",
+            "metrics": "/metrics"
         },
         "features": [
             "DINOv3 deep learning analysis",
@@ -101,19 +181,16 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (cached Gemini status, no API call)"""
     try:
         # Check DINOv3 status
         dinov3_status = "healthy" if dinov3_analyzer else "unhealthy"
         
         # Check Gemini status
         gemini_status = "healthy"
-        if gemini_service:
-            try:
-                status = gemini_service.test_connection()
-                gemini_status = status['status']
-            except:
-                gemini_status = "unhealthy"
+        if gemini_prober:
+            status = gemini_prober.status()
+            gemini_status = "stale" if status['stale'] else status['status']
         
         return {
             "status": "healthy" if dinov3_status == "healthy" and gemini_status == "connected" else "degraded",
@@ -131,44 +208,96 @@ async def health_check():
             "timestamp": "2024-01-01T00:00:00Z"
         }
 
-@app.post("/api/verify")
-async def verify_image(file: UploadFile = File(...)):
+@app.get("/health/live")
+async def liveness_check():
     """
-    Verify image authenticity using DINOv3 and Gemini Pro Vision
+    Liveness probe: the process is up and serving requests
+    
+    Fails once every warm-up attempt failed: the model cannot run in this
+    process, so it should be restarted (worker.py exits in that case).
+    """
+    if model_warmup is not None and model_warmup.failed:
+        return JSONResponse(status_code=503, content={"status": "warmup_failed", "error": model_warmup.error})
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness probe: the model is loaded and warmed up, and requests can be served
+    
+    Gemini is reported but not required, since verification falls back to
+    a local report when it is unavailable.
+    """
+    batching_ready = batch_scheduler is None or batch_scheduler.running
+    warmed_up = model_warmup is not None and model_warmup.ready
+    ready = dinov3_analyzer is not None and dinov3_analyzer.model is not None and batching_ready and warmed_up
+    
+    body = {
+        "status": "ready" if ready else "not_ready",
+        "services": {
+            "dinov3_analyzer": "loaded" if dinov3_analyzer else "not_loaded",
+            "dinov3_batching": "running" if batch_scheduler and batch_scheduler.running else
+                               ("disabled" if batch_scheduler is None else "stopped"),
+            "dinov3_warmup": model_warmup.state if model_warmup else "pending",
+            "gemini_api": gemini_prober.status()['status'] if gemini_prober else "not_connected"
+        }
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+FILE_SIZE_LIMIT = 10 * 1024 * 1024  # 10MB
+
+def _check_file_size(file_content: bytes):
+    """Reject empty uploads and uploads over FILE_SIZE_LIMIT"""
+    if len(file_content) > FILE_SIZE_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail="File size too large. Maximum size is 10MB."
+        )
+    
+    if len(file_content) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Empty file"
+        )
+
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+@timed("verify")
+async def _verify_content(file_content: bytes, start_time: float, report_mode: str = 'gemini',
+                          scheduler: Optional[DINOv3BatchScheduler] = None,
+                          on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+    """
+    Verify one uploaded image (shared by /api/verify and /api/verify/batch)
     
     Args:
-        file: Image file to verify (jpg, png, webp)
+        file_content: Raw image bytes
+        start_time: time.time() when the request (or batch item) started
+        report_mode: 'gemini' for the Gemini report, 'fallback' for the
+                     template report without an API call, 'none' for no report
+        scheduler: Batch scheduler to use instead of the global one
+        on_event: Awaited with (event, data) as stages finish: 'validated',
+                  'dinov3', 'anomalies', then 'report_chunk' per piece of
+                  streamed Gemini text (not called for cached results)
         
     Returns:
-        Verification result with exact format for frontend
+        Verification result
+        
+    Raises:
+        HTTPException: If the image is rejected or analysis fails
     """
-    start_time = time.time()
+    _check_file_size(file_content)
     
-    try:
-        # 1. Validate image upload
-        if not file.content_type.startswith('image/'):
-            raise HTTPException(
-                status_code=400, 
-                detail="File must be an image (jpg, png, webp)"
-            )
-        
-        # Check file size (limit to 10MB)
-        file_size_limit = 10 * 1024 * 1024  # 10MB
-        file_content = await file.read()
-        
-        if len(file_content) > file_size_limit:
-            raise HTTPException(
-                status_code=400,
-                detail="File size too large. Maximum size is 10MB."
-            )
-        
-        if len(file_content) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="Empty file"
-            )
-        
-        # 2. Validate image format
+    # Previously verified image: skip DINOv3 and Gemini entirely
+    with span("cache_lookup"):
+        image_hash = hashlib.sha256(file_content).hexdigest()
+        cached = result_cache.get(image_hash)
+    if cached is not None:
+        cached["processing_time"] = round(time.time() - start_time, 2)
+        cached["cached"] = True
+        return cached
+    
+    # 2. Validate image format
+    with span("validate"):
         try:
             image = Image.open(io.BytesIO(file_content))
             if image.format not in ['JPEG', 'PNG', 'WEBP']:
@@ -181,16 +310,54 @@ async def verify_image(file: UploadFile = File(...)):
                 status_code=400,
                 detail=f"Invalid image file: {str(e)}"
             )
-        
-        # 3. Run DINOv3 analysis
-        if not dinov3_analyzer:
-            raise HTTPException(
-                status_code=500,
-                detail="DINOv3 analyzer not initialized"
-            )
-        
+    
+    if on_event:
+        await on_event("validated", {
+            "image_hash": image_hash,
+            "format": image.format,
+            "width": image.width,
+            "height": image.height
+        })
+    
+    loop = asyncio.get_running_loop()
+    
+    # Recompressed/resized re-upload of a verified image: reuse its verdict
+    phash = None
+    if near_duplicate_index.enabled:
         try:
-            dinov3_analysis = dinov3_analyzer.analyze_image(image)
+            # Decodes the full image; keep it off the event loop
+            with span("phash"):
+                phash = await loop.run_in_executor(None, perceptual_hash_bytes, file_content)
+        except Exception as e:
+            logger.warning(f"Perceptual hash failed: {e}")
+    
+    # None for featureless images: only exact (SHA-256) matches are reused
+    if phash is not None:
+        match = near_duplicate_index.lookup(phash)
+        cached = result_cache.get(match[0]) if match else None
+        if cached is not None:
+            cached["processing_time"] = round(time.time() - start_time, 2)
+            cached["cached"] = True
+            cached["near_duplicate"] = {
+                "matched_image_hash": match[0],
+                "hamming_distance": match[1]
+            }
+            return cached
+    
+    # 3. Run DINOv3 analysis
+    if not dinov3_analyzer:
+        raise HTTPException(
+            status_code=500,
+            detail="DINOv3 analyzer not initialized"
+        )
+    
+    scheduler = scheduler or batch_scheduler
+    with span("dinov3"):
+        try:
+            if scheduler:
+                dinov3_analysis = await scheduler.analyze_image(image)
+            else:
+                dinov3_analysis = dinov3_analyzer.analyze_image(image)
             logger.info(f"DINOv3 analysis completed: {dinov3_analysis['authenticity_score']}%")
         except Exception as e:
             logger.error(f"DINOv3 analysis failed: {e}")
@@ -198,39 +365,93 @@ async def verify_image(file: UploadFile = File(...)):
                 status_code=500,
                 detail=f"DINOv3 analysis failed: {str(e)}"
             )
+    
+    if on_event:
+        await on_event("dinov3", {
+            "authenticity_score": dinov3_analysis['authenticity_score'],
+            "classification": dinov3_analysis['classification'],
+            "confidence": dinov3_analysis.get('confidence', 0)
+        })
+        await on_event("anomalies", {"feature_anomalies": dinov3_analysis.get('feature_anomalies', [])})
+    
+    # 4. Generate Gemini Pro report
+    if not gemini_service:
+        raise HTTPException(
+            status_code=500,
+            detail="Gemini service not initialized"
+        )
+    
+    with span("gemini_report"):
+        if report_mode == 'gemini' and on_event:
+            async def relay_chunk(text: str):
+                await on_event("report_chunk", {"text": text})
+            
+            report = await gemini_service.generate_report_stream(file_content, dinov3_analysis, relay_chunk)
+        elif report_mode == 'gemini':
+            try:
+                report = await gemini_service.generate_report_async(file_content, dinov3_analysis)
+                logger.info("Gemini report generated successfully")
+            except Exception as e:
+                logger.error(f"Gemini report generation failed: {e}")
+                # Use fallback report
+                report = gemini_service._create_fallback_report(dinov3_analysis)
+        elif report_mode == 'fallback':
+            report = gemini_service._create_fallback_report(dinov3_analysis)
+        else:
+            report = None
+    
+    # 5. Calculate processing time
+    processing_time = round(time.time() - start_time, 2)
+    
+    # 6. Return structured JSON for frontend (exact format specified)
+    response = {
+        "success": True,
+        "authenticity_score": dinov3_analysis['authenticity_score'],
+        "classification": dinov3_analysis['classification'],
+        "report": report,  # Full Gemini-generated text
+        "processing_time": processing_time,
+        "confidence": dinov3_analysis.get('confidence', 0),
+        "feature_anomalies": dinov3_analysis.get('feature_anomalies', []),
+        "model_info": {
+            "dinov3": dinov3_analyzer.get_model_info(),
+            "gemini": "gemini-pro-vision" if report_mode == 'gemini' else None
+        }
+    }
+    # Only complete results are cached; /api/verify must not serve a skipped report
+    if report_mode == 'gemini':
+        result_cache.set(image_hash, response)
+        if phash is not None:
+            near_duplicate_index.add(phash, image_hash)
+    return response
+
+@app.post("/api/verify")
+async def verify_image(file: UploadFile = File(...), timings: bool = False):
+    """
+    Verify image authenticity using DINOv3 and Gemini Pro Vision
+    
+    Args:
+        file: Image file to verify (jpg, png, webp)
+        timings: Add "stage_timings_ms" (milliseconds per pipeline stage)
         
-        # 4. Generate Gemini Pro report
-        if not gemini_service:
+    Returns:
+        Verification result with exact format for frontend
+    """
+    start_time = time.time()
+    
+    try:
+        # 1. Validate image upload
+        if not file.content_type.startswith('image/'):
             raise HTTPException(
-                status_code=500,
-                detail="Gemini service not initialized"
+                status_code=400, 
+                detail="File must be an image (jpg, png, webp)"
             )
         
-        try:
-            report = gemini_service.generate_report(file_content, dinov3_analysis)
-            logger.info("Gemini report generated successfully")
-        except Exception as e:
-            logger.error(f"Gemini report generation failed: {e}")
-            # Use fallback report
-            report = gemini_service._create_fallback_report(dinov3_analysis)
-        
-        # 5. Calculate processing time
-        processing_time = round(time.time() - start_time, 2)
-        
-        # 6. Return structured JSON for frontend (exact format specified)
-        return {
-            "success": True,
-            "authenticity_score": dinov3_analysis['authenticity_score'],
-            "classification": dinov3_analysis['classification'],
-            "report": report,  # Full Gemini-generated text
-            "processing_time": processing_time,
-            "confidence": dinov3_analysis.get('confidence', 0),
-            "feature_anomalies": dinov3_analysis.get('feature_anomalies', []),
-            "model_info": {
-                "dinov3": dinov3_analyzer.get_model_info(),
-                "gemini": "gemini-pro-vision"
-            }
-        }
+        file_content = await file.read()
+        with stage_breakdown() as stages:
+            result = await _verify_content(file_content, start_time)
+        if timings:
+            result["stage_timings_ms"] = {stage: round(ms, 2) for stage, ms in stages.items()}
+        return result
         
     except HTTPException:
         raise
@@ -247,12 +468,243 @@ async def verify_image(file: UploadFile = File(...)):
             "report": "Analysis failed due to system error."
         }
 
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+async def _stream_verification(file_content: bytes, start_time: float) -> AsyncIterator[bytes]:
+    """Run _verify_content and yield its stage events, then the result, as SSE"""
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def on_event(event: str, data: Dict[str, Any]):
+        await events.put((event, data))
+    
+    async def verify():
+        try:
+            await events.put(("result", await _verify_content(file_content, start_time, on_event=on_event)))
+        except HTTPException as e:
+            await events.put(("error", {"status_code": e.status_code, "error": e.detail}))
+        except Exception as e:
+            logger.error(f"Verification failed: {e}")
+            await events.put(("error", {"status_code": 500, "error": f"Verification failed: {str(e)}"}))
+        finally:
+            await events.put(None)
+    
+    task = asyncio.create_task(verify())
+    try:
+        while (item := await events.get()) is not None:
+            yield _sse(*item)
+    finally:
+        # Client disconnected: stop waiting on DINOv3 / Gemini for nobody
+        task.cancel()
+
+@app.post("/api/verify/stream")
+async def verify_image_stream(file: UploadFile = File(...)):
+    """
+    Verify image authenticity, streaming progress as Server-Sent Events
+    
+    Args:
+        file: Image file to verify (jpg, png, webp)
+        
+    Returns:
+        text/event-stream with the events 'validated', 'dinov3' (score and
+        classification), 'anomalies', 'report_chunk' (Gemini text as it is
+        generated), then 'result' (the /api/verify response) or 'error'.
+        Cached images only get 'result'.
+    """
+    start_time = time.time()
+    
+    if not file.content_type.startswith('image/'):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be an image (jpg, png, webp)"
+        )
+    
+    file_content = await file.read()
+    _check_file_size(file_content)
+    
+    return StreamingResponse(
+        _stream_verification(file_content, start_time),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _stream_batch(uploads: List[UploadFile], report_mode: str) -> AsyncIterator[bytes]:
+    """
+    Verify every image of a batch and yield one NDJSON line per image, in
+    completion order, followed by a summary line
+    
+    Images are read and decoded concurrently (bounded by
+    BATCH_VERIFY_CONCURRENCY) so the DINOv3 scheduler receives full batches.
+    """
+    loop = asyncio.get_running_loop()
+    batch_start = time.time()
+    
+    # A batch always runs DINOv3 in true batches, even with DINOV3_BATCHING off
+    scheduler = batch_scheduler
+    own_scheduler = None
+    if scheduler is None and dinov3_analyzer is not None:
+        scheduler = own_scheduler = DINOv3BatchScheduler(dinov3_analyzer)
+        own_scheduler.start()
+    
+    max_images = int(os.getenv('BATCH_VERIFY_MAX_IMAGES', '1000'))
+    default_concurrency = 2 * (scheduler.max_batch_size if scheduler else 8)
+    slots = asyncio.Semaphore(int(os.getenv('BATCH_VERIFY_CONCURRENCY', str(default_concurrency))))
+    lines: asyncio.Queue = asyncio.Queue()
+    tasks = set()
+    
+    async def verify_one(index: int, name: str, content: bytes):
+        item_start = time.time()
+        try:
+            result = await _verify_content(content, item_start, report_mode, scheduler)
+        except HTTPException as e:
+            result = {"success": False, "status_code": e.status_code, "error": e.detail}
+        except Exception as e:
+            logger.error(f"Batch verification of {name} failed: {e}")
+            result = {"success": False, "status_code": 500, "error": f"Verification failed: {str(e)}"}
+        finally:
+            slots.release()
+        await lines.put({"index": index, "filename": name, **result})
+    
+    async def produce():
+        index = 0
+        rejected = None  # filename of the first image over the batch limit
+        try:
+            for upload in uploads:
+                images = iter_upload_images(upload.file, upload.filename or "upload", FILE_SIZE_LIMIT)
+                while rejected is None:
+                    await slots.acquire()
+                    try:
+                        # Reading (and for archives, decompressing) is blocking file I/O
+                        item = await loop.run_in_executor(None, next, images, None)
+                    except Exception as e:
+                        slots.release()
+                        await lines.put({"index": index, "filename": upload.filename, "success": False,
+                                         "status_code": 400, "error": f"Invalid archive: {str(e)}"})
+                        index += 1
+                        break
+                    if item is None:
+                        slots.release()
+                        break
+                    if index >= max_images:
+                        slots.release()
+                        rejected = item[0]
+                        break
+                    task = asyncio.create_task(verify_one(index, *item))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    index += 1
+                if rejected is not None:
+                    break
+            # Images accepted before the limit was reached still finish
+            if tasks:
+                await asyncio.wait(set(tasks))
+            if rejected is not None:
+                await lines.put({"index": index, "filename": rejected, "success": False,
+                                 "status_code": 413,
+                                 "error": f"Batch limit of {max_images} images reached"})
+        finally:
+            await lines.put(None)
+    
+    producer = asyncio.create_task(produce())
+    total = succeeded = 0
+    try:
+        while (line := await lines.get()) is not None:
+            total += 1
+            succeeded += bool(line.get("success"))
+            yield (json.dumps(line) + "\n").encode()
+        
+        yield (json.dumps({"summary": {
+            "images": total,
+            "succeeded": succeeded,
+            "failed": total - succeeded,
+            "processing_time": round(time.time() - batch_start, 2)
+        }}) + "\n").encode()
+    finally:
+        # Also reached when the client disconnects mid-stream
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+        if own_scheduler is not None:
+            await own_scheduler.stop()
+
+@app.post("/api/verify/batch")
+async def verify_batch(files: List[UploadFile] = File(...),
+                       report: Literal['gemini', 'fallback', 'none'] = 'gemini'):
+    """
+    Verify many images in one request
+    
+    Args:
+        files: Images (jpg, png, webp) and/or zip or tar(.gz/.bz2/.xz)
+               archives of images
+        report: 'gemini' (default) for per-image Gemini reports, issued
+                concurrently over the pooled client; 'fallback' for the
+                template report without API calls; 'none' to omit reports
+        
+    Returns:
+        NDJSON stream: one /api/verify result per image (plus "index" and
+        "filename") as soon as it finishes, then a {"summary": ...} line
+    """
+    if not dinov3_analyzer:
+        raise HTTPException(status_code=500, detail="DINOv3 analyzer not initialized")
+    
+    return StreamingResponse(_stream_batch(files, report), media_type="application/x-ndjson")
+
+async def run_job(job: Job) -> Dict[str, Any]:
+    """Verify the image of a queued job (used by JobWorker)"""
+    return await _verify_content(job.payload, time.time(), job.options.get('report', 'gemini'))
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job(file: UploadFile = File(...), report: Literal['gemini', 'fallback', 'none'] = 'gemini'):
+    """
+    Queue an image for verification and return immediately
+    
+    Args:
+        file: Image file to verify (jpg, png, webp)
+        report: Report mode, as for /api/verify/batch
+        
+    Returns:
+        Job id and the URL to poll for its result
+    """
+    if not file.content_type.startswith('image/'):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be an image (jpg, png, webp)"
+        )
+    
+    file_content = await file.read()
+    _check_file_size(file_content)
+    
+    loop = asyncio.get_running_loop()
+    job_id = await loop.run_in_executor(None, job_queue.submit, file_content, {"report": report})
+    status_url = f"/api/jobs/{job_id}"
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "queued", "status_url": status_url},
+        headers={"Location": status_url}
+    )
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Poll a queued verification
+    
+    Returns:
+        Job status ('queued', 'running', 'completed' or 'failed') with
+        timestamps, plus the /api/verify result when completed or the
+        error when failed
+    """
+    job = await asyncio.get_running_loop().run_in_executor(None, job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
 @app.get("/status")
 async def get_status():
     """Get system status and configuration"""
     try:
         dinov3_info = dinov3_analyzer.get_model_info() if dinov3_analyzer else {"status": "not_loaded"}
-        gemini_info = gemini_service.test_connection() if gemini_service else {"status": "not_connected"}
+        gemini_info = gemini_prober.status() if gemini_prober else {"status": "not_connected"}
         
         return {
             "system": "APEX VERIFY AI",
@@ -260,7 +712,13 @@ async def get_status():
             "status": "operational",
             "services": {
                 "dinov3_analyzer": dinov3_info,
-                "gemini_service": gemini_info
+                "dinov3_batching": batch_scheduler.get_stats() if batch_scheduler else {"status": "disabled"},
+                "dinov3_warmup": model_warmup.get_stats() if model_warmup else {"state": "pending"},
+                "gemini_service": gemini_info,
+                "result_cache": result_cache.get_stats(),
+                "near_duplicate_index": near_duplicate_index.get_stats(),
+                "job_queue": job_queue.get_stats() if job_queue else {"status": "not_initialized"},
+                "job_worker": job_worker.get_stats() if job_worker else {"status": "external"}
             },
             "configuration": {
                 "model_path": os.getenv('DINOV3_MODEL_PATH', 'not_set'),
@@ -269,8 +727,14 @@ async def get_status():
             },
             "endpoints": {
                 "verify": "/api/verify",
+                "verify_batch": "/api/verify/batch",
+                "verify_stream": "/api/verify/stream",
+                "jobs": "/api/jobs",
                 "health": "/health",
-                "status": "/status"
+                "liveness": "/health/live",
+                "readiness": "/health/ready",
+                "status": "/status",
+                "metrics": "/metrics"
             }
         }
     except Exception as e:
@@ -282,6 +746,11 @@ async def get_status():
             "error": str(e)
         }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage latency histograms, in-flight stages, cache and Gemini counters"""
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/models/dinov3/info")
 async def get_dinov3_info():
     """Get DINOv3 model information"""
@@ -292,13 +761,14 @@ async def get_dinov3_info():
 
 @app.get("/services/gemini/test")
 async def test_gemini():
-    """Test Gemini API connection"""
-    if not gemini_service:
+    """Test Gemini API connection now (refreshes the cached status)"""
+    if not gemini_prober:
         raise HTTPException(status_code=500, detail="Gemini service not initialized")
     
-    return gemini_service.test_connection()
+    return await gemini_prober.refresh()
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -1,4 +1,20 @@
 # Models Package
-from .dinov3_model import DINOv3Analyzer
+from .batch_scheduler import DINOv3BatchScheduler
+from .warmup import ModelWarmup
 
-__all__ = ['DINOv3Analyzer']
+__all__ = ['DINOv3Analyzer', 'DINOv3BatchScheduler', 'ModelWarmup', 'convert_checkpoint', 'is_model_artifact',
+           'load_model_artifact', 'quantize_dynamic_int8']
+
+
+def __getattr__(name):
+    # These pull in torch/torchvision; import them on first use
+    if name == 'DINOv3Analyzer':
+        from .dinov3_model import DINOv3Analyzer
+        return DINOv3Analyzer
+    if name in ('convert_checkpoint', 'is_model_artifact', 'load_model_artifact'):
+        from . import model_artifact
+        return getattr(model_artifact, name)
+    if name == 'quantize_dynamic_int8':
+        from .quantization import quantize_dynamic_int8
+        return quantize_dynamic_int8
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
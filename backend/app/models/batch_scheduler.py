@@ -0,0 +1,185 @@
+import os
+import time
+import asyncio
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+from PIL import Image
+
+from ..services.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingImage:
+    tensor: Any
+    image_size: tuple
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class DINOv3BatchScheduler:
+    """
+    Dynamic micro-batching queue in front of DINOv3Analyzer
+    Collects preprocessed images from concurrent requests for up to
+    `max_wait_ms` (or until `max_batch_size` is reached), runs a single
+    batched forward pass and hands each request its own analysis.
+    """
+    
+    def __init__(self, analyzer, max_batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None):
+        """
+        Initialize batch scheduler
+        
+        Args:
+            analyzer: DINOv3Analyzer instance
+            max_batch_size: Largest batch per forward pass (default: DINOV3_MAX_BATCH_SIZE or 8)
+            max_wait_ms: Longest time the first image of a batch waits for others
+                         (default: DINOV3_BATCH_WINDOW_MS or 10)
+        """
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size or int(os.getenv('DINOV3_MAX_BATCH_SIZE', '8'))
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else float(os.getenv('DINOV3_BATCH_WINDOW_MS', '10'))
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Forward passes run one at a time off the event loop
+        self._inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dinov3-batch")
+        
+        self._batches = 0
+        self._images = 0
+        self._batch_sizes = Counter()
+        self._queue_wait_total_ms = 0.0
+        self._queue_wait_max_ms = 0.0
+        self._inference_total_ms = 0.0
+    
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+    
+    def start(self):
+        """Start the batching worker on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"DINOv3 batching enabled (max_batch_size={self.max_batch_size}, "
+                    f"window={self.max_wait_ms}ms)")
+    
+    async def stop(self):
+        """Stop the worker; pending requests are cancelled"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+        self._inference_executor.shutdown(wait=False)
+    
+    async def analyze_image(self, image: Image.Image) -> Dict[str, Any]:
+        """
+        Analyze an image as part of the next batch
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            Analysis results, identical to DINOv3Analyzer.analyze_image
+        """
+        if not self.running:
+            raise RuntimeError("DINOv3 batch scheduler not started")
+        
+        loop = asyncio.get_running_loop()
+        # Preprocessing may decode a JPEG at reduced size; keep the original size
+        image_size = image.size
+        # Preprocessing is per-image CPU work; keep it off the event loop
+        # (to_thread carries the request context, so its span joins the request's breakdown)
+        tensor = await asyncio.to_thread(self.analyzer.preprocess, image)
+        
+        pending = _PendingImage(tensor=tensor, image_size=image_size, future=loop.create_future())
+        self._queue.put_nowait(pending)
+        with span("dinov3_batch"):
+            return await pending.future
+    
+    async def _collect_batch(self) -> List[_PendingImage]:
+        batch = [await self._queue.get()]
+        deadline = batch[0].enqueued_at + self.max_wait_ms / 1000
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        # Take anything else that is already waiting without extending the window
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        
+        return batch
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            batch = [item for item in batch if not item.future.cancelled()]
+            if not batch:
+                continue
+            
+            dispatched_at = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(
+                    self._inference_executor,
+                    self.analyzer.analyze_batch,
+                    [item.tensor for item in batch],
+                    [item.image_size for item in batch]
+                )
+            except Exception as e:
+                logger.error(f"Batched DINOv3 inference failed: {e}")
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+            finally:
+                self._record(batch, dispatched_at)
+            
+            for item, result in zip(batch, results):
+                if not item.future.done():
+                    item.future.set_result(result)
+    
+    def _record(self, batch: List[_PendingImage], dispatched_at: float):
+        now = time.perf_counter()
+        self._batches += 1
+        self._images += len(batch)
+        self._batch_sizes[len(batch)] += 1
+        self._inference_total_ms += (now - dispatched_at) * 1000
+        for item in batch:
+            wait_ms = (dispatched_at - item.enqueued_at) * 1000
+            self._queue_wait_total_ms += wait_ms
+            self._queue_wait_max_ms = max(self._queue_wait_max_ms, wait_ms)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Achieved batch sizes, queue wait and inference time"""
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "window_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._batches,
+            "images": self._images,
+            "average_batch_size": round(self._images / self._batches, 2) if self._batches else 0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "average_queue_wait_ms": round(self._queue_wait_total_ms / self._images, 2) if self._images else 0,
+            "max_queue_wait_ms": round(self._queue_wait_max_ms, 2),
+            "average_inference_ms": round(self._inference_total_ms / self._batches, 2) if self._batches else 0
+        }
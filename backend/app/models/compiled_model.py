@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import logging
+import argparse
+import warnings
+import importlib.util
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+import torch
+import torch.nn as nn
+
+from .model_artifact import CONFIG_FILE, FORMAT_VERSION
+from .quantization import parameter_count
+
+logger = logging.getLogger(__name__)
+
+TORCHSCRIPT_FILE = "model.ts"
+ONNX_FILE = "model.onnx"
+RUNTIMES = ("torchscript", "onnxruntime")
+INPUT_SIZE = 224
+
+# name -> torch.hub entry point, as built by the pipelines
+BACKBONES = {
+    "dinov3": None,  # from a checkpoint or model artifact (--source)
+    "efficientnet": "efficientnet_b0",
+    "vit": "vit_b_16",
+}
+VISION_HUB_REPO = 'pytorch/vision:v0.10.0'
+
+
+class FeatureExtractor(nn.Module):
+    """
+    The features a pipeline reads from a backbone, as a single tensor
+
+    DINOv2/v3 forward_features (tensor, or the dict of normalized CLS and
+    patch tokens: concatenated back to [batch, 1 + patches, dim]),
+    torchvision EfficientNet `features`, torchvision ViT encoder tokens.
+    """
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        model = self.model
+        if hasattr(model, 'forward_features'):
+            out = model.forward_features(x)
+            if isinstance(out, dict):
+                return torch.cat([out['x_norm_clstoken'].unsqueeze(1), out['x_norm_patchtokens']], dim=1)
+            return out
+        if hasattr(model, 'encoder') and hasattr(model, 'class_token'):
+            tokens = model._process_input(x)
+            cls = model.class_token.expand(x.shape[0], -1, -1)
+            return model.encoder(torch.cat([cls, tokens], dim=1))
+        if hasattr(model, 'features'):
+            return model.features(x)
+        raise TypeError(f"Don't know how to extract features from {type(model).__name__}")
+
+
+class CompiledBackbone(nn.Module):
+    """
+    Exported backbone behind the interface the pipelines use
+    (forward_features / __call__ on a [batch, 3, 224, 224] tensor)
+    """
+
+    def __init__(self, config: Dict[str, Any], runtime: str, module: Optional[nn.Module] = None,
+                 session: Any = None, device: Optional[torch.device] = None):
+        super().__init__()
+        self.config = config
+        self.runtime = runtime
+        self.num_parameters = config.get('num_parameters', 0)
+        self.module = module
+        self._session = session
+        self._device = device or torch.device('cpu')
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if self._session is not None:
+            inputs = {self._session.get_inputs()[0].name: x.detach().cpu().numpy()}
+            return torch.from_numpy(self._session.run(None, inputs)[0]).to(self._device)
+        return self.module(x)
+
+    def forward_features(self, x: torch.Tensor) -> torch.Tensor:
+        return self.forward(x)
+
+
+@contextmanager
+def _quiet_export():
+    """
+    Tracer/exporter warnings about Python-side shape checks are expected here,
+    as are deprecation notices for torch.jit in recent torch releases
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", torch.jit.TracerWarning)
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", FutureWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        yield
+
+
+def export_compiled(model: nn.Module, output_dir: str, formats: List[str],
+                    name: str = "backbone", quantization: str = "none", batch_size: int = 2) -> str:
+    """
+    Export a backbone's feature extractor as a compiled model artifact
+
+    TorchScript: traced and frozen (constants folded, conv/bn and linear
+    ops fused), loadable without any Python model code. ONNX: opset 17
+    graph with a dynamic batch axis for ONNX Runtime.
+
+    Args:
+        model: Backbone in eval mode (fp32, or dynamic int8 for TorchScript)
+        output_dir: Artifact directory to create
+        formats: Any of "torchscript", "onnx"
+        name: Backbone name recorded in the config
+        quantization: Quantization already applied to `model`
+        batch_size: Batch size of the example input used for tracing
+
+    Returns:
+        The artifact directory
+    """
+    if 'onnx' in formats and quantization != 'none':
+        raise ValueError("ONNX export of dynamically quantized models is not supported; export fp32 "
+                         "(ONNX Runtime can quantize the graph itself) or TorchScript only")
+    if 'onnx' in formats and importlib.util.find_spec('onnx') is None:
+        raise RuntimeError("ONNX export needs the optional 'onnx' package")
+
+    extractor = FeatureExtractor(model.cpu().eval()).eval()
+    example = torch.randn(batch_size, 3, INPUT_SIZE, INPUT_SIZE)
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+
+    with torch.no_grad():
+        reference = extractor(example)
+
+        if 'torchscript' in formats:
+            start = time.perf_counter()
+            with _quiet_export():
+                traced = torch.jit.freeze(torch.jit.trace(extractor, example, check_trace=False))
+                error = (traced(example) - reference).abs().max().item()
+            traced.save(os.path.join(output_dir, TORCHSCRIPT_FILE))
+            files['torchscript'] = TORCHSCRIPT_FILE
+            logger.info(f"TorchScript export in {time.perf_counter() - start:.1f}s (max abs error {error:.2e})")
+
+        if 'onnx' in formats:
+            start = time.perf_counter()
+            with _quiet_export():
+                torch.onnx.export(
+                    extractor, (example,), os.path.join(output_dir, ONNX_FILE),
+                    input_names=["pixel_values"], output_names=["features"],
+                    dynamic_axes={"pixel_values": {0: "batch"}, "features": {0: "batch"}},
+                    opset_version=17, dynamo=False
+                )
+            files['onnx'] = ONNX_FILE
+            logger.info(f"ONNX export in {time.perf_counter() - start:.1f}s")
+
+    config = {
+        "format_version": FORMAT_VERSION,
+        "compiled": {
+            "name": name,
+            "files": files,
+            "input_shape": [3, INPUT_SIZE, INPUT_SIZE],
+            "output_shape": list(reference.shape[1:]),
+            "quantization": quantization,
+            "torch_version": torch.__version__
+        },
+        "num_parameters": parameter_count(model)
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), 'w') as f:
+        json.dump(config, f, indent=2)
+
+    logger.info(f"Wrote compiled {name} artifact to {output_dir}")
+    return output_dir
+
+
+def load_compiled_model(artifact_dir: str, config: Dict[str, Any], device: Optional[torch.device] = None,
+                        runtime: Optional[str] = None) -> CompiledBackbone:
+    """
+    Load a compiled model artifact created by export_compiled()
+
+    Args:
+        artifact_dir: Artifact directory
+        config: Its parsed config.json
+        device: Target device (default: CPU)
+        runtime: "torchscript" or "onnxruntime" (default: MODEL_RUNTIME or torchscript)
+
+    Returns:
+        CompiledBackbone
+    """
+    start = time.perf_counter()
+    device = device or torch.device('cpu')
+    runtime = (runtime or os.getenv('MODEL_RUNTIME', 'torchscript')).strip().lower()
+    if runtime not in RUNTIMES:
+        raise ValueError(f"Unknown model runtime {runtime!r} (expected one of {', '.join(RUNTIMES)})")
+
+    compiled = config['compiled']
+    files = compiled['files']
+    key = 'onnx' if runtime == 'onnxruntime' else 'torchscript'
+    if key not in files:
+        raise ValueError(f"{artifact_dir} has no {key} export (has: {', '.join(files) or 'none'})")
+    path = os.path.join(artifact_dir, files[key])
+
+    if runtime == 'onnxruntime':
+        if importlib.util.find_spec('onnxruntime') is None:
+            raise RuntimeError(f"{path} needs the optional 'onnxruntime' package")
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = torch.get_num_threads()
+        providers = ['CPUExecutionProvider']
+        if device.type == 'cuda' and 'CUDAExecutionProvider' in ort.get_available_providers():
+            providers.insert(0, 'CUDAExecutionProvider')
+        session = ort.InferenceSession(path, options, providers=providers)
+        model = CompiledBackbone(config, runtime, session=session, device=device)
+    else:
+        with _quiet_export():
+            module = torch.jit.load(path, map_location=device)
+        model = CompiledBackbone(config, runtime, module=module, device=device)
+
+    model.eval()
+    logger.info(f"Loaded compiled {compiled['name']} ({runtime}) from {artifact_dir} "
+                f"in {time.perf_counter() - start:.2f}s")
+    return model
+
+
+def _load_source(backbone: str, source: Optional[str], quantization: str) -> nn.Module:
+    """Build the eager backbone the way the pipelines do"""
+    from .quantization import quantize_dynamic_int8
+
+    if backbone == 'dinov3':
+        if not source:
+            raise ValueError("dinov3 export needs --source (checkpoint or model artifact)")
+        from .dinov3_model import DINOv3Analyzer
+        model = DINOv3Analyzer(source, quantization='none').model.cpu()
+    else:
+        model = torch.hub.load(VISION_HUB_REPO, BACKBONES[backbone], pretrained=True)
+
+    model.eval()
+    if quantization == 'dynamic_int8':
+        model = quantize_dynamic_int8(model, inplace=True)
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a backbone as a compiled (TorchScript/ONNX) model artifact")
+    parser.add_argument('backbone', choices=sorted(BACKBONES))
+    parser.add_argument('output_dir', help="Artifact directory to create")
+    parser.add_argument('--source', help="dinov3: .pth checkpoint or model artifact directory")
+    parser.add_argument('--format', nargs='+', choices=['torchscript', 'onnx'], default=['torchscript'])
+    parser.add_argument('--quantization', choices=['none', 'dynamic_int8'], default='none',
+                        help="Quantize before export (TorchScript only)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    model = _load_source(args.backbone, args.source, args.quantization)
+    export_compiled(model, args.output_dir, args.format, args.backbone, args.quantization)
+
+
+if __name__ == "__main__":
+    main()
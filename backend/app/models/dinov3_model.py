@@ -1,11 +1,20 @@
+import os
 import torch
 import torch.nn as nn
 import torchvision.transforms as transforms
 from PIL import Image
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import logging
 
+from .model_artifact import is_model_artifact, load_model_artifact
+from .compiled_model import CompiledBackbone
+from .quantization import resolve_quantization, quantize_dynamic_int8, parameter_count
+from .feature_stats import batch_feature_stats_list
+from .preprocessing import IMAGENET_MEAN, IMAGENET_STD, INPUT_SIZE, batch_tensor, resize_center_crop_uint8
+
+from ..services.metrics import span
+
 logger = logging.getLogger(__name__)
 
 class DINOv3Analyzer:
@@ -14,26 +23,40 @@ class DINOv3Analyzer:
     Loads the 25GB .pth file and provides authenticity analysis
     """
     
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, quantization: Optional[str] = None):
         """
         Initialize DINOv3 analyzer with model weights
         
         Args:
-            model_path: Path to the 25GB .pth file
+            model_path: Path to the 25GB .pth file, or a model artifact directory
+                        (see model_artifact.py)
+            quantization: "none" or "dynamic_int8" (CPU only; see quantization.py)
+                          (default: DINOV3_QUANTIZATION or none)
         """
         self.model_path = model_path
+        self.quantization = resolve_quantization(quantization)
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = None
         self.transform = None
+        self._model_info = None
         
         logger.info(f"Initializing DINOv3 Analyzer on device: {self.device}")
         self._load_model()
+        self._quantize_model()
         self._setup_transforms()
     
     def _load_model(self):
-        """Load DINOv3 model from .pth file"""
+        """Load DINOv3 model from a model artifact or a .pth file"""
         try:
             logger.info(f"Loading DINOv3 model from: {self.model_path}")
+            self._model_info = None
+            
+            # Converted artifact: local architecture, memory-mapped weights, no network
+            # (or a compiled TorchScript/ONNX export, see compiled_model.py)
+            if is_model_artifact(self.model_path):
+                self.model = load_model_artifact(self.model_path, self.device)
+                logger.info("DINOv3 model loaded successfully")
+                return
             
             # Import DINOv3 from Facebook Research
             import torch.hub
@@ -59,15 +82,39 @@ class DINOv3Analyzer:
             self.model = None
             raise
     
+    def _quantize_model(self):
+        """Apply the configured quantization to the loaded model"""
+        if isinstance(self.model, CompiledBackbone):
+            # Quantization is baked into a compiled export (compiled_model.py --quantization)
+            compiled = self.model.config['compiled']
+            if self.quantization not in ('none', compiled['quantization']):
+                logger.warning(f"DINOv3 {self.quantization} quantization ignored for compiled model "
+                               f"exported with quantization={compiled['quantization']}")
+            self.quantization = compiled['quantization']
+            return
+        
+        if self.quantization == 'none':
+            return
+        
+        if self.device.type != 'cpu':
+            logger.warning(f"DINOv3 {self.quantization} quantization is CPU-only; running fp32 on {self.device}")
+            self.quantization = 'none'
+            return
+        
+        self.model = quantize_dynamic_int8(self.model, inplace=True)
+        logger.info("DINOv3 linear layers quantized to int8 (dynamic)")
+    
     def _setup_transforms(self):
         """Setup image preprocessing transforms for DINOv3"""
         self.transform = transforms.Compose([
-            transforms.Resize(224),
-            transforms.CenterCrop(224),
+            transforms.Resize(INPUT_SIZE),
+            transforms.CenterCrop(INPUT_SIZE),
             transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485, 0.456, 0.406], 
-                               std=[0.229, 0.224, 0.225])
+            transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD)
         ])
+        # Reduced-size JPEG decode and uint8 resize (see preprocessing.py);
+        # the torchvision transform above stays as the reference path
+        self.fast_preprocess = os.getenv('DINOV3_FAST_PREPROCESS', 'true').lower() in ('1', 'true', 'yes')
     
     def analyze_image(self, image: Image.Image) -> Dict[str, Any]:
         """
@@ -83,55 +130,84 @@ class DINOv3Analyzer:
             raise RuntimeError("DINOv3 model not loaded")
         
         try:
-            # Preprocess image
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            img_tensor = self.transform(image).unsqueeze(0).to(self.device)
-            
-            # Extract features
-            with torch.no_grad():
-                features = self.model.forward_features(img_tensor)
-            
-            # Analyze features for authenticity
-            analysis = self._analyze_features(features, image.size)
-            
-            return analysis
+            # Fast preprocessing can shrink a JPEG in place; take the size first
+            image_size = image.size
+            return self.analyze_batch([self.preprocess(image)], [image_size])[0]
             
         except Exception as e:
             logger.error(f"Image analysis failed: {e}")
             raise
     
-    def _analyze_features(self, features: torch.Tensor, image_size: tuple) -> Dict[str, Any]:
+    def preprocess(self, image: Image.Image) -> torch.Tensor:
         """
-        Analyze DINOv3 features for authenticity indicators
+        Convert an image to an input tensor
+        
+        With fast preprocessing the image is consumed: an undecoded JPEG
+        is decoded in place at reduced size, which changes `image.size`
+        and its pixels; read anything needed from it before calling this.
         
         Args:
-            features: DINOv3 feature tensor
-            image_size: Original image dimensions (width, height)
+            image: PIL Image object
             
         Returns:
-            Authenticity analysis results
+            Tensor of shape [3, 224, 224], not yet on the model device: uint8
+            with fast preprocessing (normalized in analyze_batch), otherwise
+            normalized float
         """
-        try:
-            # Extract global features (CLS token)
-            global_features = features[:, 0, :]  # Shape: [1, feature_dim]
-            
-            # Extract patch features (excluding CLS token)
-            patch_features = features[:, 1:, :]  # Shape: [1, num_patches, feature_dim]
+        with span("preprocess"):
+            if self.fast_preprocess:
+                return resize_center_crop_uint8(image)
             
-            # Calculate feature statistics
-            global_mean = global_features.mean().item()
-            global_std = global_features.std().item()
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
             
-            patch_mean = patch_features.mean().item()
-            patch_std = patch_features.std().item()
+            return self.transform(image)
+    
+    def analyze_batch(self, tensors: List[torch.Tensor], image_sizes: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Run one batched forward pass and analyze each image's features
+        
+        Args:
+            tensors: Preprocessed tensors from preprocess()
+            image_sizes: Original image dimensions (width, height), one per tensor
             
-            # Calculate feature diversity (how varied the features are)
-            feature_diversity = torch.std(patch_features, dim=1).mean().item()
+        Returns:
+            Analysis results, in the same order as the inputs
+        """
+        if self.model is None:
+            raise RuntimeError("DINOv3 model not loaded")
+        
+        batch = batch_tensor(tensors, self.device)
+        
+        # Extract features
+        with span("forward_features"), torch.no_grad():
+            features = self.model.forward_features(batch)
+        
+        # Analyze features for authenticity: statistics for the whole batch
+        # on the device with one host transfer, then per-image scoring
+        with span("analyze_features"):
+            batch_stats = batch_feature_stats_list(features)
+            return [
+                self._analyze_features(stats, features.shape, image_size)
+                for stats, image_size in zip(batch_stats, image_sizes)
+            ]
+    
+    def _analyze_features(self, stats: Dict[str, float], feature_shape: torch.Size,
+                          image_size: tuple) -> Dict[str, Any]:
+        """
+        Analyze DINOv3 feature statistics for authenticity indicators
+        
+        Args:
+            stats: One image's statistics from batch_feature_stats_list()
+            feature_shape: Shape of the feature tensor [batch, 1 + num_patches, feature_dim]
+            image_size: Original image dimensions (width, height)
             
-            # Calculate feature consistency (how consistent features are across patches)
-            feature_consistency = torch.mean(torch.std(patch_features, dim=2)).item()
+        Returns:
+            Authenticity analysis results
+        """
+        try:
+            feature_diversity = stats["feature_diversity"]
+            feature_consistency = stats["feature_consistency"]
             
             # Analyze for AI generation indicators
             ai_indicators = self._detect_ai_indicators(
@@ -155,14 +231,14 @@ class DINOv3Analyzer:
                 "confidence": round(confidence, 2),
                 "feature_anomalies": ai_indicators,
                 "feature_stats": {
-                    "global_mean": round(global_mean, 4),
-                    "global_std": round(global_std, 4),
-                    "patch_mean": round(patch_mean, 4),
-                    "patch_std": round(patch_std, 4),
+                    "global_mean": round(stats["global_mean"], 4),
+                    "global_std": round(stats["global_std"], 4),
+                    "patch_mean": round(stats["patch_mean"], 4),
+                    "patch_std": round(stats["patch_std"], 4),
                     "feature_diversity": round(feature_diversity, 4),
                     "feature_consistency": round(feature_consistency, 4),
-                    "num_patches": patch_features.shape[1],
-                    "feature_dimension": patch_features.shape[2]
+                    "num_patches": feature_shape[1] - 1,
+                    "feature_dimension": feature_shape[2]
                 }
             }
             
@@ -279,14 +355,18 @@ class DINOv3Analyzer:
         return min(1.0, confidence)
     
     def get_model_info(self) -> Dict[str, Any]:
-        """Get information about the loaded model"""
+        """Get information about the loaded model (computed once per load)"""
         if self.model is None:
             return {"status": "not_loaded"}
         
-        return {
-            "status": "loaded",
-            "device": str(self.device),
-            "model_path": self.model_path,
-            "parameters": sum(p.numel() for p in self.model.parameters()),
-            "trainable_parameters": sum(p.numel() for p in self.model.parameters() if p.requires_grad)
-        }
+        if self._model_info is None:
+            self._model_info = {
+                "status": "loaded",
+                "device": str(self.device),
+                "model_path": self.model_path,
+                "quantization": self.quantization,
+                "runtime": getattr(self.model, 'runtime', 'eager'),
+                "parameters": parameter_count(self.model),
+                "trainable_parameters": sum(p.numel() for p in self.model.parameters() if p.requires_grad)
+            }
+        return dict(self._model_info)
@@ -0,0 +1,67 @@
+from typing import Dict, List
+
+import torch
+
+# Column order of batch_feature_stats()
+FEATURE_STATS = (
+    "global_mean", "global_std",
+    "patch_mean", "patch_std",
+    "feature_diversity", "feature_consistency",
+)
+
+
+def _std(total: torch.Tensor, squares: torch.Tensor, count: int) -> torch.Tensor:
+    """Unbiased std from the sum and sum of squares of `count` (centred) values"""
+    return ((squares - total * total / count) / (count - 1)).clamp_min(0).sqrt()
+
+
+def batch_feature_stats(features: torch.Tensor) -> torch.Tensor:
+    """
+    Authenticity statistics of a batch of DINOv3 tokens, on the features' device
+
+    Per image: mean/std of the CLS token, mean/std over all patch tokens,
+    diversity (std across patches, averaged over channels) and consistency
+    (std across channels, averaged over patches). Std is unbiased, matching
+    Tensor.std(). All patch statistics come from one set of first and second
+    moments of the whole batch, centred on each image's patch mean to keep
+    the sum-of-squares form accurate, so the number of reductions does not
+    grow with the batch size.
+
+    Args:
+        features: Token tensor [batch, 1 + num_patches, feature_dim], CLS first
+
+    Returns:
+        [batch, len(FEATURE_STATS)] float32 tensor
+    """
+    features = features.float()
+    global_std, global_mean = torch.std_mean(features[:, 0, :], dim=1)
+
+    patches = features[:, 1:, :]
+    num_patches, dim = patches.shape[1], patches.shape[2]
+    patch_mean = patches.mean(dim=(1, 2))
+    centred = patches - patch_mean[:, None, None]
+    squared = centred * centred
+
+    # Per-channel (across patches) and per-patch (across channels) moments
+    channel_sum, channel_squares = centred.sum(dim=1), squared.sum(dim=1)
+    token_sum, token_squares = centred.sum(dim=2), squared.sum(dim=2)
+
+    patch_std = _std(token_sum.sum(dim=1), token_squares.sum(dim=1), num_patches * dim)
+    diversity = _std(channel_sum, channel_squares, num_patches).mean(dim=1)
+    consistency = _std(token_sum, token_squares, dim).mean(dim=1)
+
+    return torch.stack([global_mean, global_std, patch_mean, patch_std, diversity, consistency], dim=1)
+
+
+def batch_feature_stats_list(features: torch.Tensor) -> List[Dict[str, float]]:
+    """
+    batch_feature_stats() as one dict per image, with a single device-to-host copy
+
+    Args:
+        features: Token tensor [batch, 1 + num_patches, feature_dim], CLS first
+
+    Returns:
+        Statistics by name, one dict per image in batch order
+    """
+    rows = batch_feature_stats(features).cpu().tolist()
+    return [dict(zip(FEATURE_STATS, row)) for row in rows]
@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import shutil
+import logging
+import argparse
+import importlib.util
+from typing import Dict, Any, Optional
+
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = "config.json"
+ARCH_DIR = "arch"
+SAFETENSORS_FILE = "weights.safetensors"
+TORCH_FILE = "weights.pt"
+FORMAT_VERSION = 1
+
+DEFAULT_HUB_REPO = "facebookresearch/dinov2"
+DEFAULT_ENTRYPOINT = "dinov2_vitb14"
+
+
+def is_model_artifact(path: str) -> bool:
+    """True if `path` is a model artifact directory rather than a legacy .pth file"""
+    return os.path.isdir(path) and os.path.isfile(os.path.join(path, CONFIG_FILE))
+
+
+def _hub_cache_dir(repo: str = DEFAULT_HUB_REPO) -> str:
+    """Directory torch.hub would have cloned `repo` into"""
+    owner, name = repo.split('/')
+    return os.path.join(torch.hub.get_dir(), f"{owner}_{name}_main")
+
+
+def _build_architecture(arch_dir: str, entrypoint: str, kwargs: Dict[str, Any]) -> nn.Module:
+    """Build the model from a local hubconf.py without any network access"""
+    return torch.hub.load(arch_dir, entrypoint, source='local', trust_repo=True, **kwargs)
+
+
+def _load_weights(artifact_dir: str, config: Dict[str, Any]) -> Dict[str, torch.Tensor]:
+    """
+    Memory-map the weights file
+
+    Tensors are backed by the page cache rather than copied into process
+    memory, so load time is bounded by page-in and workers on the same host
+    share physical pages.
+    """
+    weights = config['weights']
+    path = os.path.join(artifact_dir, weights)
+
+    if weights.endswith('.safetensors'):
+        if importlib.util.find_spec('safetensors') is None:
+            raise RuntimeError(f"{path} needs the optional 'safetensors' package")
+        from safetensors.torch import load_file
+        return load_file(path, device='cpu')
+
+    return torch.load(path, map_location='cpu', mmap=True, weights_only=True)
+
+
+def load_model_artifact(artifact_dir: str, device: Optional[torch.device] = None) -> nn.Module:
+    """
+    Load a model artifact created by convert_checkpoint()
+
+    The module is built on the meta device (no parameter allocation or
+    random init) and the memory-mapped tensors are assigned in place.
+    Compiled artifacts (see compiled_model.py) load their TorchScript or
+    ONNX export instead.
+
+    Args:
+        artifact_dir: Artifact directory
+        device: Target device (default: CPU, where weights stay memory-mapped)
+
+    Returns:
+        Model in eval mode
+    """
+    start = time.perf_counter()
+    with open(os.path.join(artifact_dir, CONFIG_FILE)) as f:
+        config = json.load(f)
+
+    if config.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact version: {config.get('format_version')}")
+
+    if 'compiled' in config:
+        from .compiled_model import load_compiled_model
+        return load_compiled_model(artifact_dir, config, device)
+
+    arch = config['architecture']
+    arch_dir = os.path.join(artifact_dir, arch['dir'])
+
+    with torch.device('meta'):
+        model = _build_architecture(arch_dir, arch['entrypoint'], arch.get('kwargs', {}))
+
+    state_dict = _load_weights(artifact_dir, config)
+    model.load_state_dict(state_dict, strict=True, assign=True)
+
+    unloaded = [name for name, t in list(model.named_parameters()) + list(model.named_buffers())
+                if t.is_meta]
+    if unloaded:
+        raise ValueError(f"Model artifact is missing tensors: {unloaded[:5]}")
+
+    model.eval()
+    if device is not None and device.type != 'cpu':
+        model.to(device)
+
+    logger.info(f"Loaded model artifact {artifact_dir} in {time.perf_counter() - start:.2f}s")
+    return model
+
+
+def convert_checkpoint(checkpoint_path: str, output_dir: str, hub_dir: Optional[str] = None,
+                       entrypoint: str = DEFAULT_ENTRYPOINT, use_safetensors: Optional[bool] = None) -> str:
+    """
+    Convert a legacy .pth checkpoint into a model artifact
+
+    Reproduces the legacy load (architecture from torch.hub, pretrained=False,
+    load_state_dict(strict=False)) once, then stores the resulting full state
+    dict next to a copy of the architecture code.
+
+    Args:
+        checkpoint_path: Legacy .pth state dict
+        output_dir: Artifact directory to create
+        hub_dir: Local checkout of the hub repo (default: the torch.hub cache)
+        entrypoint: hubconf entry point building the architecture
+        use_safetensors: Write safetensors (default: if the package is installed)
+
+    Returns:
+        The artifact directory
+    """
+    hub_dir = hub_dir or _hub_cache_dir()
+    if not os.path.isfile(os.path.join(hub_dir, 'hubconf.py')):
+        raise FileNotFoundError(
+            f"No hubconf.py in {hub_dir}; clone {DEFAULT_HUB_REPO} there or pass --hub-dir"
+        )
+    if use_safetensors is None:
+        use_safetensors = importlib.util.find_spec('safetensors') is not None
+
+    kwargs = {"pretrained": False}
+    model = _build_architecture(hub_dir, entrypoint, kwargs)
+    checkpoint = torch.load(checkpoint_path, map_location='cpu')
+    result = model.load_state_dict(checkpoint, strict=False)
+    if result.missing_keys:
+        logger.warning(f"{len(result.missing_keys)} tensors missing from checkpoint keep their initial values")
+
+    os.makedirs(output_dir, exist_ok=True)
+    shutil.copytree(hub_dir, os.path.join(output_dir, ARCH_DIR), dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns('.git', '__pycache__', '*.pyc'))
+
+    state_dict = {k: v.detach().contiguous() for k, v in model.state_dict().items()}
+    if use_safetensors:
+        from safetensors.torch import save_file
+        weights = SAFETENSORS_FILE
+        save_file(state_dict, os.path.join(output_dir, weights))
+    else:
+        weights = TORCH_FILE
+        torch.save(state_dict, os.path.join(output_dir, weights))
+
+    config = {
+        "format_version": FORMAT_VERSION,
+        "architecture": {"dir": ARCH_DIR, "entrypoint": entrypoint, "kwargs": kwargs},
+        "weights": weights,
+        "source_checkpoint": os.path.basename(checkpoint_path),
+        "num_parameters": sum(v.numel() for v in state_dict.values())
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), 'w') as f:
+        json.dump(config, f, indent=2)
+
+    logger.info(f"Wrote model artifact to {output_dir}")
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a DINOv3 .pth checkpoint into a model artifact")
+    parser.add_argument('checkpoint', help="Legacy .pth state dict")
+    parser.add_argument('output_dir', help="Artifact directory to create")
+    parser.add_argument('--hub-dir', help=f"Local checkout of {DEFAULT_HUB_REPO} (default: torch.hub cache)")
+    parser.add_argument('--entrypoint', default=DEFAULT_ENTRYPOINT)
+    parser.add_argument('--format', choices=['auto', 'safetensors', 'torch'], default='auto')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    use_safetensors = None if args.format == 'auto' else args.format == 'safetensors'
+    convert_checkpoint(args.checkpoint, args.output_dir, args.hub_dir, args.entrypoint, use_safetensors)
+
+
+if __name__ == "__main__":
+    main()
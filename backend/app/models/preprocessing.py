@@ -0,0 +1,102 @@
+from typing import List, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+
+INPUT_SIZE = 224
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+# Resize in two steps (integer box reduction, then bilinear) once the image is
+# at least this many times larger than the output; see Image.resize
+REDUCING_GAP = 3.0
+
+# JPEG draft decode to at least this multiple of the resized size: DCT scaling
+# straight to the target drops more detail than an antialiased resize does
+DRAFT_OVERSAMPLE = 2
+
+
+def _resize_geometry(width: int, height: int, size: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Output size of Resize(size) (shorter side to `size`) and the top-left
+    corner of CenterCrop(size) in it, as torchvision computes them
+    """
+    if width <= height:
+        resized = (size, int(size * height / width))
+    else:
+        resized = (int(size * width / height), size)
+    left = int(round((resized[0] - size) / 2.0))
+    top = int(round((resized[1] - size) / 2.0))
+    return resized, (left, top)
+
+
+def resize_center_crop_uint8(image: Image.Image, size: int = INPUT_SIZE) -> torch.Tensor:
+    """
+    Resize(size) + CenterCrop(size) of an image as a uint8 tensor
+
+    Equivalent to the torchvision transform up to resampling differences,
+    but only does the work that survives the crop:
+    - a JPEG that has not been decoded yet is decoded with DCT scaling
+      (draft mode) at the smallest 1/2, 1/4 or 1/8 scale still at least
+      DRAFT_OVERSAMPLE times the resized image
+    - only the region kept by the center crop is resampled, straight to
+      size x size, with a box reduction first for large downscales
+    - everything stays uint8; conversion to float and normalization
+      happen once per batch in batch_tensor()
+
+    Consumes `image`: an undecoded JPEG is decoded in place at the reduced
+    size, so afterwards its size and pixels are those of the draft. Read
+    anything else needed from it first. Copying it beforehand would mean a
+    full-resolution decode, which is the cost this function avoids.
+
+    Args:
+        image: PIL Image object (consumed, see above)
+        size: Output side length
+
+    Returns:
+        uint8 tensor of shape [3, size, size]
+    """
+    (resized_w, resized_h), (left, top) = _resize_geometry(image.width, image.height, size)
+
+    # No-op for other formats and for images that are already loaded
+    image.draft('RGB', (resized_w * DRAFT_OVERSAMPLE, resized_h * DRAFT_OVERSAMPLE))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Crop box in source pixels (after any draft scaling)
+    scale_x, scale_y = image.width / resized_w, image.height / resized_h
+    box = (left * scale_x, top * scale_y, (left + size) * scale_x, (top + size) * scale_y)
+    cropped = image.resize((size, size), Image.BILINEAR, box=box, reducing_gap=REDUCING_GAP)
+
+    return torch.from_numpy(np.array(cropped)).permute(2, 0, 1)
+
+
+def batch_tensor(tensors: List[torch.Tensor], device: torch.device) -> torch.Tensor:
+    """
+    Stack preprocessed images into one normalized float32 batch on `device`
+
+    uint8 images (resize_center_crop_uint8) are converted and normalized
+    directly in a single preallocated batch tensor, so no per-image float
+    copies are made; on CUDA only uint8 data crosses to the device. Float
+    tensors (already normalized, e.g. from the torchvision transform) are
+    stacked as they are.
+
+    Args:
+        tensors: [3, H, W] tensors, all uint8 or all float
+        device: Target device
+
+    Returns:
+        Tensor of shape [batch, 3, H, W]
+    """
+    if tensors[0].dtype != torch.uint8:
+        return torch.stack(tensors).to(device)
+
+    batch = torch.empty((len(tensors), *tensors[0].shape), dtype=torch.float32, device=device)
+    for slot, tensor in zip(batch, tensors):
+        slot.copy_(tensor, non_blocking=True)
+
+    # ToTensor + Normalize: (x / 255 - mean) / std == (x - 255 * mean) / (255 * std)
+    mean = torch.tensor(IMAGENET_MEAN, device=device).view(3, 1, 1) * 255
+    std = torch.tensor(IMAGENET_STD, device=device).view(3, 1, 1) * 255
+    return batch.sub_(mean).div_(std)
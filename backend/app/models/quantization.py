@@ -0,0 +1,84 @@
+import io
+import os
+import logging
+import warnings
+from typing import Optional
+
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("none", "dynamic_int8")
+
+
+def resolve_quantization(mode: Optional[str] = None) -> str:
+    """
+    Validate a quantization mode
+
+    Args:
+        mode: One of QUANTIZATION_MODES (default: DINOV3_QUANTIZATION or "none")
+
+    Returns:
+        The normalized mode
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = (mode if mode is not None else os.getenv('DINOV3_QUANTIZATION', 'none')).strip().lower()
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown DINOv3 quantization {mode!r} (expected one of {', '.join(QUANTIZATION_MODES)})")
+    return mode
+
+
+def quantize_dynamic_int8(model: nn.Module, inplace: bool = False) -> nn.Module:
+    """
+    Dynamic int8 quantization of every nn.Linear (CPU only)
+
+    Weights are stored as int8 with a per-tensor scale; activations are
+    quantized on the fly per batch, so no calibration data is needed. In a
+    ViT the linear layers (qkv, attention projection, MLP) hold nearly all
+    weights and FLOPs; patch embedding, norms and the softmax stay fp32.
+
+    Args:
+        model: fp32 model in eval mode, on the CPU
+        inplace: Swap modules in `model` instead of copying it first
+            (avoids holding two copies of a large model)
+
+    Returns:
+        The quantized model
+    """
+    from torch.ao.quantization import quantize_dynamic
+
+    # torch.ao.quantization is deprecated in favour of torchao's quantize_();
+    # it still ships with torch and needs no extra dependency
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        return quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=inplace)
+
+
+def parameter_count(model: nn.Module) -> int:
+    """Number of weights, including the packed weights of quantized linear layers"""
+    # Compiled backbones fold weights into the graph; their export recorded the count
+    recorded = getattr(model, 'num_parameters', None)
+    if recorded is not None:
+        return recorded
+    count = sum(p.numel() for p in model.parameters())
+    for module in model.modules():
+        # Dynamic quantized Linear keeps weight and bias outside parameters()
+        packed = getattr(module, '_packed_params', None)
+        if packed is not None and callable(getattr(module, 'weight', None)):
+            count += module.weight().numel()
+            bias = module.bias()
+            count += bias.numel() if bias is not None else 0
+    return count
+
+
+def model_size_bytes(model: nn.Module) -> int:
+    """Size of the serialized state dict (weights as stored in memory)"""
+    buffer = io.BytesIO()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        torch.save(model.state_dict(), buffer)
+    return buffer.tell()
@@ -0,0 +1,159 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from ..services.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+def _warmup_image(size: tuple = (1280, 960)) -> Image.Image:
+    """Deterministic photo-sized RGB image (gradient plus noise)"""
+    width, height = size
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+    noise = rng.normal(0, 25, size=(height, width, 3)).astype(np.float32)
+    return Image.fromarray(np.clip(gradient + noise, 0, 255).astype(np.uint8), mode="RGB")
+
+
+def _parse_batch_sizes(value: str) -> List[int]:
+    sizes = sorted({int(part) for part in value.split(',') if part.strip()})
+    if not sizes or sizes[0] < 1:
+        raise ValueError(f"Invalid DINOV3_WARMUP_BATCH_SIZES: {value!r}")
+    return sizes
+
+
+class ModelWarmup:
+    """
+    Warm-up of the DINOv3 inference path before an instance reports ready
+    Runs representative batch sizes through preprocessing, the forward pass
+    and feature analysis, so allocator growth, oneDNN kernel selection and
+    first-call overheads are paid before the first real request.
+    """
+
+    def __init__(self, analyzer, max_batch_size: int = 1, batch_sizes: Optional[List[int]] = None,
+                 iterations: Optional[int] = None, enabled: Optional[bool] = None,
+                 max_attempts: Optional[int] = None, retry_delay: Optional[float] = None):
+        """
+        Initialize warm-up
+
+        Args:
+            analyzer: DINOv3Analyzer instance
+            max_batch_size: Largest batch the scheduler forms (1 without batching)
+            batch_sizes: Batch sizes to run (default: DINOV3_WARMUP_BATCH_SIZES, or
+                         1 and every power of two up to max_batch_size)
+            iterations: Passes per batch size (default: DINOV3_WARMUP_ITERATIONS or 2)
+            enabled: Turn warm-up on/off (default: DINOV3_WARMUP or true)
+            max_attempts: Warm-up runs before giving up (default: DINOV3_WARMUP_MAX_ATTEMPTS or 3)
+            retry_delay: Seconds before the first retry, doubled for each further one
+                         (default: DINOV3_WARMUP_RETRY_DELAY or 5)
+        """
+        self.analyzer = analyzer
+        self.enabled = enabled if enabled is not None else \
+            os.getenv('DINOV3_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+
+        if batch_sizes is None and os.getenv('DINOV3_WARMUP_BATCH_SIZES'):
+            batch_sizes = _parse_batch_sizes(os.getenv('DINOV3_WARMUP_BATCH_SIZES'))
+        if batch_sizes is None:
+            batch_sizes = sorted({1, max_batch_size} | {2 ** i for i in range(max_batch_size.bit_length())
+                                                       if 2 ** i <= max_batch_size})
+        self.batch_sizes = batch_sizes
+        self.iterations = iterations or int(os.getenv('DINOV3_WARMUP_ITERATIONS', '2'))
+        self.max_attempts = max_attempts or int(os.getenv('DINOV3_WARMUP_MAX_ATTEMPTS', '3'))
+        self.retry_delay = retry_delay if retry_delay is not None else \
+            float(os.getenv('DINOV3_WARMUP_RETRY_DELAY', '5'))
+
+        self.state = "pending" if self.enabled else "disabled"
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self._task: Optional[asyncio.Task] = None
+        self._duration_ms = 0.0
+        self._batch_ms: Dict[int, List[float]] = {}
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up finished (or is disabled)"""
+        return self.state in ("ready", "disabled")
+
+    @property
+    def failed(self) -> bool:
+        """True once every attempt failed; the process cannot serve and should be restarted"""
+        return self.state == "failed"
+
+    def start(self):
+        """Run the warm-up in the background on the running event loop"""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def wait(self):
+        """Wait for a started warm-up to finish"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def stop(self):
+        """Stop waiting for the warm-up (a pass already running finishes in its thread)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self):
+        """Run every warm-up pass off the event loop, retrying with backoff"""
+        self.state = "running"
+        start = time.perf_counter()
+        delay = self.retry_delay
+        while True:
+            self.attempts += 1
+            try:
+                with span("warmup"):
+                    await asyncio.to_thread(self._run_passes)
+            except Exception as e:
+                self.error = str(e)
+                if self.attempts >= self.max_attempts:
+                    self.state = "failed"
+                    self._duration_ms = (time.perf_counter() - start) * 1000
+                    logger.error(f"DINOv3 warm-up failed after {self.attempts} attempts: {e}")
+                    return
+                logger.warning(f"DINOv3 warm-up attempt {self.attempts} failed: {e}; retrying in {delay:g}s")
+                await asyncio.sleep(delay)
+                delay *= 2
+                continue
+
+            self.state = "ready"
+            self.error = None
+            self._duration_ms = (time.perf_counter() - start) * 1000
+            logger.info(f"DINOv3 warm-up completed in {self._duration_ms:.0f}ms "
+                        f"(batch sizes {self.batch_sizes}, {self.iterations} passes each)")
+            return
+
+    def _run_passes(self):
+        image = _warmup_image()
+        self._batch_ms.clear()
+        for batch_size in self.batch_sizes:
+            timings = self._batch_ms.setdefault(batch_size, [])
+            for _ in range(self.iterations):
+                pass_start = time.perf_counter()
+                tensors = [self.analyzer.preprocess(image) for _ in range(batch_size)]
+                self.analyzer.analyze_batch(tensors, [image.size] * batch_size)
+                timings.append(round((time.perf_counter() - pass_start) * 1000, 2))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Warm-up state, configuration and per-pass timings"""
+        return {
+            "state": self.state,
+            "error": self.error,
+            "attempts": self.attempts,
+            "batch_sizes": self.batch_sizes,
+            "iterations": self.iterations,
+            "duration_ms": round(self._duration_ms, 2),
+            # First pass vs. the rest shows what the warm-up absorbed
+            "pass_ms": {str(size): timings for size, timings in self._batch_ms.items()}
+        }
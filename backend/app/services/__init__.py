@@ -1,4 +1,18 @@
 # Services Package
+from .analysis_pool import AnalysisPool, PoolSaturatedError
+from .batch_inputs import archive_format, iter_upload_images
+from .gemini_client import GeminiClient, get_gemini_client
 from .gemini_service import GeminiReportService
+from .gemini_prober import GeminiStatusProber
+from .metrics import CONTENT_TYPE_LATEST, record_stage, render_latest, span, stage_breakdown, timed
+from .job_queue import Job, JobQueue, JobWorker, RedisJobQueue, SQLiteJobQueue, create_job_queue
+from .result_cache import ResultCache
+from .near_duplicate_index import NearDuplicateIndex, perceptual_hash, perceptual_hash_bytes
 
-__all__ = ['GeminiReportService']
+__all__ = [
+    'AnalysisPool', 'PoolSaturatedError',
+    'GeminiClient', 'GeminiReportService', 'GeminiStatusProber', 'NearDuplicateIndex', 'ResultCache',
+    'Job', 'JobQueue', 'JobWorker', 'RedisJobQueue', 'SQLiteJobQueue',
+    'CONTENT_TYPE_LATEST', 'record_stage', 'render_latest', 'span', 'stage_breakdown', 'timed',
+    'archive_format', 'create_job_queue', 'get_gemini_client', 'iter_upload_images', 'perceptual_hash', 'perceptual_hash_bytes'
+]
@@ -0,0 +1,148 @@
+import os
+import math
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+import multiprocessing
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+POOL_MODES = ('thread', 'process')
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when the analysis pool already holds its maximum number of requests"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Analysis pool saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AnalysisPool:
+    """
+    Executor for the CPU-bound part of image verification
+    Keeps analysis off the event loop on a thread or process pool and admits
+    at most `max_in_flight` requests at a time; excess requests are rejected
+    with a Retry-After estimate instead of queuing without bound.
+    """
+
+    def __init__(self, mode: Optional[str] = None, max_workers: Optional[int] = None,
+                 max_in_flight: Optional[int] = None, start_method: Optional[str] = None):
+        """
+        Initialize analysis pool
+
+        Args:
+            mode: 'thread' or 'process' (default: ANALYSIS_POOL_MODE or thread)
+            max_workers: Pool size (default: ANALYSIS_MAX_WORKERS or CPU count)
+            max_in_flight: Admitted requests, running plus queued
+                           (default: ANALYSIS_MAX_IN_FLIGHT or 2 * max_workers)
+            start_method: multiprocessing start method for process mode
+                          (default: ANALYSIS_START_METHOD or spawn)
+        """
+        self.mode = mode or os.getenv('ANALYSIS_POOL_MODE', 'thread')
+        if self.mode not in POOL_MODES:
+            raise ValueError(f"ANALYSIS_POOL_MODE must be one of {POOL_MODES}, got {self.mode!r}")
+        self.max_workers = max_workers or int(os.getenv('ANALYSIS_MAX_WORKERS', str(os.cpu_count() or 1)))
+        self.max_in_flight = max_in_flight or int(os.getenv('ANALYSIS_MAX_IN_FLIGHT', str(2 * self.max_workers)))
+        # spawn: forking a process that already runs threads (uvicorn, httpx) is unsafe
+        self.start_method = start_method or os.getenv('ANALYSIS_START_METHOD', 'spawn')
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._duration_total = 0.0
+
+    @property
+    def is_process_pool(self) -> bool:
+        return self.mode == 'process'
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.is_process_pool:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context(self.start_method)
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis")
+                logger.info(f"Analysis pool started ({self.mode}, {self.max_workers} workers, "
+                            f"max_in_flight={self.max_in_flight})")
+            return self._executor
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up, from the average request duration"""
+        with self._lock:
+            finished = self._admitted - self._in_flight
+            average = self._duration_total / finished if finished else 1.0
+            backlog = max(1, self._in_flight - self.max_workers + 1)
+        return max(1, math.ceil(average * backlog / self.max_workers))
+
+    @contextmanager
+    def admit(self):
+        """
+        Reserve a slot for one request
+
+        Raises:
+            PoolSaturatedError: If max_in_flight requests are already admitted
+        """
+        with self._lock:
+            saturated = self._in_flight >= self.max_in_flight
+            if saturated:
+                self._rejected += 1
+            else:
+                self._in_flight += 1
+                self._admitted += 1
+        if saturated:
+            raise PoolSaturatedError(self.retry_after())
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._duration_total += time.perf_counter() - start
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run func(*args) on the pool without blocking the event loop
+
+        In process mode func and args must be picklable (module-level
+        functions; pass large pixel buffers via image_analysis.share_image).
+
+        Returns:
+            func's return value
+        """
+        loop = asyncio.get_running_loop()
+        if self.is_process_pool:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        # Threads see the caller's context vars (e.g. the per-request stage breakdown)
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_executor(), context.run, func, *args)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._admitted - self._in_flight
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "average_seconds": round(self._duration_total / finished, 3) if finished else 0
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,77 @@
+import os
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+# Archive members with other extensions (manifests, checksums, ...) are skipped
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def archive_format(head: bytes) -> Optional[str]:
+    """
+    Detect an archive from the first bytes of an upload
+
+    Args:
+        head: At least the first 512 bytes (fewer if the upload is shorter)
+
+    Returns:
+        'zip', 'tar' (plain, gzip, bz2 or xz compressed) or None
+    """
+    if head.startswith(b'PK\x03\x04'):
+        return 'zip'
+    if head.startswith((b'\x1f\x8b', b'BZh', b'\xfd7zXZ\x00')) or head[257:262] == b'ustar':
+        return 'tar'
+    return None
+
+
+def _is_image_member(name: str) -> bool:
+    base = os.path.basename(name)
+    if not base or base.startswith('.') or name.startswith('__MACOSX/'):
+        return False
+    return base.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def iter_upload_images(fileobj: BinaryIO, filename: str, max_size: int) -> Iterator[Tuple[str, bytes]]:
+    """
+    Images contained in one upload: the upload itself, or the members of a
+    zip / tar archive, read one at a time
+
+    Tar archives are read as a stream, so memory stays bounded by one member.
+    At most max_size + 1 bytes are read per image; callers reject anything
+    longer, without this loading oversized members completely.
+
+    Args:
+        fileobj: Upload file object, positioned at the start
+        filename: Upload filename, used as the name of a plain image
+        max_size: Largest accepted image size in bytes
+
+    Yields:
+        (name, content) per image; archive members are named
+        "<upload filename>/<member path>"
+
+    Raises:
+        zipfile.BadZipFile, tarfile.TarError: If the archive is corrupt
+    """
+    head = fileobj.read(512)
+    kind = archive_format(head)
+
+    if kind is None:
+        yield filename, head + fileobj.read(max_size + 1 - len(head))
+        return
+
+    fileobj.seek(0)
+    if kind == 'zip':
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _is_image_member(info.filename):
+                    continue
+                with archive.open(info) as member:
+                    yield f"{filename}/{info.filename}", member.read(max_size + 1)
+        return
+
+    with tarfile.open(fileobj=fileobj, mode='r|*') as archive:
+        for info in archive:
+            if not info.isfile() or not _is_image_member(info.name):
+                continue
+            member = archive.extractfile(info)
+            yield f"{filename}/{info.name}", member.read(max_size + 1)
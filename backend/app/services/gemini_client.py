@@ -0,0 +1,294 @@
+import os
+import json
+import base64
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Any, Optional
+
+import httpx
+
+from .metrics import GEMINI_CALLS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro-vision:generateContent"
+
+
+class GeminiClient:
+    """
+    Pooled HTTP client for the Gemini generateContent / streamGenerateContent API
+    Shares keep-alive connections across requests, caps the number of
+    in-flight calls and enforces a per-call deadline. The async methods are
+    for use inside request handlers; the sync methods keep a separate pooled
+    client for scripts and worker threads.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                 max_keepalive: Optional[int] = None, stream_url: Optional[str] = None):
+        """
+        Initialize Gemini client
+
+        Args:
+            api_key: Gemini API key (default: GEMINI_API_KEY)
+            base_url: generateContent endpoint (default: GEMINI_API_URL or the public API)
+            max_concurrency: Maximum in-flight calls (default: GEMINI_MAX_CONCURRENCY or 16)
+            timeout: Per-call deadline in seconds, including queueing (default: GEMINI_TIMEOUT or 30)
+            max_keepalive: Idle keep-alive connections kept in the pool (default: max_concurrency)
+            stream_url: streamGenerateContent endpoint (default: GEMINI_STREAM_URL, or
+                        derived from base_url)
+        """
+        self.api_key = api_key if api_key is not None else os.getenv('GEMINI_API_KEY')
+        self.base_url = base_url or os.getenv('GEMINI_API_URL', DEFAULT_GEMINI_URL)
+        self.max_concurrency = max_concurrency or int(os.getenv('GEMINI_MAX_CONCURRENCY', '16'))
+        self.timeout = timeout or float(os.getenv('GEMINI_TIMEOUT', '30'))
+        self.max_keepalive = max_keepalive or self.max_concurrency
+        self.stream_url = stream_url or os.getenv('GEMINI_STREAM_URL') or \
+            self.base_url.replace(':generateContent', ':streamGenerateContent')
+
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._sync_semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_keepalive
+        )
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client, replacing (and closing) it if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._loop is not loop:
+            stale, stale_loop = self._async_client, self._loop
+            self._async_client = httpx.AsyncClient(limits=self._limits(), timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            if stale is not None:
+                await self._close_async_client(stale, stale_loop)
+        return self._async_client
+
+    @staticmethod
+    async def _close_async_client(client: httpx.AsyncClient, client_loop: Optional[asyncio.AbstractEventLoop]):
+        """Close an async client, on its own event loop if that loop still runs in another thread"""
+        if client_loop is not None and client_loop is not asyncio.get_running_loop() and client_loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+            return
+        try:
+            await client.aclose()
+        except RuntimeError as e:
+            # Its loop is closed (e.g. an earlier asyncio.run): the sockets go with the connections
+            logger.debug(f"Closed Gemini client of a finished event loop: {e}")
+
+    def _get_sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(limits=self._limits(), timeout=self.timeout)
+            return self._sync_client
+
+    def _headers(self) -> Dict[str, str]:
+        # Header rather than ?key= so the key never shows up in request logs
+        return {"x-goog-api-key": self.api_key or ""}
+
+    @staticmethod
+    def build_payload(prompt: str, image_data: bytes, mime_type: str = "image/jpeg") -> Dict[str, Any]:
+        """
+        Build a generateContent request body
+
+        Args:
+            prompt: Text prompt
+            image_data: Raw image bytes
+            mime_type: MIME type of the image
+
+        Returns:
+            JSON payload
+        """
+        return {
+            "contents": [{
+                "parts": [
+                    {"text": prompt},
+                    {
+                        "inline_data": {
+                            "mime_type": mime_type,
+                            "data": base64.b64encode(image_data).decode('utf-8')
+                        }
+                    }
+                ]
+            }],
+            "generationConfig": {
+                "temperature": 0.1,  # Low temperature for consistent output
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": 1024,
+            }
+        }
+
+    @staticmethod
+    def _candidate_text(result: Dict[str, Any]) -> Optional[str]:
+        if 'candidates' in result and result['candidates']:
+            content = result['candidates'][0].get('content', {})
+            if 'parts' in content and content['parts']:
+                return content['parts'][0].get('text')
+        return None
+
+    @classmethod
+    def _extract_text(cls, response: httpx.Response) -> Optional[str]:
+        if response.status_code == 200:
+            text = cls._candidate_text(response.json())
+            GEMINI_CALLS.inc(outcome="ok" if text else "empty")
+            return text
+
+        GEMINI_CALLS.inc(outcome="http_error")
+        logger.warning(f"Gemini API returned status {response.status_code}")
+        return None
+
+    @staticmethod
+    @contextmanager
+    def _count_failures():
+        """Count deadline and transport failures of a call"""
+        try:
+            yield
+        except asyncio.TimeoutError:
+            GEMINI_CALLS.inc(outcome="timeout")
+            raise
+        except httpx.TimeoutException:
+            GEMINI_CALLS.inc(outcome="timeout")
+            raise
+        except httpx.HTTPError:
+            GEMINI_CALLS.inc(outcome="transport_error")
+            raise
+
+    async def generate(self, prompt: str, image_data: bytes,
+                       deadline: Optional[float] = None) -> Optional[str]:
+        """
+        Call Gemini without blocking the event loop
+
+        Args:
+            prompt: Text prompt
+            image_data: Raw image bytes
+            deadline: Seconds allowed for queueing plus the call (default: self.timeout)
+
+        Returns:
+            Generated text, or None if Gemini returned no usable response
+
+        Raises:
+            asyncio.TimeoutError: If the deadline expires
+            httpx.HTTPError: On transport errors
+        """
+        client = await self._get_async_client()
+        payload = self.build_payload(prompt, image_data)
+
+        async def _call() -> Optional[str]:
+            async with self._semaphore:
+                response = await client.post(
+                    self.base_url,
+                    headers=self._headers(),
+                    json=payload
+                )
+            return self._extract_text(response)
+
+        with self._count_failures():
+            return await asyncio.wait_for(_call(), timeout=deadline or self.timeout)
+
+    async def generate_stream(self, prompt: str, image_data: bytes,
+                              deadline: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Call Gemini and yield the generated text as it streams in
+
+        Uses streamGenerateContent with server-sent events; each event
+        carries the next piece of text.
+
+        Args:
+            prompt: Text prompt
+            image_data: Raw image bytes
+            deadline: Seconds allowed for queueing plus the whole stream (default: self.timeout)
+
+        Yields:
+            Text chunks; nothing if Gemini returned no usable response
+
+        Raises:
+            asyncio.TimeoutError: If the deadline expires
+            httpx.HTTPError: On transport errors
+        """
+        client = await self._get_async_client()
+        payload = self.build_payload(prompt, image_data)
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + (deadline or self.timeout)
+
+        with self._count_failures():
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=deadline or self.timeout)
+            try:
+                async with client.stream('POST', self.stream_url, params={"alt": "sse"},
+                                         headers=self._headers(), json=payload) as response:
+                    if response.status_code != 200:
+                        GEMINI_CALLS.inc(outcome="http_error")
+                        logger.warning(f"Gemini API returned status {response.status_code}")
+                        return
+                    received = False
+                    async for line in response.aiter_lines():
+                        if loop.time() > expires_at:
+                            raise asyncio.TimeoutError()
+                        if not line.startswith('data:'):
+                            continue
+                        text = self._candidate_text(json.loads(line[5:]))
+                        if text:
+                            received = True
+                            yield text
+                    GEMINI_CALLS.inc(outcome="ok" if received else "empty")
+            finally:
+                self._semaphore.release()
+
+    def generate_sync(self, prompt: str, image_data: bytes,
+                      deadline: Optional[float] = None) -> Optional[str]:
+        """
+        Blocking variant of generate() for code running outside the event loop
+
+        Args:
+            prompt: Text prompt
+            image_data: Raw image bytes
+            deadline: Per-call timeout in seconds (default: self.timeout)
+
+        Returns:
+            Generated text, or None if Gemini returned no usable response
+        """
+        client = self._get_sync_client()
+        with self._sync_semaphore, self._count_failures():
+            response = client.post(
+                self.base_url,
+                headers=self._headers(),
+                json=self.build_payload(prompt, image_data),
+                timeout=deadline or self.timeout
+            )
+        return self._extract_text(response)
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._async_client is not None:
+            await self._close_async_client(self._async_client, self._loop)
+            self._async_client = None
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+
+_shared_client: Optional[GeminiClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    """Process-wide Gemini client so every caller shares one connection pool"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = GeminiClient()
+        return _shared_client
@@ -0,0 +1,122 @@
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiStatusProber:
+    """
+    Background refresher of the Gemini connection status
+    A connection test is a full Gemini Vision generation call, so it runs
+    once per `interval` seconds on the event loop instead of on every
+    health probe. Health and status endpoints read the cached result.
+    """
+
+    def __init__(self, gemini_service, interval: Optional[float] = None,
+                 max_staleness: Optional[float] = None):
+        """
+        Initialize prober
+
+        Args:
+            gemini_service: GeminiReportService instance
+            interval: Seconds between connection tests (default: GEMINI_PROBE_INTERVAL or 300)
+            max_staleness: Age after which a cached status is reported as stale
+                           (default: 3 * interval)
+        """
+        self.gemini_service = gemini_service
+        self.interval = interval or float(os.getenv('GEMINI_PROBE_INTERVAL', '300'))
+        self.max_staleness = max_staleness or 3 * self.interval
+
+        self._status: Dict[str, Any] = {"status": "unknown"}
+        self._checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._probes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the refresh loop on the running event loop"""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Gemini status prober started (interval={self.interval}s)")
+
+    async def stop(self):
+        """Stop the refresh loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # The first status comes from an explicit refresh() at startup
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+    async def refresh(self) -> Dict[str, Any]:
+        """
+        Run a connection test now and cache its result
+
+        Concurrent callers share one in-flight test.
+
+        Returns:
+            Connection status and model info
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        requested_at = time.time()
+        async with self._lock:
+            # Another caller finished a test while we were waiting
+            if self._checked_at is not None and self._checked_at >= requested_at:
+                return self.status()
+
+            try:
+                status = await self.gemini_service.test_connection_async()
+            except Exception as e:
+                status = {"status": "error", "error": str(e)}
+
+            self._status = status
+            self._checked_at = time.time()
+            self._probes += 1
+            if status.get('status') != 'connected':
+                logger.warning(f"Gemini probe: {status.get('status')} ({status.get('error', '')})")
+
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Last known Gemini status, without calling the API
+
+        Returns:
+            Cached connection status plus check time and staleness
+        """
+        status = dict(self._status)
+        if self._checked_at is None:
+            status.update({"checked_at": None, "stale": True})
+            return status
+
+        age = time.time() - self._checked_at
+        status.update({
+            "checked_at": datetime.fromtimestamp(self._checked_at, timezone.utc).isoformat(),
+            "age_seconds": round(age, 1),
+            "stale": age > self.max_staleness,
+            "probes": self._probes
+        })
+        return status
+
+    @property
+    def healthy(self) -> bool:
+        status = self.status()
+        return status.get('status') == 'connected' and not status['stale']
@@ -1,13 +1,16 @@
 import os
-import base64
-import requests
 import logging
-from typing import Dict, Any, Optional
+from contextlib import aclosing
+from typing import Awaitable, Callable, Dict, Any, Optional
 from PIL import Image
 import io
 
+from .gemini_client import get_gemini_client
+
 logger = logging.getLogger(__name__)
 
+TEST_PROMPT = "Describe this simple red square image in one sentence."
+
 class GeminiReportService:
     """
     Gemini Pro Vision Service for APEX VERIFY AI
@@ -16,7 +19,7 @@ class GeminiReportService:
     
     def __init__(self):
         self.api_key = os.getenv('GEMINI_API_KEY')
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro-vision:generateContent"
+        self.client = get_gemini_client()
         
         if not self.api_key:
             logger.error("GEMINI_API_KEY not configured")
@@ -53,6 +56,63 @@ class GeminiReportService:
             logger.error(f"Report generation failed: {e}")
             return self._create_fallback_report(analysis)
     
+    async def generate_report_async(self, image_data: bytes, analysis: Dict[str, Any]) -> str:
+        """
+        Generate report without blocking the event loop
+        
+        Args:
+            image_data: Raw image bytes
+            analysis: DINOv3 analysis results
+            
+        Returns:
+            Formatted report string using exact template
+        """
+        try:
+            prompt = self._create_prompt(analysis)
+            response = await self._call_gemini_api_async(image_data, prompt)
+            
+            if response:
+                return self._format_report(analysis, response)
+            else:
+                return self._create_fallback_report(analysis)
+                
+        except Exception as e:
+            logger.error(f"Report generation failed: {e}")
+            return self._create_fallback_report(analysis)
+    
+    async def generate_report_stream(self, image_data: bytes, analysis: Dict[str, Any],
+                                     on_chunk: Callable[[str], Awaitable[None]]) -> str:
+        """
+        Generate report while relaying Gemini's text as it streams in
+        
+        Args:
+            image_data: Raw image bytes
+            analysis: DINOv3 analysis results
+            on_chunk: Awaited with each piece of raw Gemini text
+            
+        Returns:
+            Formatted report string using exact template (the fallback
+            report if the stream fails, even after some chunks were relayed)
+        """
+        try:
+            prompt = self._create_prompt(analysis)
+            chunks = []
+            # aclosing: release the client's slot even if on_chunk raises
+            async with aclosing(self.client.generate_stream(prompt, image_data)) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    await on_chunk(chunk)
+            response = "".join(chunks)
+            
+            if response:
+                return self._format_report(analysis, response)
+            else:
+                return self._create_fallback_report(analysis)
+                
+        except Exception as e:
+            logger.error(f"Streaming report generation failed: {e}")
+            return self._create_fallback_report(analysis)
+    
     def _create_prompt(self, analysis: Dict[str, Any]) -> str:
         """
         Create the prompt for Gemini Pro Vision
@@ -106,48 +166,25 @@ class GeminiReportService:
             Gemini response text or None if failed
         """
         try:
-            # Encode image to base64
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
+            return self.client.generate_sync(prompt, image_data)
             
-            # Prepare request payload
-            payload = {
-                "contents": [{
-                    "parts": [
-                        {"text": prompt},
-                        {
-                            "inline_data": {
-                                "mime_type": "image/jpeg",
-                                "data": image_base64
-                            }
-                        }
-                    ]
-                }],
-                "generationConfig": {
-                    "temperature": 0.1,  # Low temperature for consistent output
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                }
-            }
-            
-            # Make API request
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and result['candidates']:
-                    content = result['candidates'][0]['content']
-                    if 'parts' in content and content['parts']:
-                        return content['parts'][0]['text']
-            
-            logger.warning(f"Gemini API returned status {response.status_code}")
+        except Exception as e:
+            logger.error(f"Gemini API call failed: {e}")
             return None
+    
+    async def _call_gemini_api_async(self, image_data: bytes, prompt: str) -> Optional[str]:
+        """
+        Call Gemini Pro Vision API through the shared async connection pool
+        
+        Args:
+            image_data: Raw image bytes
+            prompt: Analysis prompt
+            
+        Returns:
+            Gemini response text or None if failed
+        """
+        try:
+            return await self.client.generate(prompt, image_data)
             
         except Exception as e:
             logger.error(f"Gemini API call failed: {e}")
@@ -245,6 +282,26 @@ Feature Anomalies: {', '.join(feature_anomalies) if feature_anomalies else 'None
         
         return report
     
+    def _create_test_image(self) -> bytes:
+        """Create a simple red square JPEG used to probe the API"""
+        test_image = Image.new('RGB', (100, 100), color='red')
+        img_byte_arr = io.BytesIO()
+        test_image.save(img_byte_arr, format='JPEG')
+        return img_byte_arr.getvalue()
+    
+    def _connection_status(self, response: Optional[str]) -> Dict[str, Any]:
+        if response:
+            return {
+                "status": "connected",
+                "model": "gemini-pro-vision",
+                "test_response": response[:100] + "..." if len(response) > 100 else response
+            }
+        else:
+            return {
+                "status": "failed",
+                "error": "No response from Gemini API"
+            }
+    
     def test_connection(self) -> Dict[str, Any]:
         """
         Test Gemini API connection
@@ -253,29 +310,25 @@ Feature Anomalies: {', '.join(feature_anomalies) if feature_anomalies else 'None
             Connection status and model info
         """
         try:
-            # Create a simple test image
-            test_image = Image.new('RGB', (100, 100), color='red')
-            img_byte_arr = io.BytesIO()
-            test_image.save(img_byte_arr, format='JPEG')
-            test_image_data = img_byte_arr.getvalue()
-            
-            # Test prompt
-            test_prompt = "Describe this simple red square image in one sentence."
-            
-            # Test API call
-            response = self._call_gemini_api(test_image_data, test_prompt)
-            
-            if response:
-                return {
-                    "status": "connected",
-                    "model": "gemini-pro-vision",
-                    "test_response": response[:100] + "..." if len(response) > 100 else response
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "error": "No response from Gemini API"
-                }
+            response = self._call_gemini_api(self._create_test_image(), TEST_PROMPT)
+            return self._connection_status(response)
+                
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
+    async def test_connection_async(self) -> Dict[str, Any]:
+        """
+        Test Gemini API connection without blocking the event loop
+        
+        Returns:
+            Connection status and model info
+        """
+        try:
+            response = await self._call_gemini_api_async(self._create_test_image(), TEST_PROMPT)
+            return self._connection_status(response)
                 
         except Exception as e:
             return {
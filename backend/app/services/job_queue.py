@@ -0,0 +1,493 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'completed', 'failed')
+
+
+@dataclass
+class Job:
+    """A claimed job, as handed to a worker"""
+    id: str
+    payload: bytes
+    options: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 1  # this claim's attempt number; fences complete() and fail()
+
+
+class JobQueue(ABC):
+    """
+    Durable queue of verification jobs
+    Jobs are submitted by the API and claimed by workers. A claimed job is
+    leased for `visibility_timeout` seconds; if its worker dies, the job is
+    handed out again, up to `max_attempts` times. Finishing a job takes the
+    attempt it was claimed with, so a worker whose lease expired cannot
+    overwrite the outcome of a later attempt.
+    """
+
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, visibility_timeout: Optional[float] = None, max_attempts: Optional[int] = None,
+                 result_ttl: Optional[float] = None):
+        """
+        Args:
+            visibility_timeout: Lease per claim in seconds (default: JOB_VISIBILITY_TIMEOUT or 300)
+            max_attempts: Claims per job before it fails (default: JOB_MAX_ATTEMPTS or 3)
+            result_ttl: How long finished jobs stay readable (default: JOB_RESULT_TTL_SECONDS or 86400)
+        """
+        self.visibility_timeout = visibility_timeout or float(os.getenv('JOB_VISIBILITY_TIMEOUT', '300'))
+        self.max_attempts = max_attempts or int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+        self.result_ttl = result_ttl or float(os.getenv('JOB_RESULT_TTL_SECONDS', '86400'))
+
+    @abstractmethod
+    def submit(self, payload: bytes, options: Optional[Dict[str, Any]] = None) -> str:
+        """Queue a job and return its id"""
+
+    @abstractmethod
+    def _claim_once(self) -> Optional[Job]:
+        """Requeue expired leases, then lease the oldest queued job (without waiting)"""
+
+    def claim(self, timeout: float = 1.0) -> Optional[Job]:
+        """Take the oldest queued job, waiting up to `timeout` seconds for one"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self._claim_once()
+            if job is not None or time.monotonic() >= deadline:
+                return job
+            time.sleep(min(self.POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+
+    @abstractmethod
+    def complete(self, job_id: str, result: Dict[str, Any], attempt: int) -> bool:
+        """Store a job's result; False (and nothing stored) if `attempt` no longer holds the job"""
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str, attempt: int) -> bool:
+        """Mark a job failed; False (and nothing changed) if `attempt` no longer holds the job"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status (and result or error once finished), or None if unknown or expired"""
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by status"""
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _new_id() -> str:
+        return uuid.uuid4().hex
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Job queue in a SQLite file
+    For local use and tests: the API and any workers on the same host share
+    the file. Workers poll for new jobs.
+    """
+
+    def __init__(self, db_path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_db()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One SQLite connection per thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " payload BLOB,"
+            " options TEXT NOT NULL,"
+            " result TEXT,"
+            " error TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL,"
+            " lease_expires_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        logger.info(f"Job queue at {self.db_path}")
+
+    def submit(self, payload: bytes, options: Optional[Dict[str, Any]] = None) -> str:
+        job_id = self._new_id()
+        self._connection().execute(
+            "INSERT INTO jobs (id, status, payload, options, created_at) VALUES (?, 'queued', ?, ?, ?)",
+            (job_id, payload, json.dumps(options or {}), time.time())
+        )
+        return job_id
+
+    def _claim_once(self) -> Optional[Job]:
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Leases of dead workers: retry, or give up after max_attempts
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Job abandoned by its worker', finished_at = ?,"
+                " payload = NULL WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT id, payload, options, attempts FROM jobs"
+                " WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < ?)"
+                " ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?,"
+                    " lease_expires_at = ? WHERE id = ?",
+                    (now, now + self.visibility_timeout, row[0])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        return Job(id=row[0], payload=row[1], options=json.loads(row[2]), attempts=row[3] + 1)
+
+    def _finish(self, job_id: str, attempt: int, status: str, result: Optional[str], error: Optional[str]) -> bool:
+        now = time.time()
+        conn = self._connection()
+        updated = conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, payload = NULL,"
+            " lease_expires_at = NULL WHERE id = ? AND status = 'running' AND attempts = ?",
+            (status, result, error, now, job_id, attempt)
+        ).rowcount
+        conn.execute("DELETE FROM jobs WHERE finished_at < ?", (now - self.result_ttl,))
+        if not updated:
+            logger.warning(f"Job {job_id} attempt {attempt} finished after losing its lease; outcome dropped")
+        return bool(updated)
+
+    def complete(self, job_id: str, result: Dict[str, Any], attempt: int) -> bool:
+        return self._finish(job_id, attempt, 'completed', json.dumps(result), None)
+
+    def fail(self, job_id: str, error: str, attempt: int) -> bool:
+        return self._finish(job_id, attempt, 'failed', None, error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT status, result, error, attempts, created_at, started_at, finished_at"
+            " FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return _job_view(job_id, *row)
+
+    def get_stats(self) -> Dict[str, Any]:
+        counts = dict(self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {"backend": "sqlite", "path": self.db_path, **{s: counts.get(s, 0) for s in JOB_STATUSES}}
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# KEYS: queue, processing, leases. ARGV: key prefix, now, lease expiry.
+# Move the oldest job to processing and lease it in one step, so a worker
+# dying mid-claim cannot leave a job in processing without a lease
+_CLAIM_SCRIPT = """
+local job_id = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+if not job_id then
+    return nil
+end
+local job_key = ARGV[1] .. ':job:' .. job_id
+redis.call('ZADD', KEYS[3], ARGV[3], job_id)
+redis.call('HSET', job_key, 'status', 'running', 'started_at', ARGV[2])
+local attempts = redis.call('HINCRBY', job_key, 'attempts', 1)
+return {job_id, attempts, redis.call('HGET', job_key, 'options'), redis.call('GET', ARGV[1] .. ':payload:' .. job_id)}
+"""
+
+# KEYS: queue, processing, leases. ARGV: key prefix, now, max attempts, result TTL.
+# Requeue (or fail, after max attempts) every job whose lease expired
+_REQUEUE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], 0, ARGV[2])
+for _, job_id in ipairs(expired) do
+    local job_key = ARGV[1] .. ':job:' .. job_id
+    redis.call('ZREM', KEYS[3], job_id)
+    redis.call('LREM', KEYS[2], 1, job_id)
+    if tonumber(redis.call('HGET', job_key, 'attempts') or '0') >= tonumber(ARGV[3]) then
+        redis.call('HSET', job_key, 'status', 'failed', 'error', 'Job abandoned by its worker', 'finished_at', ARGV[2])
+        redis.call('EXPIRE', job_key, ARGV[4])
+        redis.call('DEL', ARGV[1] .. ':payload:' .. job_id)
+    else
+        redis.call('HSET', job_key, 'status', 'queued')
+        -- Back to the consuming end: retried before newer jobs
+        redis.call('RPUSH', KEYS[1], job_id)
+    end
+end
+return #expired
+"""
+
+# KEYS: job, payload, processing, leases. ARGV: job id, attempt, now, result TTL,
+# status, result or error field, its value.
+# Finish the job only if this attempt still holds it (running, attempts
+# unchanged since the claim); returns 1 if finished, 0 for a stale attempt
+_FINISH_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'status') ~= 'running' or redis.call('HGET', KEYS[1], 'attempts') ~= ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[5], ARGV[6], ARGV[7], 'finished_at', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('DEL', KEYS[2])
+redis.call('LREM', KEYS[3], 1, ARGV[1])
+redis.call('ZREM', KEYS[4], ARGV[1])
+return 1
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Job queue in Redis (reliable-queue pattern)
+    Claiming moves a job id from the queue list to a processing list and
+    records its lease in a single Lua script, so a job is never lost between
+    the two lists or left in processing without a lease. Expired leases are
+    requeued, also atomically, by whichever worker claims next. Finishing
+    checks the claiming attempt in the same Lua call that stores the outcome.
+    """
+
+    def __init__(self, url: str, prefix: str = "apex:jobs", **kwargs):
+        super().__init__(**kwargs)
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("JOB_QUEUE_URL points to Redis but the redis package is not installed") from e
+        self.url = url
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._claim_script = self._redis.register_script(_CLAIM_SCRIPT)
+        self._requeue_script = self._redis.register_script(_REQUEUE_SCRIPT)
+        self._finish_script = self._redis.register_script(_FINISH_SCRIPT)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    def submit(self, payload: bytes, options: Optional[Dict[str, Any]] = None) -> str:
+        job_id = self._new_id()
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key("job", job_id), mapping={
+            "status": "queued",
+            "options": json.dumps(options or {}),
+            "attempts": 0,
+            "created_at": time.time()
+        })
+        pipe.set(self._key("payload", job_id), payload)
+        pipe.lpush(self._key("queue"), job_id)
+        pipe.execute()
+        return job_id
+
+    def _claim_once(self) -> Optional[Job]:
+        now = time.time()
+        keys = [self._key("queue"), self._key("processing"), self._key("leases")]
+        self._requeue_script(keys=keys, args=[self.prefix, now, self.max_attempts, int(self.result_ttl)])
+        reply = self._claim_script(keys=keys, args=[self.prefix, now, now + self.visibility_timeout])
+        if reply is None:
+            return None
+
+        raw_id, attempts, options, payload = reply
+        job_id = raw_id.decode()
+        if payload is None:
+            self.fail(job_id, "Job payload missing", attempts)
+            return None
+        return Job(id=job_id, payload=payload, options=json.loads(options or b"{}"), attempts=attempts)
+
+    def _finish(self, job_id: str, attempt: int, status: str, field_name: str, value: str) -> bool:
+        keys = [self._key("job", job_id), self._key("payload", job_id), self._key("processing"), self._key("leases")]
+        finished = self._finish_script(keys=keys, args=[job_id, attempt, time.time(), int(self.result_ttl),
+                                                        status, field_name, value])
+        if not finished:
+            logger.warning(f"Job {job_id} attempt {attempt} finished after losing its lease; outcome dropped")
+        return bool(finished)
+
+    def complete(self, job_id: str, result: Dict[str, Any], attempt: int) -> bool:
+        return self._finish(job_id, attempt, "completed", "result", json.dumps(result))
+
+    def fail(self, job_id: str, error: str, attempt: int) -> bool:
+        return self._finish(job_id, attempt, "failed", "error", error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        fields = {k.decode(): v.decode() for k, v in self._redis.hgetall(self._key("job", job_id)).items()}
+        if not fields:
+            return None
+
+        def _float(name):
+            return float(fields[name]) if name in fields else None
+
+        return _job_view(job_id, fields["status"], fields.get("result"), fields.get("error"),
+                         int(fields.get("attempts", 0)), _float("created_at"), _float("started_at"),
+                         _float("finished_at"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "queued": self._redis.llen(self._key("queue")),
+            "running": self._redis.llen(self._key("processing"))
+        }
+
+    def close(self):
+        self._redis.close()
+
+
+def _job_view(job_id: str, status: str, result: Optional[str], error: Optional[str], attempts: int,
+              created_at: Optional[float], started_at: Optional[float],
+              finished_at: Optional[float]) -> Dict[str, Any]:
+    view = {
+        "job_id": job_id,
+        "status": status,
+        "attempts": attempts,
+        "created_at": created_at,
+        "started_at": started_at,
+        "finished_at": finished_at
+    }
+    if result is not None:
+        view["result"] = json.loads(result)
+    if error is not None:
+        view["error"] = error
+    return view
+
+
+def create_job_queue(url: Optional[str] = None) -> JobQueue:
+    """
+    Job queue for a URL
+
+    Args:
+        url: redis://host:port/db, or sqlite:///path/to/jobs.db
+             (default: JOB_QUEUE_URL, or a SQLite file in the temp directory)
+
+    Returns:
+        RedisJobQueue or SQLiteJobQueue
+    """
+    url = url or os.getenv('JOB_QUEUE_URL') or f"sqlite:///{os.path.join(tempfile.gettempdir(), 'apex_jobs.db')}"
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisJobQueue(url)
+    if url.startswith('sqlite:///'):
+        return SQLiteJobQueue(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported JOB_QUEUE_URL: {url!r}")
+
+
+class JobWorker:
+    """
+    Claims jobs and runs them through an async handler
+    Up to `concurrency` jobs run at once, so a single worker keeps the DINOv3
+    batch scheduler and the Gemini connection pool busy. Claims (blocking
+    queue I/O) run off the event loop.
+    """
+
+    def __init__(self, queue: JobQueue, handler: Callable[[Job], Awaitable[Dict[str, Any]]],
+                 concurrency: Optional[int] = None, poll_timeout: float = 1.0):
+        """
+        Args:
+            queue: Queue to claim from
+            handler: Coroutine function returning the job result; exceptions
+                     fail the job (with their `detail` if they have one)
+            concurrency: Jobs in progress at once (default: JOB_WORKER_CONCURRENCY or 16)
+            poll_timeout: Longest blocking claim, bounds how fast stop() takes effect
+        """
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = concurrency or int(os.getenv('JOB_WORKER_CONCURRENCY', '16'))
+        self.poll_timeout = poll_timeout
+
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self._processed = 0
+        self._failed = 0
+
+    def start(self):
+        """Run the worker as a background task on the running event loop"""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Stop claiming and wait for jobs in progress"""
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    def request_stop(self):
+        """Signal-handler friendly stop: finish jobs in progress, then return from run()"""
+        self._stopping = True
+
+    async def _process(self, job: Job):
+        loop = asyncio.get_running_loop()
+        try:
+            result = await self.handler(job)
+        except Exception as e:
+            self._failed += 1
+            error = str(getattr(e, 'detail', None) or e)
+            logger.error(f"Job {job.id} failed (attempt {job.attempts}): {error}")
+            await loop.run_in_executor(None, self.queue.fail, job.id, error, job.attempts)
+        else:
+            self._processed += 1
+            await loop.run_in_executor(None, self.queue.complete, job.id, result, job.attempts)
+
+    async def run(self):
+        """Claim and process jobs until stopped"""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.concurrency)
+        in_progress = set()
+        logger.info(f"Job worker started (concurrency={self.concurrency})")
+
+        async def process(job: Job):
+            try:
+                await self._process(job)
+            finally:
+                slots.release()
+
+        while not self._stopping:
+            await slots.acquire()
+            try:
+                job = await loop.run_in_executor(None, self.queue.claim, self.poll_timeout)
+            except Exception as e:
+                logger.error(f"Claiming a job failed: {e}")
+                job = None
+                await asyncio.sleep(self.poll_timeout)
+            if job is None:
+                slots.release()
+                continue
+            task = loop.create_task(process(job))
+            in_progress.add(task)
+            task.add_done_callback(in_progress.discard)
+
+        if in_progress:
+            await asyncio.wait(set(in_progress))
+        logger.info("Job worker stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "concurrency": self.concurrency,
+            "processed": self._processed,
+            "failed": self._failed
+        }
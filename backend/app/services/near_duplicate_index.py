@@ -0,0 +1,214 @@
+import os
+import io
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+_DCT_SIZE = 32
+_LOW_FREQ = 8
+
+# Smallest typical distance of the hashed frequencies from their median, in
+# gray levels. Below it (flat colors, smooth gradients, fine noise that the
+# 32x32 reduction averages away) most bits are decided by rounding and
+# compression noise, so such images are not hashed at all.
+MIN_TEXTURE = 4.0
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * x + 1) * k / (2 * n))
+
+
+_DCT = _dct_matrix(_DCT_SIZE)
+
+
+def perceptual_hash(image: Image.Image) -> Optional[int]:
+    """
+    64-bit DCT perceptual hash (pHash)
+
+    Robust to JPEG recompression, resizing and mild color changes: the image
+    is reduced to 32x32 grayscale and each of the 8x8 lowest DCT frequencies
+    becomes one bit (above/below their median). Images with too little
+    low-frequency structure (see MIN_TEXTURE) get no hash: their bits would
+    be noise, missing real copies and matching unrelated images.
+
+    Args:
+        image: PIL Image object
+
+    Returns:
+        Hash as an unsigned 64-bit integer, or None if the image is too
+        featureless to hash reliably
+    """
+    small = image.convert('L').resize((_DCT_SIZE, _DCT_SIZE), Image.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(small, dtype=np.float64)
+    coefficients = (_DCT @ pixels @ _DCT.T)[:_LOW_FREQ, :_LOW_FREQ].ravel()
+    # The DC term only carries overall brightness; keep it out of the median
+    median = np.median(coefficients[1:])
+    # Median margin of the AC bits, scaled to the orthonormal DCT (gray levels)
+    texture = np.median(np.abs(coefficients[1:] - median)) * 2 / _DCT_SIZE
+    if texture < MIN_TEXTURE:
+        return None
+    bits = coefficients > median
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+def perceptual_hash_bytes(image_data: bytes) -> Optional[int]:
+    """
+    pHash straight from encoded bytes
+
+    JPEGs are decoded in draft mode (DCT-domain downscaling), so hashing a
+    24 MP upload costs about as much as decoding a thumbnail.
+
+    Args:
+        image_data: Raw image bytes
+
+    Returns:
+        Hash as an unsigned 64-bit integer, or None (see perceptual_hash)
+    """
+    with Image.open(io.BytesIO(image_data)) as image:
+        image.draft('L', (_DCT_SIZE * 4, _DCT_SIZE * 4))
+        return perceptual_hash(image)
+
+
+class NearDuplicateIndex:
+    """
+    Hamming-distance index of perceptual hashes of verified images
+    Uses multi-index hashing: each 64-bit hash is split into
+    max_distance + 1 chunks, and by the pigeonhole principle any hash within
+    max_distance shares at least one chunk exactly, so a lookup only checks
+    hashes found in those chunk buckets. Entries are evicted LRU.
+    """
+
+    def __init__(self, max_distance: Optional[int] = None, max_entries: Optional[int] = None,
+                 enabled: Optional[bool] = None):
+        """
+        Initialize near-duplicate index
+
+        Args:
+            max_distance: Largest Hamming distance treated as a duplicate
+                          (default: NEAR_DUPLICATE_MAX_DISTANCE or 6)
+            max_entries: Maximum indexed images (default: NEAR_DUPLICATE_MAX_ENTRIES or 100000)
+            enabled: Turn the index on/off (default: NEAR_DUPLICATE_ENABLED or true)
+        """
+        self.enabled = enabled if enabled is not None else \
+            os.getenv('NEAR_DUPLICATE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.max_distance = max_distance if max_distance is not None else \
+            int(os.getenv('NEAR_DUPLICATE_MAX_DISTANCE', '6'))
+        self.max_entries = max_entries or int(os.getenv('NEAR_DUPLICATE_MAX_ENTRIES', '100000'))
+
+        self._chunks = self._chunk_layout(self.max_distance + 1)
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in self._chunks]
+        # phash -> image SHA-256 of the verification it came from
+        self._entries: "OrderedDict[int, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._lookups = 0
+        self._hits = 0
+        self._lookup_total_us = 0.0
+
+    @staticmethod
+    def _chunk_layout(count: int) -> List[Tuple[int, int]]:
+        """(shift, mask) of `count` nearly equal bit ranges covering the hash"""
+        count = max(1, min(count, HASH_BITS))
+        layout = []
+        start = 0
+        for i in range(count):
+            width = HASH_BITS // count + (1 if i < HASH_BITS % count else 0)
+            layout.append((start, (1 << width) - 1))
+            start += width
+        return layout
+
+    def _keys(self, phash: int) -> List[int]:
+        return [(phash >> shift) & mask for shift, mask in self._chunks]
+
+    def add(self, phash: int, image_hash: str):
+        """
+        Index a completed verification
+
+        Args:
+            phash: Perceptual hash of the image
+            image_hash: SHA-256 under which the result is cached
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if phash in self._entries:
+                self._entries[phash] = image_hash
+                self._entries.move_to_end(phash)
+                return
+
+            self._entries[phash] = image_hash
+            for table, key in zip(self._tables, self._keys(phash)):
+                table.setdefault(key, set()).add(phash)
+
+            while len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._unlink(oldest)
+
+    def _unlink(self, phash: int):
+        for table, key in zip(self._tables, self._keys(phash)):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(phash)
+                if not bucket:
+                    del table[key]
+
+    def lookup(self, phash: int) -> Optional[Tuple[str, int]]:
+        """
+        Find the closest indexed image within max_distance
+
+        Args:
+            phash: Perceptual hash of the query image
+
+        Returns:
+            (image SHA-256, Hamming distance) of the best match, or None
+        """
+        if not self.enabled:
+            return None
+
+        start = time.perf_counter()
+        best: Optional[Tuple[int, int]] = None
+        with self._lock:
+            self._lookups += 1
+            candidates = set()
+            for table, key in zip(self._tables, self._keys(phash)):
+                bucket = table.get(key)
+                if bucket:
+                    candidates.update(bucket)
+
+            for candidate in candidates:
+                distance = (phash ^ candidate).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (candidate, distance)
+
+            match = None
+            if best is not None:
+                self._hits += 1
+                self._entries.move_to_end(best[0])
+                match = (self._entries[best[0]], best[1])
+            self._lookup_total_us += (time.perf_counter() - start) * 1e6
+
+        return match
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size, hit counters and average lookup time"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "lookups": self._lookups,
+                "near_duplicate_hits": self._hits,
+                "average_lookup_us": round(self._lookup_total_us / self._lookups, 1) if self._lookups else 0
+            }
@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from .metrics import CACHE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+
+class ResultCache:
+    """
+    Content-addressed cache of verification results
+    Keys are the SHA-256 of the uploaded bytes. Results live in an
+    in-process LRU (bounded by entry count, total size and TTL) and,
+    optionally, in a SQLite file shared by every worker on the host. The
+    file is purged of expired rows, and trimmed to its entry limit, every
+    `purge_interval` writes rather than on each one.
+    """
+
+    def __init__(self, namespace: str = "default", max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 db_path: Optional[str] = None, enabled: Optional[bool] = None,
+                 max_disk_entries: Optional[int] = None, purge_interval: Optional[int] = None):
+        """
+        Initialize result cache
+
+        Args:
+            namespace: Separates results of different endpoints sharing one SQLite file
+            max_entries: In-process entry limit (default: RESULT_CACHE_MAX_ENTRIES or 1024)
+            max_bytes: In-process size limit of serialized results (default: RESULT_CACHE_MAX_BYTES or 64MB)
+            ttl_seconds: Result lifetime (default: RESULT_CACHE_TTL_SECONDS or 86400)
+            db_path: SQLite file for the shared tier (default: RESULT_CACHE_DB_PATH, unset = memory only)
+            enabled: Turn caching on/off (default: RESULT_CACHE_ENABLED or true)
+            max_disk_entries: Entry limit of the SQLite file, across namespaces
+                              (default: RESULT_CACHE_MAX_DISK_ENTRIES or 100000)
+            purge_interval: Writes between purges of the SQLite file (default: RESULT_CACHE_PURGE_INTERVAL or 256)
+        """
+        self.namespace = namespace
+        self.enabled = enabled if enabled is not None else _env_flag('RESULT_CACHE_ENABLED', 'true')
+        self.max_entries = max_entries or int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '1024'))
+        self.max_bytes = max_bytes or int(os.getenv('RESULT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+        self.ttl_seconds = ttl_seconds or float(os.getenv('RESULT_CACHE_TTL_SECONDS', '86400'))
+        self.db_path = db_path if db_path is not None else os.getenv('RESULT_CACHE_DB_PATH')
+        self.max_disk_entries = max_disk_entries or int(os.getenv('RESULT_CACHE_MAX_DISK_ENTRIES', '100000'))
+        self.purge_interval = purge_interval or int(os.getenv('RESULT_CACHE_PURGE_INTERVAL', '256'))
+
+        # key -> (expires_at, serialized result)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes_since_purge = 0
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "errors": 0
+        }
+
+        if self.enabled and self.db_path:
+            self._init_db()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One SQLite connection per thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        try:
+            conn = self._connection()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_expires ON results (expires_at)")
+            conn.commit()
+            logger.info(f"Result cache disk tier at {self.db_path}")
+        except sqlite3.Error as e:
+            logger.error(f"Result cache disk tier unavailable: {e}")
+            self.db_path = None
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+        CACHE_EVENTS.inc(cache=self.namespace, event=name)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+
+        Args:
+            key: SHA-256 hex digest of the image bytes
+
+        Returns:
+            A fresh copy of the cached result, or None
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    CACHE_EVENTS.inc(cache=self.namespace, event="memory_hits")
+                    return json.loads(value)
+                self._remove(key)
+                self._stats["expirations"] += 1
+                CACHE_EVENTS.inc(cache=self.namespace, event="expirations")
+
+        if self.db_path:
+            try:
+                row = self._connection().execute(
+                    "SELECT value, expires_at FROM results WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._store_memory(key, row[0], row[1])
+                    self._count("disk_hits")
+                    return json.loads(row[0])
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache read failed: {e}")
+                self._count("errors")
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result in both tiers
+
+        Args:
+            key: SHA-256 hex digest of the image bytes
+            result: JSON-serializable result
+        """
+        if not self.enabled:
+            return
+
+        try:
+            value = json.dumps(result, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Result not cacheable: {e}")
+            self._count("errors")
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        self._store_memory(key, value, expires_at)
+        self._count("stores")
+
+        if self.db_path:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, value, expires_at)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {e}")
+                self._count("errors")
+                return
+
+            with self._lock:
+                self._writes_since_purge += 1
+                purge = self._writes_since_purge >= self.purge_interval
+                if purge:
+                    self._writes_since_purge = 0
+            if purge:
+                self._purge_disk()
+
+    def _purge_disk(self):
+        """Delete expired rows, then the soonest-expiring rows beyond max_disk_entries"""
+        try:
+            conn = self._connection()
+            expired = conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),)).rowcount
+            # Every row has the same TTL, so the soonest to expire were stored first
+            trimmed = conn.execute(
+                "DELETE FROM results WHERE rowid IN"
+                " (SELECT rowid FROM results ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            ).rowcount
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache purge failed: {e}")
+            self._count("errors")
+            return
+        if expired or trimmed:
+            logger.debug(f"Result cache purged {expired} expired and {trimmed} excess rows")
+
+    def _store_memory(self, key: str, value: str, expires_at: float):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._memory[key] = (expires_at, value)
+            self._memory_bytes += size
+            while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+                oldest = next(iter(self._memory))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+                CACHE_EVENTS.inc(cache=self.namespace, event="evictions")
+
+    def _remove(self, key: str):
+        """Drop a memory entry (caller holds the lock)"""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[1])
+
+    def clear(self):
+        """Remove every entry of this namespace from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.db_path:
+            try:
+                conn = self._connection()
+                conn.execute("DELETE FROM results WHERE namespace = ?", (self.namespace,))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache clear failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_entries": self.max_entries,
+                "max_disk_entries": self.max_disk_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": self.db_path or "disabled"
+            })
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
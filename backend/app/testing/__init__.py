@@ -0,0 +1,13 @@
+# Testing Package: deterministic inputs for the tests and benchmarks
+from .synthetic_images import FORMATS, KINDS, dimensions, encode, synthetic_image, synthetic_image_bytes
+
+__all__ = ['FORMATS', 'KINDS', 'dimensions', 'encode', 'synthetic_image', 'synthetic_image_bytes',
+           'tiny_dinov3_analyzer']
+
+
+def __getattr__(name):
+    # Pulls in torch/torchvision; import it on first use
+    if name == 'tiny_dinov3_analyzer':
+        from .tiny_dinov3 import tiny_dinov3_analyzer
+        return tiny_dinov3_analyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,107 @@
+import io
+import zlib
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+KINDS = ("flat", "noisy", "gradient", "photographic")
+FORMATS = ("jpeg", "png", "webp")
+
+# PIL save() arguments per format; quality matches typical camera / web output
+_SAVE_OPTIONS = {
+    "jpeg": {"format": "JPEG", "quality": 90},
+    "png": {"format": "PNG", "compress_level": 1},
+    "webp": {"format": "WEBP", "quality": 85, "method": 0},
+}
+
+
+def dimensions(megapixels: float) -> Tuple[int, int]:
+    """(width, height) of a 4:3 image with about `megapixels` pixels."""
+    height = max(8, int(round((megapixels * 1e6 * 3 / 4) ** 0.5)))
+    width = max(8, int(round(height * 4 / 3)))
+    return width, height
+
+
+def _flat(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """A single solid color (zero variance everywhere)."""
+    color = rng.integers(32, 224, size=3, dtype=np.uint8)
+    return np.broadcast_to(color, (height, width, 3)).copy()
+
+
+def _noisy(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """Independent uniform noise per pixel and channel (incompressible)."""
+    return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+def _gradient(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """Smooth horizontal/vertical color ramps without noise."""
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    img = np.empty((height, width, 3), dtype=np.uint8)
+    img[..., 0] = (255 * x).astype(np.uint8)
+    img[..., 1] = (255 * y).astype(np.uint8)
+    img[..., 2] = (255 * (x + y) / 2).astype(np.uint8)
+    return img
+
+
+def _photographic(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Natural-image-like content: noise at every octave with amplitude falling
+    with frequency (roughly 1/f), correlated color channels, a few hard-edged
+    objects and mild sensor noise.
+    """
+    luminance = np.zeros((height, width), dtype=np.float32)
+    octave_size, amplitude = 4, 64.0
+    while octave_size < max(width, height):
+        layer = rng.standard_normal((max(2, octave_size * height // width), octave_size), dtype=np.float32)
+        upscaled = Image.fromarray(layer, mode="F").resize((width, height), Image.BICUBIC)
+        luminance += amplitude * np.asarray(upscaled, dtype=np.float32)
+        octave_size, amplitude = octave_size * 2, amplitude / 2
+
+    # Hard edges: rectangles of constant brightness offset
+    for _ in range(6):
+        x0, y0 = rng.integers(0, width), rng.integers(0, height)
+        x1, y1 = x0 + rng.integers(width // 16, width // 3), y0 + rng.integers(height // 16, height // 3)
+        luminance[y0:y1, x0:x1] += rng.uniform(-40, 40)
+
+    img = np.empty((height, width, 3), dtype=np.uint8)
+    tint = rng.uniform(0.8, 1.2, size=3).astype(np.float32)
+    for channel in range(3):
+        plane = 128 + tint[channel] * luminance
+        plane += rng.standard_normal((height, width), dtype=np.float32) * 3
+        img[..., channel] = np.clip(plane, 0, 255).astype(np.uint8)
+    return img
+
+
+_GENERATORS = {
+    "flat": _flat,
+    "noisy": _noisy,
+    "gradient": _gradient,
+    "photographic": _photographic,
+}
+
+
+def synthetic_image(kind: str, megapixels: float, seed: int = 0) -> Image.Image:
+    """Deterministic RGB image of the given kind; the same arguments always give the same pixels."""
+    if kind not in _GENERATORS:
+        raise ValueError(f"Unknown image kind {kind!r} (expected one of {', '.join(KINDS)})")
+    width, height = dimensions(megapixels)
+    # Different kinds use different streams so they do not share noise
+    rng = np.random.default_rng([seed, zlib.crc32(kind.encode())])
+    return Image.fromarray(_GENERATORS[kind](width, height, rng), mode="RGB")
+
+
+def encode(image: Image.Image, fmt: str) -> bytes:
+    """Encode an image as uploaded to the API."""
+    if fmt not in _SAVE_OPTIONS:
+        raise ValueError(f"Unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    buffer = io.BytesIO()
+    image.save(buffer, **_SAVE_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def synthetic_image_bytes(kind: str, megapixels: float, fmt: str, seed: int = 0) -> bytes:
+    """Encoded synthetic image."""
+    return encode(synthetic_image(kind, megapixels, seed), fmt)
+
@@ -0,0 +1,50 @@
+def tiny_dinov3_analyzer(dim: int = 64, depth: int = 2, heads: int = 4, quantization: str = "none"):
+    """
+    DINOv3Analyzer with a small random-weight ViT laid out like DINOv2/v3
+    (patch size 14, pre-norm blocks with qkv/proj/fc1/fc2 linear layers), so
+    preprocessing, quantization and the feature analysis run unchanged
+    without the 25GB checkpoint.
+    """
+    import torch
+    import torch.nn as nn
+    import torch.nn.functional as F
+
+    from ..models.dinov3_model import DINOv3Analyzer
+
+    class Block(nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.norm1 = nn.LayerNorm(dim)
+            self.qkv = nn.Linear(dim, dim * 3)
+            self.proj = nn.Linear(dim, dim)
+            self.norm2 = nn.LayerNorm(dim)
+            self.fc1 = nn.Linear(dim, dim * 4)
+            self.fc2 = nn.Linear(dim * 4, dim)
+
+        def forward(self, x):
+            batch, tokens, _ = x.shape
+            q, k, v = self.qkv(self.norm1(x)).reshape(batch, tokens, 3, heads, dim // heads).permute(2, 0, 3, 1, 4)
+            attention = F.scaled_dot_product_attention(q, k, v).transpose(1, 2).reshape(batch, tokens, dim)
+            x = x + self.proj(attention)
+            return x + self.fc2(F.gelu(self.fc1(self.norm2(x))))
+
+    class TinyViT(nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.patch_embed = nn.Conv2d(3, dim, kernel_size=14, stride=14)
+            self.cls_token = nn.Parameter(torch.randn(1, 1, dim))
+            self.pos_embed = nn.Parameter(torch.randn(1, 1 + (224 // 14) ** 2, dim) * 0.02)
+            self.blocks = nn.Sequential(*(Block() for _ in range(depth)))
+            self.norm = nn.LayerNorm(dim)
+
+        def forward_features(self, x):
+            patches = self.patch_embed(x).flatten(2).transpose(1, 2)
+            tokens = torch.cat([self.cls_token.expand(x.shape[0], -1, -1), patches], dim=1)
+            return self.norm(self.blocks(tokens + self.pos_embed))
+
+    class TinyDINOv3Analyzer(DINOv3Analyzer):
+        def _load_model(self):
+            torch.manual_seed(0)
+            self.model = TinyViT().eval().to(self.device)
+
+    return TinyDINOv3Analyzer(f"tiny-random-vit-{dim}x{depth}", quantization=quantization)
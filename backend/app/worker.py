@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Verification Worker
+Claims jobs submitted through POST /api/jobs and runs them through the
+same pipeline as /api/verify. Start as many workers as needed, on any host
+that reaches the queue; HTTP workers only enqueue and poll.
+
+Usage (from the backend directory):
+    JOB_QUEUE_URL=redis://localhost:6379/0 python app/worker.py
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+
+# Allow running as a plain script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import main
+from app.services.job_queue import JobWorker
+
+logger = logging.getLogger("worker")
+
+
+async def run():
+    await main.init_services()
+    # Claim jobs only once the model is warm; exit (for a restart) if it cannot be
+    await main.model_warmup.wait()
+    if not main.model_warmup.ready:
+        logger.error(f"DINOv3 warm-up failed: {main.model_warmup.error}")
+        await main.shutdown_event()
+        sys.exit(1)
+
+    worker = JobWorker(main.job_queue, main.run_job)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.request_stop)
+
+    try:
+        await worker.run()
+    finally:
+        await main.shutdown_event()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
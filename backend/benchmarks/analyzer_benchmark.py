@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Analyzer Benchmark Suite
+Times decoding and every local analyzer of SimpleAIPipeline and
+AdvancedDeepfakeDetector, plus DINOv3Analyzer preprocessing and batched
+inference with a tiny random-weight model, over deterministic synthetic
+images (see app/testing/synthetic_images.py). Results are written as JSON
+and can be saved as a baseline and compared against it on later runs; the
+run fails if any case got slower than the allowed regression.
+
+Each analyzer is timed on a fresh ImageContext built from the decoded image,
+so it pays for the derived arrays (grayscale, pyramid levels, spectra) it
+uses itself, as the first analyzer to need them does in production.
+
+Usage (from the backend directory):
+    python -m benchmarks.analyzer_benchmark [--sizes 0.1 1 4] [--kinds photographic]
+        [--formats jpeg png webp] [--repeat 3] [--output results.json]
+        [--save-baseline benchmarks/analyzer_baseline.json]
+        [--baseline benchmarks/analyzer_baseline.json] [--max-regression 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_analysis import ImageContext
+from app.testing import KINDS, FORMATS, synthetic_image, encode, tiny_dinov3_analyzer
+
+# Timings below this are dominated by noise and never count as regressions
+MIN_REGRESSION_MS = 1.0
+
+
+def _best_ms(func: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _simple_analyzers() -> Dict[str, Callable[[ImageContext], Any]]:
+    from ai_pipeline import SimpleAIPipeline
+
+    pipeline = SimpleAIPipeline()
+    return {
+        "resolution_analysis": lambda ctx: pipeline._analyze_resolution(ctx.size),
+        "color_analysis": pipeline._analyze_colors,
+        "texture_analysis": pipeline._analyze_texture,
+        "composition_analysis": lambda ctx: pipeline._analyze_composition(ctx.size),
+        "metadata_analysis": pipeline._analyze_metadata,
+    }
+
+
+def _advanced_analyzers() -> Dict[str, Callable[[ImageContext], Any]]:
+    from vertex_ai_pipeline import AdvancedDeepfakeDetector
+
+    class LocalDetector(AdvancedDeepfakeDetector):
+        """Local analyzers only: no hub downloads, no backbones."""
+
+        def _load_models(self):
+            self.dinov3_model = None
+            self.efficientnet = None
+            self.vit = None
+
+    detector = LocalDetector()
+    return {
+        "resolution_analysis": lambda ctx: detector._analyze_resolution_advanced(ctx.size),
+        "color_analysis": detector._analyze_colors_advanced,
+        "texture_analysis": detector._analyze_texture_advanced,
+        "composition_analysis": lambda ctx: detector._analyze_composition_advanced(ctx.size),
+        "metadata_analysis": detector._analyze_metadata_advanced,
+        "frequency_analysis": detector._analyze_frequency_domain,
+        "noise_analysis": detector._analyze_noise_patterns,
+    }
+
+
+def _machine() -> Dict[str, Any]:
+    import torch
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "torch": torch.__version__,
+    }
+
+
+def run_images(sizes: List[float], kinds: List[str], formats: List[str], repeat: int) -> List[Dict[str, Any]]:
+    suites = {"simple": _simple_analyzers(), "advanced": _advanced_analyzers()}
+    results = []
+    for megapixels in sizes:
+        for kind in kinds:
+            image = synthetic_image(kind, megapixels)
+            for fmt in formats:
+                data = encode(image, fmt)
+                decoded = ImageContext(data).image
+                case = {"kind": kind, "megapixels": round(image.width * image.height / 1e6, 3),
+                        "format": fmt, "bytes": len(data)}
+
+                def decode():
+                    ImageContext(data).rgb
+
+                results.append({**case, "suite": "pipeline", "name": "decode",
+                                "best_ms": round(_best_ms(decode, repeat), 3)})
+
+                for suite, analyzers in suites.items():
+                    for name, analyzer in analyzers.items():
+                        best_ms = _best_ms(lambda: analyzer(ImageContext.from_image(decoded, data)), repeat)
+                        results.append({**case, "suite": suite, "name": name, "best_ms": round(best_ms, 3)})
+    return results
+
+
+def run_dinov3(sizes: List[float], batch_sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    analyzer = tiny_dinov3_analyzer()
+    results = []
+
+    for megapixels in sizes:
+        image = synthetic_image("photographic", megapixels)
+        best_ms = _best_ms(lambda: analyzer.preprocess(image), repeat)
+        results.append({"suite": "dinov3", "name": "preprocess", "kind": "photographic",
+                        "megapixels": round(image.width * image.height / 1e6, 3),
+                        "best_ms": round(best_ms, 3)})
+
+    tensor = analyzer.preprocess(synthetic_image("photographic", 0.1))
+    for batch_size in batch_sizes:
+        tensors, image_sizes = [tensor] * batch_size, [(224, 224)] * batch_size
+        analyzer.analyze_batch(tensors, image_sizes)  # warm-up (allocator, thread pool)
+        best_ms = _best_ms(lambda: analyzer.analyze_batch(tensors, image_sizes), repeat)
+        results.append({"suite": "dinov3", "name": "inference", "batch_size": batch_size,
+                        "best_ms": round(best_ms, 3), "per_image_ms": round(best_ms / batch_size, 3)})
+    return results
+
+
+def case_key(result: Dict[str, Any]) -> Tuple:
+    """Identity of a timed case, shared by results and baselines."""
+    return (result["suite"], result["name"], result.get("kind"), result.get("megapixels"),
+            result.get("format"), result.get("batch_size"))
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            max_regression: float) -> List[Dict[str, Any]]:
+    """
+    Annotate results with their baseline time and return the regressions.
+
+    A case regresses if it is more than `max_regression` (a fraction) and
+    more than MIN_REGRESSION_MS slower than its baseline.
+    """
+    reference = {case_key(r): r["best_ms"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        baseline_ms = reference.get(case_key(result))
+        if baseline_ms is None:
+            continue
+        result["baseline_ms"] = baseline_ms
+        result["change"] = round(result["best_ms"] / baseline_ms - 1, 3) if baseline_ms else None
+        if (result["best_ms"] > baseline_ms * (1 + max_regression)
+                and result["best_ms"] - baseline_ms > MIN_REGRESSION_MS):
+            regressions.append(result)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image analyzers and DINOv3 preprocessing/inference")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.1, 1, 4],
+                        help="Image sizes in megapixels (up to 50)")
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=list(KINDS))
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8],
+                        help="DINOv3 inference batch sizes")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case (best is reported)")
+    parser.add_argument('--skip-dinov3', action='store_true', help="Skip the DINOv3 (torch) benchmarks")
+    parser.add_argument('--output', help="Write the results JSON to this file (default: stdout only)")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Store these results as the baseline")
+    parser.add_argument('--baseline', metavar='PATH', help="Compare against a stored baseline")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    results = run_images(args.sizes, args.kinds, args.formats, args.repeat)
+    if not args.skip_dinov3:
+        results += run_dinov3(args.sizes, args.batch_sizes, args.repeat)
+
+    report: Dict[str, Any] = {"machine": _machine(), "repeat": args.repeat, "results": results}
+
+    regressions: List[Dict[str, Any]] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        report["baseline"] = {
+            "path": args.baseline,
+            "machine": baseline.get("machine"),
+            "same_machine": baseline.get("machine") == report["machine"],
+            "max_regression": args.max_regression,
+            "compared": sum(1 for r in results if "baseline_ms" in r),
+            "regressions": len(regressions),
+        }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(
+            {"machine": report["machine"], "repeat": args.repeat, "results": results}, indent=2) + "\n")
+
+    if regressions:
+        for r in regressions:
+            print(f"REGRESSION {r['suite']}.{r['name']} {r.get('kind') or ''} {r.get('megapixels') or ''}MP "
+                  f"{r.get('format') or ''}: {r['baseline_ms']}ms -> {r['best_ms']}ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
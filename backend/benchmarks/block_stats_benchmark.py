@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Block Statistics Benchmark
+Times the vectorized noise uniformity (8x8 blocks) and texture regularity
+(16x16 blocks) used by the advanced pipeline against the original
+patch-by-patch loops, and checks that window_stats agrees with block_stats.
+
+Usage (from the backend directory):
+    python -m benchmarks.block_stats_benchmark [--sizes 0.1 1 12] [--repeat 5]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import numpy as np
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_analysis import block_stats, window_stats, variance_uniformity
+from benchmarks.texture_benchmark import synthetic_gray
+
+TOLERANCE = 1e-9
+
+
+def legacy_uniformity(gray: np.ndarray, patch_size: int, eps: float) -> float:
+    """Reference implementation: the original per-patch loop."""
+    height, width = gray.shape
+    variances = []
+    for y in range(0, height - patch_size, patch_size):
+        for x in range(0, width - patch_size, patch_size):
+            variances.append(np.var(gray[y:y+patch_size, x:x+patch_size]))
+    return float(1 - (np.std(variances) / (np.mean(variances) + eps)))
+
+
+def vectorized_uniformity(gray: np.ndarray, patch_size: int, eps: float) -> float:
+    """Same grid as the legacy loop (patches starting before size - patch_size)."""
+    rows = len(range(0, gray.shape[0] - patch_size, patch_size))
+    cols = len(range(0, gray.shape[1] - patch_size, patch_size))
+    _, variances = block_stats(gray[:rows * patch_size, :cols * patch_size], patch_size)
+    return variance_uniformity(variances, eps=eps)
+
+
+def _best_time(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: List[float], repeat: int, legacy_max_mp: float) -> List[Dict[str, Any]]:
+    results = []
+    for megapixels in sizes:
+        gray = synthetic_gray(megapixels)
+        actual_mp = gray.size / 1e6
+        entry = {"megapixels": round(actual_mp, 3), "shape": list(gray.shape)}
+
+        for name, patch_size, eps in (("noise_uniformity", 8, 0.0), ("texture_regularity", 16, 1e-8)):
+            value = vectorized_uniformity(gray, patch_size, eps)
+            seconds = _best_time(lambda: vectorized_uniformity(gray, patch_size, eps), repeat)
+            result = {"value": round(value, 6), "vectorized_ms": round(seconds * 1000, 3)}
+
+            if actual_mp <= legacy_max_mp:
+                legacy_value = legacy_uniformity(gray, patch_size, eps)
+                legacy_seconds = _best_time(lambda: legacy_uniformity(gray, patch_size, eps), 1)
+                result.update({
+                    "legacy_ms": round(legacy_seconds * 1000, 3),
+                    "speedup": round(legacy_seconds / seconds, 1),
+                    "matches_legacy": abs(legacy_value - value) <= TOLERANCE,
+                })
+            entry[name] = result
+
+        # Integral-image windows with step == window are the non-overlapping blocks
+        _, block_var = block_stats(gray, 16)
+        _, window_var = window_stats(gray, 16, step=16)
+        entry["window_stats_matches_blocks"] = bool(np.allclose(block_var, window_var, rtol=0, atol=1e-9))
+        results.append(entry)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark block statistics")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.1, 1, 4, 12, 24],
+                        help="Image sizes in megapixels")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per size (best is reported)")
+    parser.add_argument('--legacy-max-mp', type=float, default=4,
+                        help="Largest size to also run through the legacy loops")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.legacy_max_mp)
+    print(json.dumps(results, indent=2))
+
+    checks = [r["window_stats_matches_blocks"] for r in results]
+    checks += [r[name].get("matches_legacy", True) for r in results
+               for name in ("noise_uniformity", "texture_regularity")]
+    if not all(checks):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
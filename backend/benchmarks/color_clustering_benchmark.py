@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Color Clustering Benchmark
+Compares the sampled color_clustering estimate against the exact all-pairs
+value on small images, and times the estimator on large ones.
+
+Usage (from the backend directory):
+    python -m benchmarks.color_clustering_benchmark [--trials 20] [--sizes 1 12]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import numpy as np
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_analysis.color import color_clustering, DEFAULT_SAMPLE_SIZE
+
+
+def synthetic_rgb(megapixels: float, palette_bits: int, seed: int = 0) -> np.ndarray:
+    """Deterministic 4:3 RGB image with colors quantized to `palette_bits` per channel."""
+    height = max(2, int(round((megapixels * 1e6 * 3 / 4) ** 0.5)))
+    width = max(2, int(round(height * 4 / 3)))
+    rng = np.random.default_rng(seed)
+    base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    noise = rng.normal(0, 40, size=(height, width, 3)).astype(np.float32)
+    img = np.clip(base + noise, 0, 255).astype(np.uint8)
+    shift = 8 - palette_bits
+    return (img >> shift) << shift
+
+
+def hoeffding_bound(sample_size: int, confidence: float = 0.997) -> float:
+    """Score error t with P(|error| >= t) <= 1 - confidence."""
+    return math.sqrt(math.log(2 / (1 - confidence)) / (2 * (sample_size // 2)))
+
+
+def accuracy(trials: int, sample_size: int) -> List[Dict[str, Any]]:
+    results = []
+    for palette_bits in (5, 6, 8):
+        img = synthetic_rgb(0.02, palette_bits)
+        start = time.perf_counter()
+        exact = color_clustering(img, sample_size=sys.maxsize)
+        exact_seconds = time.perf_counter() - start
+        errors = [abs(color_clustering(img, sample_size=sample_size, seed=seed) - exact)
+                  for seed in range(trials)]
+        results.append({
+            "palette_bits": palette_bits,
+            "unique_colors_sampled": sample_size,
+            "exact": round(exact, 5),
+            "exact_ms": round(exact_seconds * 1000, 1),
+            "max_abs_error": round(max(errors), 5),
+            "mean_abs_error": round(float(np.mean(errors)), 5),
+            "hoeffding_bound_99_7": round(hoeffding_bound(sample_size), 5),
+        })
+    return results
+
+
+def timing(sizes: List[float], sample_size: int) -> List[Dict[str, Any]]:
+    results = []
+    for megapixels in sizes:
+        img = synthetic_rgb(megapixels, 8)
+        start = time.perf_counter()
+        score = color_clustering(img, sample_size=sample_size)
+        seconds = time.perf_counter() - start
+        results.append({
+            "megapixels": round(img.shape[0] * img.shape[1] / 1e6, 3),
+            "ms": round(seconds * 1000, 1),
+            "score": round(score, 5),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark color clustering")
+    parser.add_argument('--trials', type=int, default=20, help="Sampling seeds per accuracy image")
+    parser.add_argument('--sample-size', type=int, default=DEFAULT_SAMPLE_SIZE)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 12, 24],
+                        help="Image sizes in megapixels for timing")
+    args = parser.parse_args()
+
+    report = {
+        "accuracy": accuracy(args.trials, args.sample_size),
+        "timing": timing(args.sizes, args.sample_size),
+    }
+    print(json.dumps(report, indent=2))
+
+    if any(r["max_abs_error"] > r["hoeffding_bound_99_7"] for r in report["accuracy"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Frequency Analysis Benchmark
+Compares the frequency regularity of the advanced pipeline (center lines
+from 1-D real FFTs) with the original full-resolution fft2 / fftshift
+computation, and reports time and peak NumPy memory of both.
+
+Usage (from the backend directory):
+    python -m benchmarks.frequency_benchmark [--sizes 1 12 24] [--legacy-max-mp 12]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_analysis import center_line_spectra
+from benchmarks.texture_benchmark import synthetic_gray
+
+TOLERANCE = 1e-9
+
+
+def legacy_regularity(gray: np.ndarray) -> float:
+    """Reference implementation: the original fft2-based computation."""
+    magnitude_spectrum = np.log(np.abs(np.fft.fftshift(np.fft.fft2(gray))) + 1)
+    center_y, center_x = magnitude_spectrum.shape[0] // 2, magnitude_spectrum.shape[1] // 2
+    return float((np.std(magnitude_spectrum[center_y, :]) + np.std(magnitude_spectrum[:, center_x])) / 2)
+
+
+def regularity(gray: np.ndarray) -> float:
+    horizontal, vertical = center_line_spectra(gray)
+    return float((np.std(horizontal) + np.std(vertical)) / 2)
+
+
+def _measure(func, *args) -> Tuple[Any, float, float]:
+    """(result, seconds, peak traced MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+
+def run(sizes: List[float], legacy_max_mp: float) -> List[Dict[str, Any]]:
+    results = []
+    for megapixels in sizes:
+        gray = synthetic_gray(megapixels)
+        value, seconds, peak_mb = _measure(regularity, gray)
+        entry = {
+            "megapixels": round(gray.size / 1e6, 3),
+            "frequency_regularity": round(value, 6),
+            "ms": round(seconds * 1000, 2),
+            "peak_mb": round(peak_mb, 2),
+        }
+
+        if gray.size / 1e6 <= legacy_max_mp:
+            legacy_value, legacy_seconds, legacy_peak_mb = _measure(legacy_regularity, gray)
+            entry.update({
+                "legacy_ms": round(legacy_seconds * 1000, 2),
+                "legacy_peak_mb": round(legacy_peak_mb, 2),
+                "matches_legacy": abs(legacy_value - value) <= TOLERANCE,
+            })
+
+        results.append(entry)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frequency analysis")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 4, 12, 24],
+                        help="Image sizes in megapixels")
+    parser.add_argument('--legacy-max-mp', type=float, default=12,
+                        help="Largest size to also run through the legacy fft2")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.legacy_max_mp)
+    print(json.dumps(results, indent=2))
+
+    if any(r.get("matches_legacy") is False for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Gemini Client Concurrency Benchmark
+Issues N report calls against the local Gemini stub, first one at a time
+with blocking calls (the old requests.post behaviour inside the event loop),
+then concurrently through the pooled async GeminiClient.
+
+Usage (from the backend directory):
+    python -m benchmarks.gemini_concurrency_benchmark [--calls 32] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.gemini_client import GeminiClient
+from benchmarks.gemini_stub import StubServer
+
+PROMPT = "Describe this image."
+IMAGE = b"\xff\xd8" + b"\x00" * 64 * 1024
+
+
+def run_blocking(client: GeminiClient, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        client.generate_sync(PROMPT, IMAGE)
+    return time.perf_counter() - start
+
+
+async def run_async(client: GeminiClient, calls: int) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client.generate(PROMPT, IMAGE) for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    assert all(results), "stub returned an empty response"
+    await client.aclose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gemini client concurrency")
+    parser.add_argument('--calls', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.2, help="Stub latency per call (s)")
+    parser.add_argument('--concurrency', type=int, default=16, help="GeminiClient max_concurrency")
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+        client = GeminiClient(api_key="stub", base_url=stub.url, max_concurrency=args.concurrency)
+        blocking = run_blocking(client, args.calls)
+        concurrent = asyncio.run(run_async(client, args.calls))
+        max_in_flight = stub.app.state.max_in_flight
+
+    print(json.dumps({
+        "calls": args.calls,
+        "stub_latency_s": args.latency,
+        "max_concurrency": args.concurrency,
+        "blocking_s": round(blocking, 3),
+        "blocking_calls_per_s": round(args.calls / blocking, 1),
+        "async_s": round(concurrent, 3),
+        "async_calls_per_s": round(args.calls / concurrent, 1),
+        "speedup": round(blocking / concurrent, 1),
+        "stub_max_in_flight": max_in_flight
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Local Gemini Stub Server
+Answers generateContent requests with a canned response after a
+configurable delay (streamGenerateContent: the same text as server-sent
+events, word by word, spread over that delay), so Gemini-dependent code can be exercised and
+benchmarked offline without spending quota. Latency jitter, a random
+error rate (500 INTERNAL) and a request rate limit (429 RESOURCE_EXHAUSTED,
+like the real API's quota) can be simulated.
+
+Usage (from the backend directory):
+    python -m benchmarks.gemini_stub --port 8090 --latency 0.5 [--jitter 0.3]
+        [--error-rate 0.02] [--rate-limit 10]
+    GEMINI_API_URL=http://127.0.0.1:8090/v1beta/models/gemini-pro-vision:generateContent \\
+    GEMINI_API_KEY=stub python start_local.py
+"""
+
+import argparse
+import asyncio
+import socket
+import threading
+import json
+import random
+import time
+from typing import AsyncIterator, Dict, Any, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUB_PATH = "/v1beta/models/gemini-pro-vision:generateContent"
+STUB_STREAM_PATH = "/v1beta/models/gemini-pro-vision:streamGenerateContent"
+STUB_TEXT = "The image appears consistent and natural. No obvious manipulation artifacts were observed."
+
+
+def _error(code: int, status: str, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """Error body in the format of the Gemini API"""
+    return JSONResponse({"error": {"code": code, "message": message, "status": status}},
+                        status_code=code, headers=headers)
+
+
+def create_app(latency: float = 0.5, jitter: float = 0.0, error_rate: float = 0.0,
+               rate_limit: float = 0.0, seed: int = 0) -> FastAPI:
+    """
+    Build the stub application
+
+    Args:
+        latency: Seconds to wait before answering each request
+        jitter: Extra delay per request, uniformly distributed in [0, jitter] seconds
+        error_rate: Fraction of requests answered with 500 INTERNAL
+        rate_limit: Requests per second admitted (token bucket, burst of one
+                    second's worth); the rest get 429 RESOURCE_EXHAUSTED. 0 = unlimited
+        seed: Seed for jitter and error sampling
+    """
+    app = FastAPI(title="Gemini Stub")
+    app.state.latency = latency
+    app.state.jitter = jitter
+    app.state.error_rate = error_rate
+    app.state.rate_limit = rate_limit
+    app.state.requests = 0
+    app.state.errors = 0
+    app.state.rate_limited = 0
+    app.state.in_flight = 0
+    app.state.max_in_flight = 0
+
+    rng = random.Random(seed)
+    bucket = {"tokens": max(1.0, rate_limit), "updated": time.monotonic()}
+
+    def reject() -> Optional[JSONResponse]:
+        """Simulated quota and server errors, or None to answer normally"""
+        if app.state.rate_limit > 0:
+            now = time.monotonic()
+            capacity = max(1.0, app.state.rate_limit)
+            bucket["tokens"] = min(capacity, bucket["tokens"] + (now - bucket["updated"]) * app.state.rate_limit)
+            bucket["updated"] = now
+            if bucket["tokens"] < 1:
+                app.state.rate_limited += 1
+                retry_after = (1 - bucket["tokens"]) / app.state.rate_limit
+                return _error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota).",
+                              {"Retry-After": str(max(1, round(retry_after)))})
+            bucket["tokens"] -= 1
+        if app.state.error_rate > 0 and rng.random() < app.state.error_rate:
+            app.state.errors += 1
+            return _error(500, "INTERNAL", "An internal error has occurred.")
+        return None
+
+    def delay() -> float:
+        return app.state.latency + (rng.uniform(0, app.state.jitter) if app.state.jitter > 0 else 0.0)
+
+    @app.post(STUB_PATH)
+    async def generate_content(request: Request):
+        await request.body()
+        app.state.requests += 1
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            await asyncio.sleep(delay())
+            rejection = reject()
+        finally:
+            app.state.in_flight -= 1
+        if rejection is not None:
+            return rejection
+        return {
+            "candidates": [{
+                "content": {"parts": [{"text": STUB_TEXT}], "role": "model"},
+                "finishReason": "STOP"
+            }]
+        }
+
+    @app.post(STUB_STREAM_PATH)
+    async def stream_generate_content(request: Request):
+        await request.body()
+        app.state.requests += 1
+        rejection = reject()
+        if rejection is not None:
+            return rejection
+        words = STUB_TEXT.split(" ")
+        word_delay = delay() / len(words)
+
+        async def events() -> AsyncIterator[bytes]:
+            app.state.in_flight += 1
+            app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+            try:
+                for i, word in enumerate(words):
+                    await asyncio.sleep(word_delay)
+                    chunk = {"candidates": [{
+                        "content": {"parts": [{"text": word if i == 0 else " " + word}], "role": "model"}
+                    }]}
+                    yield f"data: {json.dumps(chunk)}\r\n\r\n".encode()
+            finally:
+                app.state.in_flight -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats() -> Dict[str, Any]:
+        return {
+            "requests": app.state.requests,
+            "errors": app.state.errors,
+            "rate_limited": app.state.rate_limited,
+            "in_flight": app.state.in_flight,
+            "max_in_flight": app.state.max_in_flight
+        }
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """Runs the stub in a background thread; use as a context manager."""
+
+    def __init__(self, latency: float = 0.5, port: int = 0, **options):
+        """
+        Args:
+            latency: Seconds per response
+            port: Port to listen on (default: a free one)
+            **options: jitter, error_rate, rate_limit, seed (see create_app)
+        """
+        self.port = port or free_port()
+        self.app = create_app(latency, **options)
+        self.server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=self.port,
+                                                    log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{STUB_PATH}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini stub server")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds per response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random delay, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help="Requests per second before answering 429 (0 = unlimited)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    app = create_app(args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                     rate_limit=args.rate_limit, seed=args.seed)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
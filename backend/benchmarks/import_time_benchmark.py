@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Import Time Benchmark
+Imports each service entry point in a fresh interpreter with
+`python -X importtime`, reports the slowest modules and fails if an entry
+point exceeds its budget or imports a dependency that must stay lazy
+(torch, tensorflow, Google Cloud SDKs).
+
+Usage (from the backend directory):
+    python -m benchmarks.import_time_benchmark [--repeat 3] [--top 10] [--budget-scale 1.0]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Any, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# name -> (working directory, module to import, budget in ms)
+ENTRY_POINTS = {
+    "backend/main.py": (BACKEND_DIR, "main", 1200),
+    "backend/app/main.py": (BACKEND_DIR, "app.main", 1200),
+    "backend/vertex_ai_pipeline.py": (BACKEND_DIR, "vertex_ai_pipeline", 600),
+}
+
+# Loaded on first use only; importing an entry point must not pull these in
+LAZY_MODULES = ("torch", "torchvision", "tensorflow", "google.cloud")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_importtime(cwd: Path, module: str) -> List[Dict[str, Any]]:
+    """Import `module` in a fresh interpreter and parse the -X importtime log."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    return rows
+
+
+def measure(name: str, cwd: Path, module: str, budget_ms: float,
+            repeat: int, top: int) -> Dict[str, Any]:
+    totals = []
+    rows = []
+    for _ in range(repeat):
+        rows = run_importtime(cwd, module)
+        # The entry point itself is the last top-level line
+        entry = next(r for r in reversed(rows) if r["module"] == module and r["depth"] == 0)
+        totals.append(entry["cumulative_us"])
+
+    imported = {r["module"] for r in rows}
+    lazy_violations = sorted(m for m in LAZY_MODULES if m in imported)
+    # Top-level packages only, ranked by cumulative time (from the last run)
+    heaviest = sorted((r for r in rows if r["depth"] == 1), key=lambda r: r["cumulative_us"], reverse=True)
+
+    median_ms = statistics.median(totals) / 1000
+    return {
+        "entry_point": name,
+        "median_ms": round(median_ms, 1),
+        "runs_ms": [round(t / 1000, 1) for t in totals],
+        "budget_ms": budget_ms,
+        "within_budget": median_ms <= budget_ms,
+        "lazy_violations": lazy_violations,
+        "heaviest_imports": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 1)}
+            for r in heaviest[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entry point import time")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters per entry point")
+    parser.add_argument('--top', type=int, default=10, help="Heaviest direct imports to report")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="Multiply every budget (e.g. 2 on slow CI machines)")
+    parser.add_argument('--entry', choices=sorted(ENTRY_POINTS), nargs='+',
+                        help="Only measure these entry points")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.entry or ENTRY_POINTS:
+        cwd, module, budget_ms = ENTRY_POINTS[name]
+        results.append(measure(name, cwd, module, budget_ms * args.budget_scale, args.repeat, args.top))
+    print(json.dumps(results, indent=2))
+
+    if any(not r["within_budget"] or r["lazy_violations"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
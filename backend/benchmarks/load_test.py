@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Load Test
+Drives /verify (backend/main.py) and /api/verify (backend/app/main.py) with
+a closed loop of concurrent clients uploading a weighted mix of synthetic
+images, and reports throughput, status codes and p50/p95/p99 latency per
+endpoint.
+
+With --launch the apps are started locally (uvicorn subprocesses) against
+the local Gemini stub, with result caching and near-duplicate lookup off so
+every request runs the full pipeline. Otherwise point --target at running
+servers; start their Gemini stand-in with `python -m benchmarks.gemini_stub`.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test --launch flat app [--workers 2]
+        [--gemini-latency 1.5 --gemini-jitter 1.0 --gemini-error-rate 0.01 --gemini-rate-limit 20]
+    python -m benchmarks.load_test --target verify=http://10.0.0.5:8000/verify
+        --target api=http://10.0.0.6:8000/api/verify
+    [--concurrency 8] [--duration 60] [--warmup 5] [--mix photographic:1:jpeg=3 photographic:12:jpeg=1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.gemini_stub import StubServer, free_port
+from app.testing import FORMATS, KINDS, synthetic_image_bytes
+
+# name -> (working directory, ASGI app, endpoint)
+APPS = {
+    "flat": (BACKEND_DIR, "main:app", "/verify"),
+    "app": (BACKEND_DIR, "app.main:app", "/api/verify"),
+}
+
+_MIME = {"jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+_EXTENSION = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+
+@dataclass
+class Sample:
+    started: float  # seconds since the run started
+    latency: float
+    status: Optional[int]  # None if the request failed without a response
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def parse_mix(entries: List[str]) -> List[Tuple[str, float, str, int]]:
+    """Parse `kind:megapixels:format[=weight]` entries."""
+    mix = []
+    for entry in entries:
+        spec, _, weight = entry.partition("=")
+        try:
+            kind, megapixels, fmt = spec.split(":")
+            parsed = (kind, float(megapixels), fmt, int(weight or 1))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid mix entry {entry!r} (expected kind:megapixels:format[=weight])")
+        if kind not in KINDS or fmt not in FORMATS or parsed[3] < 1:
+            raise argparse.ArgumentTypeError(f"Invalid mix entry {entry!r} (kinds: {', '.join(KINDS)}; "
+                                             f"formats: {', '.join(FORMATS)}; weight >= 1)")
+        mix.append(parsed)
+    return mix
+
+
+def build_uploads(mix: List[Tuple[str, float, str, int]], pool_size: int) -> List[Tuple[str, bytes, str]]:
+    """
+    Request schedule: (filename, bytes, content type) tuples in which each mix
+    entry appears in proportion to its weight, with `pool_size` distinct
+    images (different seeds) per entry.
+    """
+    pools = []
+    for kind, megapixels, fmt, weight in mix:
+        images = [(f"{kind}-{megapixels}mp-{seed}.{_EXTENSION[fmt]}",
+                   synthetic_image_bytes(kind, megapixels, fmt, seed), _MIME[fmt])
+                  for seed in range(pool_size)]
+        pools.append((images, weight))
+
+    # Interleave so any window of the schedule has the requested proportions
+    schedule = []
+    for i in range(pool_size):
+        for images, weight in pools:
+            schedule.extend([images[i]] * weight)
+    return schedule
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return max(0.0, float(response.headers.get("retry-after", 0)))
+    except ValueError:
+        return 0.0
+
+
+async def drive(url: str, uploads: List[Tuple[str, bytes, str]], concurrency: int,
+                duration: float, timeout: float, honor_retry_after: bool = True) -> List[Sample]:
+    """
+    Run `concurrency` clients back to back against `url` for `duration` seconds
+
+    Like well-behaved clients, each backs off for the Retry-After of a 429 or
+    503 (admission control) before its next request, unless told not to.
+    """
+    samples: List[Sample] = []
+    counter = iter(range(sys.maxsize))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                filename, data, content_type = uploads[next(counter) % len(uploads)]
+                sent = time.perf_counter()
+                try:
+                    response = await client.post(url, files={"file": (filename, data, content_type)})
+                except httpx.HTTPError as e:
+                    samples.append(Sample(sent - start, time.perf_counter() - sent, None, type(e).__name__))
+                    continue
+                latency = time.perf_counter() - sent
+                cached = False
+                if response.status_code == 200:
+                    try:
+                        cached = bool(response.json().get("cached"))
+                    except ValueError:
+                        pass
+                samples.append(Sample(sent - start, latency, response.status_code, cached=cached))
+                if honor_retry_after and response.status_code in (429, 503):
+                    await asyncio.sleep(min(_retry_after(response), max(0.0, deadline - time.perf_counter())))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, Any]:
+    if not latencies:
+        return {}
+    values = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 1),
+        "p95_ms": round(float(p95), 1),
+        "p99_ms": round(float(p99), 1),
+        "max_ms": round(float(values.max()), 1),
+        "mean_ms": round(float(values.mean()), 1),
+    }
+
+
+def summarize(samples: List[Sample], duration: float, warmup: float) -> Dict[str, Any]:
+    """Statistics of the requests sent after the warm-up period."""
+    measured = [s for s in samples if s.started >= warmup]
+    window = max(duration - warmup, 1e-9)
+    ok = [s for s in measured if s.status == 200]
+    statuses = Counter(str(s.status) if s.status is not None else s.error for s in measured)
+    return {
+        "requests": len(measured),
+        "ok": len(ok),
+        "cached": sum(1 for s in ok if s.cached),
+        "status_codes": dict(sorted(statuses.items())),
+        "throughput_rps": round(len(measured) / window, 2),
+        "ok_throughput_rps": round(len(ok) / window, 2),
+        "latency_ok": _percentiles([s.latency for s in ok]),
+        "latency_all": _percentiles([s.latency for s in measured]),
+    }
+
+
+class LaunchedApp:
+    """One of the FastAPI apps in a uvicorn subprocess; use as a context manager."""
+
+    def __init__(self, name: str, env: Dict[str, str], workers: int = 1, startup_timeout: float = 600):
+        cwd, app, self.endpoint = APPS[name]
+        self.name = name
+        self.port = free_port()
+        self.startup_timeout = startup_timeout
+        self.log = open(Path(os.getenv("TMPDIR", "/tmp")) / f"apex-load-test-{name}-{self.port}.log", "w")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=cwd, env={**os.environ, **env}, stdout=self.log, stderr=subprocess.STDOUT
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{self.endpoint}"
+
+    def wait_ready(self):
+        """Wait for /health; raises RuntimeError if the app exits or never answers."""
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with code {self.process.returncode} (log: {self.log.name})")
+            try:
+                if httpx.get(f"http://127.0.0.1:{self.port}/health", timeout=2).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.25)
+        raise RuntimeError(f"{self.name} not ready after {self.startup_timeout}s (log: {self.log.name})")
+
+    def __enter__(self) -> "LaunchedApp":
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+
+def run_target(name: str, url: str, uploads, args) -> Dict[str, Any]:
+    print(f"Driving {name} ({url}) for {args.duration}s at concurrency {args.concurrency}", file=sys.stderr)
+    samples = asyncio.run(drive(url, uploads, args.concurrency, args.duration, args.timeout,
+                                not args.ignore_retry_after))
+    return {"target": name, "url": url, **summarize(samples, args.duration, args.warmup)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the verification endpoints")
+    parser.add_argument('--target', action='append', default=[], metavar='NAME=URL',
+                        help="Endpoint of a running server (repeatable)")
+    parser.add_argument('--launch', nargs='+', choices=sorted(APPS), default=[],
+                        help="Start these apps locally against the Gemini stub")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn workers per launched app")
+    parser.add_argument('--with-cache', action='store_true',
+                        help="Keep result caching and near-duplicate lookup on in launched apps")
+    parser.add_argument('--startup-timeout', type=float, default=600, help="Seconds to wait for a launched app")
+    parser.add_argument('--concurrency', type=int, default=8, help="Concurrent clients")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds per target")
+    parser.add_argument('--warmup', type=float, default=3, help="Leading seconds excluded from the statistics")
+    parser.add_argument('--timeout', type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument('--ignore-retry-after', action='store_true',
+                        help="Send the next request immediately after a 429/503")
+    parser.add_argument('--mix', nargs='+', default=["photographic:1:jpeg=3", "photographic:4:jpeg=1",
+                                                     "noisy:0.5:png=1"],
+                        help="Image mix as kind:megapixels:format[=weight]")
+    parser.add_argument('--pool-size', type=int, default=4, help="Distinct images per mix entry")
+    parser.add_argument('--gemini-latency', type=float, default=1.0, help="Stub seconds per response")
+    parser.add_argument('--gemini-jitter', type=float, default=0.5, help="Stub extra random delay (s)")
+    parser.add_argument('--gemini-error-rate', type=float, default=0.0, help="Stub fraction of 500 responses")
+    parser.add_argument('--gemini-rate-limit', type=float, default=0.0, help="Stub requests/s before 429 (0 = off)")
+    parser.add_argument('--output', help="Also write the report JSON to this file")
+    args = parser.parse_args()
+
+    targets = []
+    for target in args.target:
+        name, sep, url = target.partition("=")
+        if not sep:
+            parser.error(f"--target expects NAME=URL, got {target!r}")
+        targets.append((name, url))
+    if not targets and not args.launch:
+        parser.error("nothing to test: use --target and/or --launch")
+    if args.warmup >= args.duration:
+        parser.error("--warmup must be shorter than --duration")
+
+    try:
+        uploads = build_uploads(parse_mix(args.mix), args.pool_size)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    report: Dict[str, Any] = {
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "mix": args.mix,
+        "results": [run_target(name, url, uploads, args) for name, url in targets],
+    }
+
+    if args.launch:
+        stub_options = {"jitter": args.gemini_jitter, "error_rate": args.gemini_error_rate,
+                        "rate_limit": args.gemini_rate_limit}
+        with StubServer(latency=args.gemini_latency, **stub_options) as stub:
+            env = {"GEMINI_API_KEY": "stub", "GEMINI_API_URL": stub.url}
+            if not args.with_cache:
+                env.update({"RESULT_CACHE_ENABLED": "false", "NEAR_DUPLICATE_ENABLED": "false"})
+
+            for name in args.launch:
+                with LaunchedApp(name, env, args.workers, args.startup_timeout) as launched:
+                    try:
+                        launched.wait_ready()
+                    except RuntimeError as e:
+                        print(f"Skipping {name}: {e}", file=sys.stderr)
+                        report["results"].append({"target": name, "error": str(e)})
+                        continue
+                    requests_before = stub.app.state.requests
+                    result = run_target(name, launched.url, uploads, args)
+                    result["workers"] = args.workers
+                    result["gemini_requests"] = stub.app.state.requests - requests_before
+                    report["results"].append(result)
+
+            report["gemini_stub"] = {
+                "latency_s": args.gemini_latency, **stub_options,
+                "errors": stub.app.state.errors,
+                "rate_limited": stub.app.state.rate_limited,
+                "max_in_flight": stub.app.state.max_in_flight,
+            }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+
+    if any("error" in r for r in report["results"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
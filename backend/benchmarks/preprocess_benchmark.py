@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - DINOv3 Preprocessing Check
+Compares DINOv3Analyzer's fast preprocessing (reduced-size JPEG decode,
+uint8 resize of the center crop, normalization into the batch tensor) with
+the torchvision Resize/CenterCrop/ToTensor/Normalize transform it replaces
+(DINOV3_FAST_PREPROCESS=false). For every image both paths run from the
+encoded bytes; the report has the largest and mean absolute difference of
+the normalized model input and the time of each path. Fails if any image
+is outside the tolerances, so the result can gate the fast path.
+
+Without --images, synthetic images of every kind, size and format are used
+(see app/testing/synthetic_images.py).
+
+Usage (from the backend directory):
+    python -m benchmarks.preprocess_benchmark [--images ./samples] [--sizes 0.3 2 12 24]
+        [--kinds photographic noisy] [--formats jpeg png webp] [--repeat 3]
+        [--max-diff 0.5] [--max-mean-diff 0.05] [--output results.json]
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.testing import KINDS, FORMATS, synthetic_image_bytes, tiny_dinov3_analyzer
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def load_samples(images_dir: str, limit: int) -> List[Tuple[Dict[str, Any], bytes]]:
+    paths = sorted(p for p in Path(images_dir).rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS)[:limit]
+    if not paths:
+        raise SystemExit(f"No images found in {images_dir}")
+    return [({"image": str(path.relative_to(images_dir))}, path.read_bytes()) for path in paths]
+
+
+def synthetic_samples(sizes: List[float], kinds: List[str], formats: List[str]) -> List[Tuple[Dict[str, Any], bytes]]:
+    return [({"kind": kind, "megapixels": megapixels, "format": fmt},
+             synthetic_image_bytes(kind, megapixels, fmt))
+            for megapixels in sizes for kind in kinds for fmt in formats]
+
+
+def run_path(analyzer, data: bytes, fast: bool, repeat: int) -> Tuple[np.ndarray, float]:
+    """Normalized model input from the encoded bytes, and the best wall time."""
+    from app.models.preprocessing import batch_tensor
+
+    analyzer.fast_preprocess = fast
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # Reopen every time: the fast path decodes a JPEG at reduced size in place
+        with Image.open(io.BytesIO(data)) as image:
+            batch = batch_tensor([analyzer.preprocess(image)], analyzer.device)
+        best = min(best, time.perf_counter() - start)
+    return batch[0].cpu().numpy(), best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check DINOv3 fast preprocessing against the torchvision transform")
+    parser.add_argument('--images', help="Directory of sample images (default: synthetic images)")
+    parser.add_argument('--limit', type=int, default=64, help="Maximum number of sample images")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.3, 2.0, 12.0, 24.0], help="Megapixels")
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=["photographic", "noisy"])
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per path (best is reported)")
+    parser.add_argument('--max-diff', type=float, default=0.5,
+                        help="Largest allowed absolute difference of any input value (normalized units)")
+    parser.add_argument('--max-mean-diff', type=float, default=0.05,
+                        help="Largest allowed mean absolute difference per image (normalized units)")
+    parser.add_argument('--output', help="Also write the report JSON to this file")
+    args = parser.parse_args()
+
+    # Preprocessing does not depend on the weights
+    analyzer = tiny_dinov3_analyzer()
+    samples = load_samples(args.images, args.limit) if args.images else \
+        synthetic_samples(args.sizes, args.kinds, args.formats)
+
+    per_image, failures = [], []
+    for case, data in samples:
+        reference, reference_ms = run_path(analyzer, data, fast=False, repeat=args.repeat)
+        fast, fast_ms = run_path(analyzer, data, fast=True, repeat=args.repeat)
+        diff = np.abs(fast - reference)
+        entry = {
+            **case,
+            "max_diff": round(float(diff.max()), 4),
+            "mean_diff": round(float(diff.mean()), 5),
+            "torchvision_ms": round(reference_ms, 2),
+            "fast_ms": round(fast_ms, 2),
+            "speedup": round(reference_ms / fast_ms, 2),
+        }
+        per_image.append(entry)
+        if entry["max_diff"] > args.max_diff or entry["mean_diff"] > args.max_mean_diff:
+            failures.append(f"{case}: max diff {entry['max_diff']}, mean diff {entry['mean_diff']}")
+
+    summary = {
+        "images": len(per_image),
+        "max_diff": max(e["max_diff"] for e in per_image),
+        "mean_diff_max": max(e["mean_diff"] for e in per_image),
+        "torchvision_ms_total": round(sum(e["torchvision_ms"] for e in per_image), 1),
+        "fast_ms_total": round(sum(e["fast_ms"] for e in per_image), 1),
+        "passed": not failures,
+        "failures": failures,
+    }
+    summary["speedup"] = round(summary["torchvision_ms_total"] / summary["fast_ms_total"], 2)
+
+    output = json.dumps({"summary": summary, "per_image": per_image}, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
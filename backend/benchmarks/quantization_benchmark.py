@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - DINOv3 Quantization Validation
+Runs a sample set through the DINOv3 backbone in fp32, quantizes the same
+model to dynamic int8 (DINOV3_QUANTIZATION=dynamic_int8) and runs it again,
+then reports how far authenticity_score, feature_diversity and
+feature_consistency moved, how often the classification changed, the
+inference speedup and the memory saved. Fails if any tolerance is exceeded,
+so the result can gate turning quantization on.
+
+Run it on the inference node type (same CPU and thread count) with a
+representative sample directory; without --images, synthetic images are used.
+
+Usage (from the backend directory):
+    python -m benchmarks.quantization_benchmark --model-path ./models/dinov3_artifact --images ./samples
+    python -m benchmarks.quantization_benchmark --tiny [--tiny-dim 384 --tiny-depth 12]
+        [--batch-size 8] [--repeat 3] [--max-score-diff 5] [--max-stat-diff 0.05] [--min-agreement 0.95]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.testing import KINDS, synthetic_image, tiny_dinov3_analyzer
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+STATS = ("feature_diversity", "feature_consistency")
+
+
+def load_samples(images_dir: str, limit: int) -> List[Tuple[str, Image.Image]]:
+    paths = sorted(p for p in Path(images_dir).rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS)[:limit]
+    if not paths:
+        raise SystemExit(f"No images found in {images_dir}")
+    samples = []
+    for path in paths:
+        with Image.open(path) as image:
+            samples.append((str(path.relative_to(images_dir)), image.convert("RGB")))
+    return samples
+
+
+def synthetic_samples(count: int, megapixels: float) -> List[Tuple[str, Image.Image]]:
+    return [(f"{KINDS[i % len(KINDS)]}-{i // len(KINDS)}",
+             synthetic_image(KINDS[i % len(KINDS)], megapixels, seed=i // len(KINDS)))
+            for i in range(count)]
+
+
+def run_model(analyzer, tensors, sizes, batch_size: int, repeat: int) -> Tuple[List[Dict[str, Any]], float]:
+    """Analyses of every sample and the best wall time of a full pass."""
+    def full_pass():
+        results = []
+        for i in range(0, len(tensors), batch_size):
+            results += analyzer.analyze_batch(tensors[i:i + batch_size], sizes[i:i + batch_size])
+        return results
+
+    results = full_pass()  # warm-up, also the results compared
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        full_pass()
+        best = min(best, time.perf_counter() - start)
+    return results, best
+
+
+def _relative(a: float, b: float) -> float:
+    return abs(a - b) / max(abs(a), 1e-6)
+
+
+def compare(names: List[str], fp32: List[Dict[str, Any]], int8: List[Dict[str, Any]]) -> Dict[str, Any]:
+    per_image = []
+    for name, ref, quant in zip(names, fp32, int8):
+        entry = {
+            "image": name,
+            "authenticity_score": [ref["authenticity_score"], quant["authenticity_score"]],
+            "score_diff": round(abs(ref["authenticity_score"] - quant["authenticity_score"]), 2),
+            "classification_match": ref["classification"] == quant["classification"],
+        }
+        for stat in STATS:
+            a, b = ref["feature_stats"][stat], quant["feature_stats"][stat]
+            entry[stat] = [a, b]
+            entry[f"{stat}_rel_diff"] = round(_relative(a, b), 5)
+        per_image.append(entry)
+
+    summary = {
+        "images": len(per_image),
+        "score_diff_max": max(e["score_diff"] for e in per_image),
+        "score_diff_mean": round(float(np.mean([e["score_diff"] for e in per_image])), 3),
+        "classification_agreement": round(sum(e["classification_match"] for e in per_image) / len(per_image), 4),
+    }
+    for stat in STATS:
+        diffs = [e[f"{stat}_rel_diff"] for e in per_image]
+        summary[f"{stat}_rel_diff_max"] = max(diffs)
+        summary[f"{stat}_rel_diff_mean"] = round(float(np.mean(diffs)), 5)
+    return {"summary": summary, "per_image": per_image}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate dynamic int8 quantization of the DINOv3 backbone")
+    parser.add_argument('--model-path', default=os.getenv('DINOV3_MODEL_PATH'),
+                        help="Checkpoint or model artifact (default: DINOV3_MODEL_PATH)")
+    parser.add_argument('--tiny', action='store_true', help="Use a random-weight ViT instead of a checkpoint")
+    parser.add_argument('--tiny-dim', type=int, default=384)
+    parser.add_argument('--tiny-depth', type=int, default=12)
+    parser.add_argument('--images', help="Directory of sample images (default: synthetic images)")
+    parser.add_argument('--limit', type=int, default=64, help="Maximum number of samples")
+    parser.add_argument('--megapixels', type=float, default=1.0, help="Size of synthetic samples")
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes per precision (best is reported)")
+    parser.add_argument('--max-score-diff', type=float, default=5.0,
+                        help="Largest allowed authenticity_score change (points)")
+    parser.add_argument('--max-stat-diff', type=float, default=0.05,
+                        help="Largest allowed relative change of feature_diversity/consistency")
+    parser.add_argument('--min-agreement', type=float, default=0.95,
+                        help="Smallest allowed fraction of unchanged classifications")
+    parser.add_argument('--output', help="Also write the report JSON to this file")
+    args = parser.parse_args()
+
+    import torch
+    from app.models.dinov3_model import DINOv3Analyzer
+    from app.models.quantization import quantize_dynamic_int8, model_size_bytes
+
+    if args.tiny:
+        analyzer = tiny_dinov3_analyzer(dim=args.tiny_dim, depth=args.tiny_depth, heads=max(1, args.tiny_dim // 64))
+    elif args.model_path:
+        analyzer = DINOv3Analyzer(args.model_path, quantization="none")
+    else:
+        parser.error("--model-path (or DINOV3_MODEL_PATH) or --tiny is required")
+    if analyzer.device.type != "cpu":
+        parser.error("dynamic int8 quantization is CPU-only; run with CUDA_VISIBLE_DEVICES=''")
+
+    samples = load_samples(args.images, args.limit) if args.images else synthetic_samples(min(args.limit, 16), args.megapixels)
+    names = [name for name, _ in samples]
+    tensors = [analyzer.preprocess(image) for _, image in samples]
+    sizes = [image.size for _, image in samples]
+
+    fp32_results, fp32_seconds = run_model(analyzer, tensors, sizes, args.batch_size, args.repeat)
+    fp32_bytes = model_size_bytes(analyzer.model)
+
+    # Quantize in place: large checkpoints do not fit in memory twice
+    analyzer.model = quantize_dynamic_int8(analyzer.model, inplace=True)
+    int8_results, int8_seconds = run_model(analyzer, tensors, sizes, args.batch_size, args.repeat)
+    int8_bytes = model_size_bytes(analyzer.model)
+
+    report = compare(names, fp32_results, int8_results)
+    summary = report["summary"]
+    summary.update({
+        "model": analyzer.model_path,
+        "torch_threads": torch.get_num_threads(),
+        "batch_size": args.batch_size,
+        "fp32_ms_per_image": round(fp32_seconds * 1000 / len(samples), 2),
+        "int8_ms_per_image": round(int8_seconds * 1000 / len(samples), 2),
+        "speedup": round(fp32_seconds / int8_seconds, 2),
+        "fp32_model_mb": round(fp32_bytes / 1e6, 1),
+        "int8_model_mb": round(int8_bytes / 1e6, 1),
+        "memory_saved_mb": round((fp32_bytes - int8_bytes) / 1e6, 1),
+    })
+
+    failures = []
+    if summary["score_diff_max"] > args.max_score_diff:
+        failures.append(f"authenticity_score changed by up to {summary['score_diff_max']} points")
+    for stat in STATS:
+        if summary[f"{stat}_rel_diff_max"] > args.max_stat_diff:
+            failures.append(f"{stat} changed by up to {summary[f'{stat}_rel_diff_max']:.1%}")
+    if summary["classification_agreement"] < args.min_agreement:
+        failures.append(f"classification agreement {summary['classification_agreement']:.1%}")
+    summary["passed"] = not failures
+    summary["failures"] = failures
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
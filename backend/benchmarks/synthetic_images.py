@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Synthetic Benchmark Images
+Writes one of the deterministic test images of app/testing/synthetic_images.py
+(flat, noisy, gradient or photographic-like content) to a file.
+
+Usage (from the backend directory):
+    python -m benchmarks.synthetic_images --kind photographic --megapixels 12 --format jpeg -o photo.jpg
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.testing import FORMATS, KINDS, synthetic_image_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic benchmark image")
+    parser.add_argument('--kind', choices=KINDS, default="photographic")
+    parser.add_argument('--megapixels', type=float, default=1.0)
+    parser.add_argument('--format', choices=FORMATS, default="jpeg")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', required=True, help="Output file ('-' for stdout)")
+    args = parser.parse_args()
+
+    data = synthetic_image_bytes(args.kind, args.megapixels, args.format, args.seed)
+    if args.output == "-":
+        sys.stdout.buffer.write(data)
+    else:
+        with open(args.output, "wb") as f:
+            f.write(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+APEX VERIFY AI - Texture Analysis Benchmark
+Measures the per-megapixel cost of image_analysis.neighbor_variance and
+checks it against the original per-pixel loop on small images.
+
+Usage (from the backend directory):
+    python -m benchmarks.texture_benchmark [--sizes 0.1 1 12] [--repeat 5]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import numpy as np
+
+# Allow running as a plain script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_analysis import neighbor_variance
+
+
+def legacy_neighbor_variance(gray: np.ndarray):
+    """Reference implementation: the original nested Python loop."""
+    height, width = gray.shape
+    pixels = gray.ravel().tolist()
+    variance_sum = 0
+    sample_count = 0
+
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            center = pixels[y * width + x]
+            neighbors = [
+                pixels[(y-1) * width + x],
+                pixels[(y+1) * width + x],
+                pixels[y * width + (x-1)],
+                pixels[y * width + (x+1)]
+            ]
+            variance = sum((center - n) ** 2 for n in neighbors) / len(neighbors)
+            variance_sum += variance
+            sample_count += 1
+
+    return variance_sum / sample_count if sample_count else None
+
+
+def synthetic_gray(megapixels: float, seed: int = 0) -> np.ndarray:
+    """Deterministic 4:3 grayscale image with gradient and noise."""
+    height = max(3, int(round((megapixels * 1e6 * 3 / 4) ** 0.5)))
+    width = max(3, int(round(height * 4 / 3)))
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :]
+    noise = rng.normal(0, 12, size=(height, width)).astype(np.float32)
+    return np.clip(gradient + noise, 0, 255).astype(np.uint8)
+
+
+def _best_time(func, arg, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: List[float], repeat: int, legacy_max_mp: float) -> List[Dict[str, Any]]:
+    results = []
+    for megapixels in sizes:
+        gray = synthetic_gray(megapixels)
+        actual_mp = gray.size / 1e6
+        seconds = _best_time(neighbor_variance, gray, repeat)
+
+        entry = {
+            "megapixels": round(actual_mp, 3),
+            "shape": list(gray.shape),
+            "vectorized_ms": round(seconds * 1000, 3),
+            "vectorized_ms_per_mp": round(seconds * 1000 / actual_mp, 3),
+            "average_variance": round(neighbor_variance(gray), 2),
+        }
+
+        if actual_mp <= legacy_max_mp:
+            legacy_seconds = _best_time(legacy_neighbor_variance, gray, 1)
+            legacy_value = round(legacy_neighbor_variance(gray), 2)
+            entry.update({
+                "legacy_ms": round(legacy_seconds * 1000, 3),
+                "legacy_ms_per_mp": round(legacy_seconds * 1000 / actual_mp, 3),
+                "speedup": round(legacy_seconds / seconds, 1),
+                "matches_legacy": legacy_value == entry["average_variance"],
+            })
+
+        results.append(entry)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark texture analysis")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.1, 0.5, 1, 4, 12, 24],
+                        help="Image sizes in megapixels")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per size (best is reported)")
+    parser.add_argument('--legacy-max-mp', type=float, default=0.5,
+                        help="Largest size to also run through the legacy loop")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.legacy_max_mp)
+    print(json.dumps(results, indent=2))
+
+    if any(r.get("matches_legacy") is False for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
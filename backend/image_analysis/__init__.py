@@ -0,0 +1,15 @@
+# Image Analysis Package
+from .context import ImageContext
+from .texture import neighbor_variance
+from .color import color_clustering, unique_colors
+from .blocks import block_stats, window_stats, integral_image, variance_uniformity
+from .frequency import center_line_spectra
+from .executor import Analyzer, AnalyzerExecutor
+from .shared import share_image, attach_image
+
+__all__ = [
+    'ImageContext', 'neighbor_variance', 'color_clustering', 'unique_colors',
+    'block_stats', 'window_stats', 'integral_image', 'variance_uniformity',
+    'center_line_spectra', 'Analyzer', 'AnalyzerExecutor',
+    'share_image', 'attach_image'
+]
@@ -0,0 +1,100 @@
+import numpy as np
+
+# Largest possible distance between two RGB colors: sqrt(3 * 255^2)
+MAX_RGB_DISTANCE = 441.67
+
+# Up to this many unique colors the mean pairwise distance is computed exactly
+DEFAULT_SAMPLE_SIZE = 4096
+
+# Rows of the pairwise distance matrix materialized at a time
+_CHUNK_ROWS = 512
+
+
+def unique_colors(rgb: np.ndarray) -> np.ndarray:
+    """
+    Unique colors of an RGB image as packed 0xRRGGBB integers.
+
+    Uses a 2^24 occupancy table instead of sorting, so the cost is linear in
+    the number of pixels and memory is a fixed 16 MB.
+
+    Args:
+        rgb: (height, width, 3) uint8 array
+
+    Returns:
+        Sorted 1-D uint32 array of packed colors
+    """
+    pixels = rgb.reshape(-1, 3)
+    packed = pixels[:, 0].astype(np.uint32)
+    packed <<= 8
+    packed |= pixels[:, 1]
+    packed <<= 8
+    packed |= pixels[:, 2]
+    occupied = np.zeros(1 << 24, dtype=bool)
+    occupied[packed] = True
+    return np.flatnonzero(occupied).astype(np.uint32)
+
+
+def _unpack(packed: np.ndarray) -> np.ndarray:
+    return np.stack([(packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF], axis=1).astype(np.float64)
+
+
+def mean_pairwise_distance(colors: np.ndarray) -> float:
+    """
+    Exact mean Euclidean distance over all unordered pairs of colors.
+
+    Args:
+        colors: (n, 3) float array, n >= 2
+
+    Returns:
+        Mean pairwise distance
+    """
+    n = len(colors)
+    squared_norms = np.einsum('ij,ij->i', colors, colors)
+    total = 0.0
+    for start in range(0, n, _CHUNK_ROWS):
+        block = colors[start:start + _CHUNK_ROWS]
+        rest = colors[start:]
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, one matrix product per chunk
+        sq = squared_norms[start:start + _CHUNK_ROWS, None] + squared_norms[None, start:] - 2 * (block @ rest.T)
+        dist = np.sqrt(np.maximum(sq, 0))
+        # Keep only pairs (i, j) with j > i
+        total += float(np.triu(dist, k=1).sum(dtype=np.float64))
+    return total / (n * (n - 1) / 2)
+
+
+def color_clustering(rgb: np.ndarray, sample_size: int = DEFAULT_SAMPLE_SIZE,
+                     seed: int = 0) -> float:
+    """
+    How clustered the colors of an image are (closer to 1 = more clustered).
+
+    Defined as 1 - mean_pairwise_distance(unique colors) / MAX_RGB_DISTANCE.
+    With at most `sample_size` unique colors the value is exact. Beyond that
+    the mean is estimated from a deterministic uniform sample of `sample_size`
+    unique colors, which is an unbiased U-statistic with bounded kernel
+    (0 <= distance <= MAX_RGB_DISTANCE). By Hoeffding's inequality for
+    U-statistics the score error t satisfies
+
+        P(|error| >= t) <= 2 * exp(-2 * floor(sample_size / 2) * t^2)
+
+    i.e. for the default 4096 samples the score is within 0.04 of the exact
+    value with probability > 99.7%. Cost is O(pixels + sample_size^2)
+    regardless of how many unique colors the image has.
+
+    Args:
+        rgb: (height, width, 3) uint8 array
+        sample_size: Maximum number of unique colors used for pairwise distances
+        seed: Seed of the sampling RNG (fixed for reproducible scores)
+
+    Returns:
+        Clustering score in [0, 1], 1.0 for images with fewer than 2 colors
+    """
+    packed = unique_colors(rgb)
+    if len(packed) < 2:
+        return 1.0
+
+    if len(packed) > sample_size:
+        rng = np.random.default_rng(seed)
+        packed = rng.choice(packed, size=sample_size, replace=False)
+
+    avg_distance = mean_pairwise_distance(_unpack(packed))
+    return max(0, min(1, 1 - (avg_distance / MAX_RGB_DISTANCE)))
@@ -0,0 +1,199 @@
+import hashlib
+import io
+import threading
+from functools import cached_property
+from typing import Dict, Any, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .frequency import center_line_spectra
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+class _shared_property(cached_property):
+    """
+    cached_property computed at most once per context, even when analyzers on
+    several threads race for it. Each attribute has its own lock, so threads
+    only wait for the values they need themselves.
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        with instance._lock_for(self.attrname):
+            if self.attrname not in cache:
+                cache[self.attrname] = self.func(instance)
+            return cache[self.attrname]
+
+
+class ImageContext:
+    """
+    Per-request image state shared by every analyzer.
+
+    The raw bytes are decoded exactly once; derived representations (RGB and
+    grayscale images/arrays, downscaled pyramid levels, spectra, hash) are computed
+    lazily on first access and cached, once, even under concurrent access.
+    Arrays are returned read-only so analyzers cannot corrupt each other's
+    inputs.
+    """
+
+    def __init__(self, image_data: bytes):
+        """
+        Decode image bytes
+
+        Args:
+            image_data: Raw image bytes
+
+        Raises:
+            ValueError: If the bytes are not a decodable image
+        """
+        try:
+            image = Image.open(io.BytesIO(image_data))
+            image.load()
+        except Exception as e:
+            raise ValueError(f"Invalid image: {e}")
+
+        self._attach(image, image_data)
+
+    @classmethod
+    def from_image(cls, image: Image.Image, image_data: bytes = b"") -> "ImageContext":
+        """
+        Wrap an already decoded image (e.g. pixels shared by another process)
+
+        Args:
+            image: Decoded PIL Image
+            image_data: Original bytes, if available (needed for sha256)
+
+        Returns:
+            ImageContext
+        """
+        ctx = cls.__new__(cls)
+        ctx._attach(image, image_data)
+        return ctx
+
+    def _attach(self, image: Image.Image, image_data: bytes):
+        self.data = image_data
+        self.image = image
+        self._pyramid: Dict[int, np.ndarray] = {}
+        # One lock per derived value (attribute name, or ("pyramid", level)).
+        # Values only depend on values computed before them, so nested
+        # acquisition always follows the same order and cannot deadlock.
+        self._locks: Dict[Any, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    @property
+    def width(self) -> int:
+        return self.image.width
+
+    @property
+    def height(self) -> int:
+        return self.image.height
+
+    @property
+    def size(self) -> tuple:
+        return self.image.size
+
+    @property
+    def mode(self) -> str:
+        """Mode of the decoded source image (before any conversion)"""
+        return self.image.mode
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Format-specific metadata of the source image (Software, Comment, Exif, ...)"""
+        return self.image.info
+
+    @_shared_property
+    def info(self) -> Dict[str, Any]:
+        """Basic image information as reported by the pipelines"""
+        return {
+            "format": self.image.format,
+            "mode": self.image.mode,
+            "size": self.image.size,
+            "width": self.image.width,
+            "height": self.image.height
+        }
+
+    @_shared_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    @_shared_property
+    def rgb_image(self) -> Image.Image:
+        """Source image converted to RGB (the source itself if already RGB)"""
+        if self.image.mode == 'RGB':
+            return self.image
+        return self.image.convert('RGB')
+
+    @_shared_property
+    def gray_image(self) -> Image.Image:
+        return self.image.convert('L')
+
+    @_shared_property
+    def rgb(self) -> np.ndarray:
+        """(height, width, 3) uint8 read-only array"""
+        return _read_only(np.array(self.rgb_image))
+
+    @_shared_property
+    def gray(self) -> np.ndarray:
+        """(height, width) uint8 read-only array"""
+        return _read_only(np.array(self.gray_image))
+
+    def pyramid(self, level: int) -> np.ndarray:
+        """
+        Grayscale pyramid level, each level halving both dimensions (box filter)
+
+        Args:
+            level: 0 for full resolution, n for a 2^n downscale
+
+        Returns:
+            Read-only uint8 array
+        """
+        if level <= 0:
+            return self.gray
+
+        with self._lock_for(("pyramid", level)):
+            if level not in self._pyramid:
+                previous = Image.fromarray(self.pyramid(level - 1)) if level > 1 else self.gray_image
+                if min(previous.size) < 2:
+                    reduced = previous
+                else:
+                    reduced = previous.reduce(2)
+                self._pyramid[level] = _read_only(np.array(reduced))
+            return self._pyramid[level]
+
+    def pyramid_for(self, max_side: int) -> np.ndarray:
+        """
+        Largest grayscale pyramid level whose longer side is <= max_side
+
+        Args:
+            max_side: Maximum length of the longer side in pixels
+
+        Returns:
+            Read-only uint8 array
+        """
+        level = 0
+        longest = max(self.size)
+        while longest > max(max_side, 1):
+            longest = (longest + 1) // 2
+            level += 1
+        return self.pyramid(level)
+
+    @_shared_property
+    def center_spectra(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Zero-frequency row/column of the full-resolution log-magnitude spectrum (see center_line_spectra)"""
+        horizontal, vertical = center_line_spectra(self.gray)
+        return _read_only(horizontal), _read_only(vertical)
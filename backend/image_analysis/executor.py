@@ -0,0 +1,120 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Analyzer:
+    """
+    One node of an analyzer graph.
+
+    `func` is called with the results of `depends_on`, in that order.
+    """
+    name: str
+    func: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+class AnalyzerExecutor:
+    """
+    Runs a DAG of analyzers on a bounded thread pool.
+
+    Independent analyzers run concurrently (NumPy, PIL and torch release the
+    GIL in their heavy loops), so a request takes roughly as long as its
+    slowest dependency chain instead of the sum of all analyzers. The pool is
+    shared by all requests, which bounds total analyzer threads per process.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize executor
+
+        Args:
+            max_workers: Pool size (default: ANALYZER_MAX_WORKERS or min(8, CPU count))
+        """
+        self.max_workers = max_workers or int(os.getenv('ANALYZER_MAX_WORKERS', str(min(8, os.cpu_count() or 1))))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analyzer")
+
+    @staticmethod
+    def _validate(analyzers: List[Analyzer]):
+        names = [a.name for a in analyzers]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate analyzer names: {names}")
+
+        known = set(names)
+        for analyzer in analyzers:
+            missing = set(analyzer.depends_on) - known
+            if missing:
+                raise ValueError(f"Analyzer {analyzer.name!r} depends on unknown {sorted(missing)}")
+
+        # Kahn's algorithm: every analyzer must become runnable eventually
+        resolved = set()
+        remaining = list(analyzers)
+        while remaining:
+            runnable = [a for a in remaining if set(a.depends_on) <= resolved]
+            if not runnable:
+                raise ValueError(f"Dependency cycle among {[a.name for a in remaining]}")
+            resolved.update(a.name for a in runnable)
+            remaining = [a for a in remaining if a.name not in resolved]
+
+    @staticmethod
+    def _timed(func: Callable[..., Any], args: tuple) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        result = func(*args)
+        return result, (time.perf_counter() - start) * 1000
+
+    def run(self, analyzers: List[Analyzer]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Run every analyzer once its dependencies have finished.
+
+        If an analyzer raises, nothing new is started, analyzers already
+        running are allowed to finish and the first exception is re-raised.
+
+        Args:
+            analyzers: Graph nodes, in any order
+
+        Returns:
+            (results by name, wall time in ms by name plus "total")
+        """
+        self._validate(analyzers)
+        start = time.perf_counter()
+
+        waiting = {a.name: a for a in analyzers}
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        running: Dict[Future, str] = {}
+        error = None
+
+        while waiting or running:
+            if error is None:
+                for name, analyzer in list(waiting.items()):
+                    if all(dep in results for dep in analyzer.depends_on):
+                        args = tuple(results[dep] for dep in analyzer.depends_on)
+                        running[self._pool.submit(self._timed, analyzer.func, args)] = name
+                        del waiting[name]
+            elif not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name], timings[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Analyzer {name} failed: {e}")
+                    error = error or e
+
+        if error is not None:
+            raise error
+
+        timings = {name: round(ms, 2) for name, ms in timings.items()}
+        timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+        return results, timings
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
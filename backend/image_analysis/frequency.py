@@ -0,0 +1,31 @@
+import numpy as np
+from typing import Tuple
+
+def _log_magnitude_line(signal: np.ndarray) -> np.ndarray:
+    """Full-length log(|DFT| + 1) of a real 1-D signal, computed with a real FFT."""
+    n = signal.size
+    half = np.abs(np.fft.rfft(signal))
+    # |X[n - k]| == |X[k]| for real input; mirror the rfft bins to the full line
+    # (bin order differs from fftshift, which order-free statistics ignore)
+    full = np.concatenate([half, half[1:(n + 1) // 2][::-1]])
+    return np.log(full + 1)
+
+
+def center_line_spectra(gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zero-frequency row and column of the log-magnitude 2-D spectrum.
+
+    Exact equivalent of the center row / column of
+    log(abs(fftshift(fft2(gray))) + 1), without the 2-D transform: the
+    ky = 0 row of a 2-D DFT is the 1-D DFT of the column sums, and the
+    kx = 0 column is the 1-D DFT of the row sums. Memory is O(height + width).
+
+    Args:
+        gray: 2-D grayscale array
+
+    Returns:
+        (horizontal, vertical) float64 lines of length width / height
+    """
+    column_sums = gray.sum(axis=0, dtype=np.int64).astype(np.float64)
+    row_sums = gray.sum(axis=1, dtype=np.int64).astype(np.float64)
+    return _log_magnitude_line(column_sums), _log_magnitude_line(row_sums)
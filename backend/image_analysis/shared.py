@@ -0,0 +1,68 @@
+from multiprocessing import shared_memory
+from typing import Dict, Any, Optional, Tuple
+
+from PIL import Image
+
+# Modes whose pixels PIL can rebuild from a flat buffer with the raw decoder
+SHAREABLE_MODES = ('L', 'RGB', 'RGBA', 'CMYK', 'I', 'F')
+
+
+def share_image(image: Image.Image) -> Optional[Tuple[shared_memory.SharedMemory, Dict[str, Any]]]:
+    """
+    Copy a decoded image into a new shared memory block.
+
+    The returned handle is small and picklable, so another process can map
+    the pixels (attach_image) instead of receiving them pickled. The caller
+    owns the block and must close() and unlink() it when the receiver is done.
+
+    Args:
+        image: Decoded PIL Image
+
+    Returns:
+        (shared memory block, handle), or None if the mode cannot be shared
+        or shared memory is unavailable (e.g. /dev/shm too small)
+    """
+    if image.mode not in SHAREABLE_MODES:
+        return None
+
+    pixels = image.tobytes()
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(pixels)))
+    except OSError:
+        return None
+    try:
+        shm.buf[:len(pixels)] = pixels
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+
+    handle = {
+        "name": shm.name,
+        "mode": image.mode,
+        "size": image.size,
+        "format": image.format,
+        "info": dict(image.info),
+    }
+    return shm, handle
+
+
+def attach_image(buffer: memoryview, handle: Dict[str, Any]) -> Image.Image:
+    """
+    Image view over a buffer filled by share_image (no pixel copy).
+
+    The image references `buffer`; drop every reference to it before closing
+    the shared memory block.
+
+    Args:
+        buffer: SharedMemory.buf of the block named in the handle
+        handle: Handle returned by share_image
+
+    Returns:
+        Read-only PIL Image with the original format and metadata
+    """
+    mode = handle["mode"]
+    image = Image.frombuffer(mode, tuple(handle["size"]), buffer, 'raw', mode, 0, 1)
+    image.format = handle["format"]
+    image.info = dict(handle["info"])
+    return image
@@ -0,0 +1,43 @@
+import numpy as np
+from typing import Optional
+
+
+def neighbor_variance(gray: np.ndarray) -> Optional[float]:
+    """
+    Average 4-neighbor squared difference over all interior pixels.
+
+    Vectorized equivalent of the per-pixel loop previously used by the
+    pipelines: for every pixel not on the border, the mean of
+    (center - neighbor) ** 2 over its up/down/left/right neighbors, averaged
+    over all interior pixels.
+
+    Args:
+        gray: 2-D uint8 (or integer) grayscale array
+
+    Returns:
+        Average variance, or None if the image has no interior pixels
+    """
+    height, width = gray.shape
+    if height < 3 or width < 3:
+        return None
+
+    pixels = gray.astype(np.int32, copy=False)
+
+    # Squared differences between vertically / horizontally adjacent pixels,
+    # restricted to the columns / rows that touch an interior pixel.
+    vertical = np.square(pixels[1:, 1:-1] - pixels[:-1, 1:-1])
+    horizontal = np.square(pixels[1:-1, 1:] - pixels[1:-1, :-1])
+
+    # Every inner edge is shared by two interior pixels, the outermost edges
+    # by only one, so sum everything twice and subtract the outer rows/columns once.
+    total = (
+        2 * int(vertical.sum(dtype=np.int64))
+        - int(vertical[0].sum(dtype=np.int64))
+        - int(vertical[-1].sum(dtype=np.int64))
+        + 2 * int(horizontal.sum(dtype=np.int64))
+        - int(horizontal[:, 0].sum(dtype=np.int64))
+        - int(horizontal[:, -1].sum(dtype=np.int64))
+    )
+
+    sample_count = (height - 2) * (width - 2)
+    return (total / 4) / sample_count
@@ -1,9 +1,12 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import uvicorn
+from fastapi.responses import JSONResponse, Response
 from ai_pipeline import ai_pipeline
+from app.services.result_cache import ResultCache
+from app.services.analysis_pool import AnalysisPool, PoolSaturatedError
+from app.services.metrics import CONTENT_TYPE_LATEST, render_latest, stage_breakdown, timed
 import os
+import hashlib
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,6 +18,12 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Verification results keyed on the SHA-256 of the upload
+result_cache = ResultCache(namespace="verify")
+
+# CPU-bound analysis runs here, off the event loop, with bounded admission
+analysis_pool = AnalysisPool()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -34,7 +43,8 @@ async def root():
         "endpoints": {
             "health": "/health",
             "verify": "/verify",
-            "status": "/status"
+            "status": "/status",
+            "metrics": "/metrics"
         },
         "features": [
             "AI-powered image analysis",
@@ -45,6 +55,11 @@ async def root():
         ]
     }
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop analysis workers"""
+    analysis_pool.shutdown()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -58,12 +73,14 @@ async def health_check():
     }
 
 @app.post("/verify")
-async def verify_image(file: UploadFile = File(...)):
+@timed("verify")
+async def verify_image(file: UploadFile = File(...), timings: bool = False):
     """
     Verify image authenticity using AI pipeline.
     
     Args:
         file: Image file to verify
+        timings: Add "stage_timings_ms" (milliseconds per pipeline stage)
         
     Returns:
         Verification result with authenticity score and analysis
@@ -79,12 +96,30 @@ async def verify_image(file: UploadFile = File(...)):
         if len(image_data) == 0:
             raise HTTPException(status_code=400, detail="Empty file")
         
-        # Analyze image with AI pipeline
-        result = ai_pipeline.analyze_image(image_data)
+        with stage_breakdown() as stages:
+            # Previously verified image: return the stored result
+            image_hash = hashlib.sha256(image_data).hexdigest()
+            cached = result_cache.get(image_hash)
+            if cached is not None:
+                cached["cached"] = True
+                return cached
+            
+            # Analyze image with AI pipeline (admission covers only its CPU work)
+            try:
+                result = await ai_pipeline.analyze_image_async(image_data, pool=analysis_pool)
+            except PoolSaturatedError as e:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server busy, please retry",
+                    headers={"Retry-After": str(e.retry_after)}
+                )
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
         
+        result_cache.set(image_hash, result)
+        if timings:
+            result["stage_timings_ms"] = {stage: round(ms, 2) for stage, ms in stages.items()}
         return result
         
     except HTTPException:
@@ -92,6 +127,11 @@ async def verify_image(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage latency histograms, in-flight stages, cache and Gemini counters."""
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/status")
 async def get_status():
     """Get system status and configuration."""
@@ -111,10 +151,13 @@ async def get_status():
         },
         "configuration": {
             "gemini_api_configured": bool(os.getenv('GEMINI_API_KEY')),
+            "result_cache": result_cache.get_stats(),
+            "analysis_pool": analysis_pool.get_stats(),
             "max_file_size": "10MB",
             "supported_formats": ["JPEG", "PNG", "GIF", "BMP", "TIFF"]
         }
     }
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8014)
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Run from the backend directory layout: `app.*`, `image_analysis` and
+# `benchmarks` import as they do in the flat scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
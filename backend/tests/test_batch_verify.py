@@ -0,0 +1,61 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app import main
+
+
+def _png(seed: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), (seed * 40, 0, 0)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def verify_content(file_content, start_time, report_mode='gemini', scheduler=None, on_event=None):
+        # Still running when the producer reaches the batch limit
+        await asyncio.sleep(0.2)
+        return {"success": True}
+
+    monkeypatch.setattr(main, "_verify_content", verify_content)
+    monkeypatch.setattr(main, "dinov3_analyzer", object())
+    monkeypatch.setattr(main, "batch_scheduler", SimpleNamespace(max_batch_size=8))
+    # Without a context manager TestClient skips the startup event (model loading)
+    return TestClient(main.app)
+
+
+def test_batch_limit_keeps_accepted_images(client, monkeypatch):
+    monkeypatch.setenv("BATCH_VERIFY_MAX_IMAGES", "3")
+    files = [("files", (f"{i}.png", _png(i), "image/png")) for i in range(5)]
+    response = client.post("/api/verify/batch", params={"report": "none"}, files=files)
+    assert response.status_code == 200
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results, summary = lines[:-1], lines[-1]["summary"]
+
+    accepted = [line for line in results if line["success"]]
+    assert sorted(line["filename"] for line in accepted) == ["0.png", "1.png", "2.png"]
+    rejected = [line for line in results if not line["success"]]
+    assert len(rejected) == 1
+    assert rejected[0]["status_code"] == 413 and rejected[0]["filename"] == "3.png"
+    # Reported after the accepted images have finished
+    assert results[-1] == rejected[0]
+
+    assert summary["images"] == 4
+    assert summary["succeeded"] == 3
+    assert summary["failed"] == 1
+
+
+def test_batch_under_limit_verifies_every_image(client, monkeypatch):
+    monkeypatch.setenv("BATCH_VERIFY_MAX_IMAGES", "10")
+    files = [("files", (f"{i}.png", _png(i), "image/png")) for i in range(5)]
+    lines = [json.loads(line) for line in client.post("/api/verify/batch", files=files).text.splitlines()]
+
+    assert sorted(line["index"] for line in lines[:-1]) == list(range(5))
+    assert lines[-1]["summary"]["succeeded"] == 5
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+from app.services.gemini_client import GeminiClient
+
+
+def _bind(client: GeminiClient, clients: list):
+    async def bind():
+        clients.append(await client._get_async_client())
+    return bind()
+
+
+def test_client_is_reused_on_the_same_loop():
+    client = GeminiClient(api_key="key")
+    clients = []
+
+    async def twice():
+        await _bind(client, clients)
+        await _bind(client, clients)
+        await client.aclose()
+
+    asyncio.run(twice())
+    assert clients[0] is clients[1] and clients[0].is_closed
+
+
+def test_new_event_loop_closes_the_previous_client():
+    client = GeminiClient(api_key="key")
+    clients = []
+    asyncio.run(_bind(client, clients))
+    asyncio.run(_bind(client, clients))
+    assert clients[0].is_closed and not clients[1].is_closed
+
+    asyncio.run(client.aclose())
+    assert clients[1].is_closed
+
+
+def test_previous_client_is_closed_on_its_own_running_loop():
+    client = GeminiClient(api_key="key")
+    clients = []
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(_bind(client, clients), loop).result(timeout=5)
+        asyncio.run(_bind(client, clients))
+        # Closing is scheduled on the other loop; wait for it to run
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(timeout=5)
+        assert clients[0].is_closed and not clients[1].is_closed
+    finally:
+        asyncio.run(client.aclose())
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from app.services.job_queue import SQLiteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), visibility_timeout=0.05, max_attempts=3)
+    yield queue
+    queue.close()
+
+
+def test_complete_stores_result(queue):
+    job_id = queue.submit(b"image", {"report": "none"})
+    job = queue.claim(timeout=0)
+    assert (job.id, job.payload, job.options, job.attempts) == (job_id, b"image", {"report": "none"}, 1)
+
+    assert queue.complete(job.id, {"ok": True}, job.attempts)
+    view = queue.get(job_id)
+    assert view["status"] == "completed" and view["result"] == {"ok": True}
+
+
+def test_expired_lease_is_claimed_again(queue):
+    job_id = queue.submit(b"image")
+    assert queue.claim(timeout=0).attempts == 1
+    assert queue.claim(timeout=0) is None
+    time.sleep(0.1)
+    retry = queue.claim(timeout=0)
+    assert retry.id == job_id and retry.attempts == 2
+
+
+def test_stale_attempt_cannot_finish_the_job(queue):
+    job_id = queue.submit(b"image")
+    first = queue.claim(timeout=0)
+    time.sleep(0.1)
+    second = queue.claim(timeout=0)
+
+    # The first worker finishes after its lease expired and the job was handed out again
+    assert not queue.complete(job_id, {"from": "first"}, first.attempts)
+    assert not queue.fail(job_id, "late failure", first.attempts)
+    view = queue.get(job_id)
+    assert view["status"] == "running" and "result" not in view and "error" not in view
+
+    assert queue.complete(job_id, {"from": "second"}, second.attempts)
+    assert queue.get(job_id)["result"] == {"from": "second"}
+    # A finished job stays finished
+    assert not queue.fail(job_id, "late failure", second.attempts)
+    assert queue.get(job_id)["status"] == "completed"
+
+
+def test_abandoned_job_fails_after_max_attempts(queue):
+    job_id = queue.submit(b"image")
+    for attempt in range(1, 4):
+        assert queue.claim(timeout=0).attempts == attempt
+        time.sleep(0.1)
+    assert queue.claim(timeout=0) is None
+    view = queue.get(job_id)
+    assert view["status"] == "failed" and view["error"] == "Job abandoned by its worker"
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.services.near_duplicate_index import NearDuplicateIndex, perceptual_hash, perceptual_hash_bytes
+from app.testing import synthetic_image
+
+PHOTO_SEEDS = range(6)
+
+
+def _encode(image: Image.Image, fmt: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+
+def _copies(image: Image.Image):
+    """Re-uploads that should be recognized as the same image"""
+    return {
+        "jpeg_q50": _encode(image, "JPEG", quality=50),
+        "jpeg_q90": _encode(image, "JPEG", quality=90),
+        "half_size": _encode(image.resize((image.width // 2, image.height // 2), Image.BILINEAR), "JPEG", quality=85),
+        "png": _encode(image, "PNG"),
+    }
+
+
+@pytest.fixture(scope="module")
+def photos():
+    return {seed: synthetic_image("photographic", 0.5, seed=seed) for seed in PHOTO_SEEDS}
+
+
+def test_recompressed_and_resized_copies_match(photos):
+    index = NearDuplicateIndex(max_distance=6, enabled=True)
+    for seed, photo in photos.items():
+        index.add(perceptual_hash_bytes(_encode(photo, "JPEG", quality=90)), f"sha-{seed}")
+
+    for seed, photo in photos.items():
+        for name, data in _copies(photo).items():
+            match = index.lookup(perceptual_hash_bytes(data))
+            assert match is not None, f"photo {seed} {name} not found"
+            assert match[0] == f"sha-{seed}", f"photo {seed} {name} matched {match[0]}"
+
+
+def test_different_images_do_not_match(photos):
+    hashes = {seed: perceptual_hash(photo) for seed, photo in photos.items()}
+    for seed, phash in hashes.items():
+        index = NearDuplicateIndex(max_distance=6, enabled=True)
+        for other, other_hash in hashes.items():
+            if other != seed:
+                index.add(other_hash, f"sha-{other}")
+        assert index.lookup(phash) is None, f"photo {seed} matched another photo"
+
+
+@pytest.mark.parametrize("kind", ["flat", "gradient", "noisy"])
+def test_featureless_images_are_not_hashed(kind):
+    for seed in range(3):
+        image = synthetic_image(kind, 0.5, seed=seed)
+        assert perceptual_hash(image) is None
+        for name, data in _copies(image).items():
+            assert perceptual_hash_bytes(data) is None, f"{kind} {seed} {name} was hashed"
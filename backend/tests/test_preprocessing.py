@@ -0,0 +1,64 @@
+import io
+
+import pytest
+import torch
+from PIL import Image
+
+from app.models.preprocessing import INPUT_SIZE, batch_tensor, resize_center_crop_uint8
+from app.testing import synthetic_image_bytes, tiny_dinov3_analyzer
+
+# Normalized units (1.0 is about 58 gray levels); as in benchmarks/preprocess_benchmark.py
+MAX_DIFF = 0.5
+MAX_MEAN_DIFF = 0.05
+
+CPU = torch.device("cpu")
+
+
+@pytest.fixture(scope="module")
+def reference_transform():
+    """The torchvision transform DINOv3Analyzer uses with DINOV3_FAST_PREPROCESS=false"""
+    return tiny_dinov3_analyzer().transform
+
+
+@pytest.mark.parametrize("megapixels", [0.3, 2.0, 6.0])
+@pytest.mark.parametrize("fmt", ["jpeg", "png", "webp"])
+@pytest.mark.parametrize("kind", ["photographic", "noisy", "gradient"])
+def test_fast_path_matches_torchvision_transform(reference_transform, kind, fmt, megapixels):
+    data = synthetic_image_bytes(kind, megapixels, fmt)
+    with Image.open(io.BytesIO(data)) as image:
+        reference = reference_transform(image.convert("RGB"))
+    with Image.open(io.BytesIO(data)) as image:
+        fast = batch_tensor([resize_center_crop_uint8(image)], CPU)[0]
+
+    assert fast.shape == reference.shape == (3, INPUT_SIZE, INPUT_SIZE)
+    diff = (fast - reference).abs()
+    assert diff.max().item() <= MAX_DIFF
+    assert diff.mean().item() <= MAX_MEAN_DIFF
+
+
+@pytest.mark.parametrize("size", [(640, 480), (480, 640), (300, 200), (200, 200)])
+def test_crop_geometry_matches_for_any_aspect_ratio(reference_transform, size):
+    data = synthetic_image_bytes("photographic", size[0] * size[1] / 1e6, "png")
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.resize(size, Image.BICUBIC)
+    reference = reference_transform(image)
+    fast = batch_tensor([resize_center_crop_uint8(image.copy())], CPU)[0]
+    assert (fast - reference).abs().mean().item() <= MAX_MEAN_DIFF
+
+
+def test_jpeg_input_is_consumed_by_draft_decode():
+    data = synthetic_image_bytes("photographic", 6.0, "jpeg")
+    with Image.open(io.BytesIO(data)) as image:
+        original_size = image.size
+        resize_center_crop_uint8(image)
+        assert image.width < original_size[0] and image.height < original_size[1]
+
+
+def test_batch_tensor_normalizes_uint8_like_float_inputs(reference_transform):
+    images = [Image.open(io.BytesIO(synthetic_image_bytes("photographic", 0.3, "png", seed=seed)))
+              for seed in range(3)]
+    uint8 = batch_tensor([resize_center_crop_uint8(image.copy()) for image in images], CPU)
+    floats = batch_tensor([reference_transform(image.convert("RGB")) for image in images], CPU)
+    assert uint8.dtype == floats.dtype == torch.float32
+    assert uint8.shape == floats.shape == (3, 3, INPUT_SIZE, INPUT_SIZE)
+    assert (uint8 - floats).abs().mean().item() <= MAX_MEAN_DIFF
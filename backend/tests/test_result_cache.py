@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from app.services.result_cache import ResultCache
+
+
+def _disk_keys(db_path) -> set:
+    with sqlite3.connect(db_path) as conn:
+        return {row[0] for row in conn.execute("SELECT key FROM results")}
+
+
+def test_purge_uses_the_expires_at_index(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    ResultCache(db_path=db_path, enabled=True)
+    with sqlite3.connect(db_path) as conn:
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM results WHERE expires_at <= 0"))
+    assert "results_expires" in plan
+
+
+def test_expired_rows_are_purged_every_interval(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = ResultCache(db_path=db_path, enabled=True, ttl_seconds=0.05, purge_interval=3)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    time.sleep(0.1)
+    cache.set("c", {"n": 3})
+    # Third write: purged down to the row that has not expired
+    assert _disk_keys(db_path) == {"c"}
+
+    time.sleep(0.1)
+    cache.set("d", {"n": 4})
+    # Between purges expired rows stay on disk but are never served
+    assert _disk_keys(db_path) == {"c", "d"}
+    assert ResultCache(db_path=db_path, enabled=True).get("c") is None
+
+
+def test_disk_tier_is_trimmed_to_max_entries(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = ResultCache(db_path=db_path, enabled=True, max_disk_entries=4, purge_interval=5)
+    for i in range(10):
+        cache.set(f"key-{i}", {"n": i})
+    # Purged after the 5th and 10th write, keeping the newest rows
+    assert _disk_keys(db_path) == {f"key-{i}" for i in range(6, 10)}
+
+    other = ResultCache(db_path=db_path, enabled=True)
+    assert other.get("key-9") == {"n": 9}
+    assert other.get("key-0") is None
@@ -1,20 +1,18 @@
 import os
-import hashlib
 import json
-import base64
+import threading
 import numpy as np
-import torch
-import torch.nn as nn
-import torchvision.transforms as transforms
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from PIL import Image
-import io
-import requests
 from datetime import datetime
 import logging
-from google.cloud import aiplatform
-from google.cloud import storage
-import tensorflow as tf
+
+from image_analysis import (
+    ImageContext, neighbor_variance, color_clustering, block_stats, variance_uniformity,
+    Analyzer, AnalyzerExecutor
+)
+from app.services.gemini_client import get_gemini_client
+from app.services.metrics import record_stage, timed
 
 # Configure logging for Vertex AI
 logging.basicConfig(level=logging.INFO)
@@ -28,12 +26,12 @@ class AdvancedDeepfakeDetector:
     
     def __init__(self):
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-        self.gemini_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro-vision:generateContent"
+        self.gemini_client = get_gemini_client()
         self.vertex_project = os.getenv('GOOGLE_CLOUD_PROJECT', 'apex-ai-467219')
         self.vertex_region = os.getenv('GOOGLE_CLOUD_REGION', 'us-central1')
         
-        # Initialize Vertex AI
-        aiplatform.init(project=self.vertex_project, location=self.vertex_region)
+        # Vertex AI SDK is initialized on first use (see init_vertex_ai)
+        self.vertex_ai_initialized = False
         
         # DINOv3 model configuration
         self.dinov3_model_path = os.getenv('DINOV3_MODEL_PATH', '/app/dinov3_model.pth')
@@ -85,15 +83,31 @@ class AdvancedDeepfakeDetector:
             }
         }
         
+        # Bounded pool running independent analyzers concurrently
+        self.analyzer_executor = AnalyzerExecutor()
+        
         # Initialize GPU models if available
+        import torch
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         logger.info(f"Using device: {self.device}")
         
         # Load pre-trained models for feature extraction
         self._load_models()
     
+    def init_vertex_ai(self):
+        """Import and initialize the Vertex AI SDK on first call."""
+        if self.vertex_ai_initialized:
+            return
+        from google.cloud import aiplatform
+        
+        aiplatform.init(project=self.vertex_project, location=self.vertex_region)
+        self.vertex_ai_initialized = True
+    
     def _load_models(self):
         """Load pre-trained models for advanced feature extraction."""
+        import torch
+        import torchvision.transforms as transforms
+        
         try:
             # Load DINOv3 model if available
             if self.dinov3_available:
@@ -105,18 +119,10 @@ class AdvancedDeepfakeDetector:
                 self.dinov3_model = None
             
             # Load EfficientNet for feature extraction
-            self.efficientnet = torch.hub.load('pytorch/vision:v0.10.0', 
-                                             'efficientnet_b0', 
-                                             pretrained=True)
-            self.efficientnet.eval()
-            self.efficientnet.to(self.device)
+            self.efficientnet = self._load_backbone('EFFICIENTNET_MODEL_PATH', 'efficientnet_b0')
             
             # Load Vision Transformer for attention analysis
-            self.vit = torch.hub.load('pytorch/vision:v0.10.0', 
-                                    'vit_b_16', 
-                                    pretrained=True)
-            self.vit.eval()
-            self.vit.to(self.device)
+            self.vit = self._load_backbone('VIT_MODEL_PATH', 'vit_b_16')
             
             # Image preprocessing for DINOv3
             self.dinov3_transform = transforms.Compose([
@@ -144,9 +150,31 @@ class AdvancedDeepfakeDetector:
             self.efficientnet = None
             self.vit = None
     
+    def _load_backbone(self, path_env: str, entrypoint: str):
+        """Load a compiled artifact from `path_env` if set (no hub code), else build from torch.hub."""
+        import torch
+        
+        path = os.getenv(path_env)
+        if path:
+            from app.models.model_artifact import load_model_artifact
+            return load_model_artifact(path, self.device)
+        
+        model = torch.hub.load('pytorch/vision:v0.10.0', entrypoint, pretrained=True)
+        model.eval()
+        model.to(self.device)
+        return model
+    
     def _load_dinov3_model(self):
         """Load DINOv3 model for advanced feature extraction."""
         try:
+            import torch
+            
+            # Converted artifact: local architecture, memory-mapped weights, no network
+            # (or a compiled TorchScript/ONNX export, see app/models/compiled_model.py)
+            from app.models.model_artifact import is_model_artifact, load_model_artifact
+            if is_model_artifact(self.dinov3_model_path):
+                return load_model_artifact(self.dinov3_model_path, self.device)
+            
             # Import DINOv3 from Facebook Research
             import torch.hub
             
@@ -179,122 +207,183 @@ class AdvancedDeepfakeDetector:
         """
         try:
             logger.info("Starting advanced deepfake analysis with DINOv3")
+            ctx, features, ai_model_analysis = self._run_local_analysis(image_data)
             
-            # Step 1: Basic image validation
-            image_info = self._validate_image(image_data)
+            # Step 5: DINOv3 + Gemini Pro Vision analysis (KEY INTEGRATION)
+            gemini_analysis = self._analyze_with_gemini_and_dinov3(ctx, features)
             
-            # Step 2: Calculate image hash
-            image_hash = hashlib.sha256(image_data).hexdigest()
+            return self._build_result(ctx, features, ai_model_analysis, gemini_analysis)
             
-            # Step 3: Advanced feature extraction with DINOv3 and GPU models
-            features = self._extract_advanced_features(image_data)
+        except Exception as e:
+            return self._failed_result(e)
+    
+    async def analyze_image_async(self, image_data: bytes) -> Dict[str, Any]:
+        """
+        Same pipeline as analyze_image, but the Gemini round trip is awaited
+        on the shared connection pool instead of blocking the event loop.
+        
+        Args:
+            image_data: Raw image bytes
             
-            # Step 4: AI model fingerprinting
-            ai_model_analysis = self._identify_ai_model(features, image_info)
+        Returns:
+            Comprehensive analysis with AI model identification
+        """
+        try:
+            logger.info("Starting advanced deepfake analysis with DINOv3")
+            ctx, features, ai_model_analysis = self._run_local_analysis(image_data)
             
             # Step 5: DINOv3 + Gemini Pro Vision analysis (KEY INTEGRATION)
-            gemini_analysis = self._analyze_with_gemini_and_dinov3(image_data, features)
-            
-            # Step 6: Advanced anomaly detection
-            anomaly_analysis = self._detect_advanced_anomalies(features, image_data)
-            
-            # Step 7: Calculate comprehensive score
-            authenticity_score = self._calculate_advanced_score(
-                features, gemini_analysis, ai_model_analysis, anomaly_analysis
-            )
-            
-            verdict = self._get_verdict(authenticity_score)
-            
-            # Step 8: Create comprehensive result
-            result = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "image_hash": image_hash,
-                "image_info": image_info,
-                "authenticity_score": authenticity_score,
-                "verdict": verdict,
-                "confidence": self._get_confidence(authenticity_score),
-                "ai_model_detection": ai_model_analysis,
-                "analysis": {
-                    "features": features,
-                    "gemini_analysis": gemini_analysis,  # This is what frontend displays
-                    "anomaly_analysis": anomaly_analysis,
-                    "dinov3_features": features.get('dinov3_features', {})
-                },
-                "recommendations": self._get_recommendations(verdict, authenticity_score),
-                "vertex_ai_deployment": {
-                    "status": "active",
-                    "gpu_accelerated": torch.cuda.is_available(),
-                    "region": self.vertex_region,
-                    "project": self.vertex_project,
-                    "dinov3_loaded": self.dinov3_model is not None
-                }
-            }
+            gemini_analysis = await self._analyze_with_gemini_and_dinov3_async(ctx, features)
             
-            logger.info(f"Analysis completed. Verdict: {verdict}, Score: {authenticity_score}")
-            return result
+            return self._build_result(ctx, features, ai_model_analysis, gemini_analysis)
             
         except Exception as e:
-            logger.error(f"Analysis failed: {e}")
-            return {
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
-                "status": "failed"
+            return self._failed_result(e)
+    
+    def _run_local_analysis(self, image_data: bytes) -> Tuple[ImageContext, Dict[str, Any], Dict[str, Any]]:
+        """Steps 1-4: decode, validate, extract features and fingerprint the AI model."""
+        # Step 1: Decode once and validate
+        ctx = self._validate_image(image_data)
+        
+        # Step 2: Image hash is computed lazily by the context (ctx.sha256)
+        
+        # Step 3: Advanced feature extraction with DINOv3 and GPU models
+        features = self._extract_advanced_features(ctx)
+        
+        # Step 4: AI model fingerprinting
+        ai_model_analysis = self._identify_ai_model(features, ctx.info)
+        
+        return ctx, features, ai_model_analysis
+    
+    @timed("scoring")
+    def _build_result(self, ctx: ImageContext, features: Dict[str, Any],
+                      ai_model_analysis: Dict[str, Any], gemini_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Steps 6-8: anomaly detection, scoring and the comprehensive result."""
+        # Step 6: Advanced anomaly detection
+        anomaly_analysis = self._detect_advanced_anomalies(features, ctx.data)
+        
+        # Step 7: Calculate comprehensive score
+        authenticity_score = self._calculate_advanced_score(
+            features, gemini_analysis, ai_model_analysis, anomaly_analysis
+        )
+        
+        verdict = self._get_verdict(authenticity_score)
+        
+        # Step 8: Create comprehensive result
+        result = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "image_hash": ctx.sha256,
+            "image_info": ctx.info,
+            "authenticity_score": authenticity_score,
+            "verdict": verdict,
+            "confidence": self._get_confidence(authenticity_score),
+            "ai_model_detection": ai_model_analysis,
+            "analysis": {
+                "features": features,
+                "gemini_analysis": gemini_analysis,  # This is what frontend displays
+                "anomaly_analysis": anomaly_analysis,
+                "dinov3_features": features.get('dinov3_features', {})
+            },
+            "recommendations": self._get_recommendations(verdict, authenticity_score),
+            "vertex_ai_deployment": {
+                "status": "active",
+                "gpu_accelerated": self.device.type == 'cuda',
+                "region": self.vertex_region,
+                "project": self.vertex_project,
+                "dinov3_loaded": self.dinov3_model is not None
             }
+        }
+        
+        logger.info(f"Analysis completed. Verdict: {verdict}, Score: {authenticity_score}")
+        return result
+    
+    def _failed_result(self, error: Exception) -> Dict[str, Any]:
+        logger.error(f"Analysis failed: {error}")
+        return {
+            "error": str(error),
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "failed"
+        }
     
-    def _extract_advanced_features(self, image_data: bytes) -> Dict[str, Any]:
+    @timed("features")
+    def _extract_advanced_features(self, ctx: ImageContext) -> Dict[str, Any]:
         """Extract advanced features using DINOv3 and GPU-accelerated models."""
         try:
-            with Image.open(io.BytesIO(image_data)) as img:
-                # Convert to RGB
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                features = {}
-                
-                # DINOv3 feature extraction (KEY FEATURE)
-                if self.dinov3_model:
-                    try:
-                        dinov3_features = self._extract_dinov3_features(img)
-                        features['dinov3_features'] = dinov3_features
-                        logger.info("DINOv3 features extracted successfully")
-                    except Exception as e:
-                        logger.error(f"DINOv3 feature extraction failed: {e}")
-                        features['dinov3_features'] = {"error": str(e)}
-                
-                # Prepare image for other models
-                img_tensor = self.transform(img).unsqueeze(0).to(self.device)
-                
-                # EfficientNet features
-                if self.efficientnet:
-                    with torch.no_grad():
-                        efficientnet_features = self.efficientnet.forward_features(img_tensor)
-                        features['efficientnet_features'] = efficientnet_features.mean().item()
-                
-                # Vision Transformer attention
-                if self.vit:
-                    with torch.no_grad():
-                        vit_features = self.vit.forward_features(img_tensor)
-                        features['vit_attention'] = vit_features.mean().item()
-                
-                # Advanced image analysis
-                features.update({
-                    "resolution_analysis": self._analyze_resolution_advanced(img.size),
-                    "color_analysis": self._analyze_colors_advanced(img),
-                    "texture_analysis": self._analyze_texture_advanced(img),
-                    "composition_analysis": self._analyze_composition_advanced(img.size),
-                    "metadata_analysis": self._analyze_metadata_advanced(img),
-                    "frequency_analysis": self._analyze_frequency_domain(img),
-                    "noise_analysis": self._analyze_noise_patterns(img)
-                })
-                
-                return features
-                
+            img = ctx.rgb_image
+            
+            # None of the analyzers depends on another, except the two
+            # backbones sharing one preprocessed tensor; run them concurrently
+            analyzers = []
+            
+            # DINOv3 feature extraction (KEY FEATURE)
+            if self.dinov3_model:
+                analyzers.append(Analyzer('dinov3_features', lambda: self._extract_dinov3_features_safe(img)))
+            
+            # Prepare image for other models
+            if self.efficientnet or self.vit:
+                analyzers.append(Analyzer(
+                    'model_input', lambda: self.transform(img).unsqueeze(0).to(self.device)
+                ))
+            
+            # EfficientNet features
+            if self.efficientnet:
+                analyzers.append(Analyzer(
+                    'efficientnet_features', lambda t: self._backbone_mean(self.efficientnet, t), ('model_input',)
+                ))
+            
+            # Vision Transformer attention
+            if self.vit:
+                analyzers.append(Analyzer(
+                    'vit_attention', lambda t: self._backbone_mean(self.vit, t), ('model_input',)
+                ))
+            
+            # Advanced image analysis
+            analyzers += [
+                Analyzer('resolution_analysis', lambda: self._analyze_resolution_advanced(ctx.size)),
+                Analyzer('color_analysis', lambda: self._analyze_colors_advanced(ctx)),
+                Analyzer('texture_analysis', lambda: self._analyze_texture_advanced(ctx)),
+                Analyzer('composition_analysis', lambda: self._analyze_composition_advanced(ctx.size)),
+                Analyzer('metadata_analysis', lambda: self._analyze_metadata_advanced(ctx)),
+                Analyzer('frequency_analysis', lambda: self._analyze_frequency_domain(ctx)),
+                Analyzer('noise_analysis', lambda: self._analyze_noise_patterns(ctx))
+            ]
+            
+            results, timings = self.analyzer_executor.run(analyzers)
+            for name, ms in timings.items():
+                if name != "total":
+                    record_stage(f"analyzer.{name}", ms / 1000)
+            
+            features = {a.name: results[a.name] for a in analyzers if a.name != 'model_input'}
+            features['analyzer_timings_ms'] = timings
+            return features
+            
         except Exception as e:
             logger.error(f"Advanced feature extraction failed: {e}")
             return {"error": f"Feature extraction failed: {e}"}
     
+    def _extract_dinov3_features_safe(self, img: Image.Image) -> Dict[str, Any]:
+        """DINOv3 features, or an error entry if extraction fails."""
+        try:
+            dinov3_features = self._extract_dinov3_features(img)
+            logger.info("DINOv3 features extracted successfully")
+            return dinov3_features
+        except Exception as e:
+            logger.error(f"DINOv3 feature extraction failed: {e}")
+            return {"error": str(e)}
+    
+    @staticmethod
+    def _backbone_mean(model, img_tensor) -> float:
+        """Mean activation of a backbone's forward_features."""
+        import torch
+        
+        with torch.no_grad():
+            return model.forward_features(img_tensor).mean().item()
+    
     def _extract_dinov3_features(self, img: Image.Image) -> Dict[str, Any]:
         """Extract features using DINOv3 model."""
+        import torch
+        from app.models.feature_stats import batch_feature_stats_list
+        
         try:
             # Prepare image for DINOv3
             img_tensor = self.dinov3_transform(img).unsqueeze(0).to(self.device)
@@ -305,30 +394,23 @@ class AdvancedDeepfakeDetector:
                 
                 # Process features
                 if isinstance(dinov3_output, torch.Tensor):
-                    # Global features (CLS token)
-                    global_features = dinov3_output[:, 0, :]  # CLS token
-                    
-                    # Patch features (excluding CLS token)
-                    patch_features = dinov3_output[:, 1:, :]  # Patch tokens
+                    # CLS/patch statistics, diversity and consistency in one
+                    # fused pass with a single transfer to the host
+                    stats = batch_feature_stats_list(dinov3_output)[0]
+                    feature_diversity = stats["feature_diversity"]
+                    feature_consistency = stats["feature_consistency"]
                     
-                    # Calculate statistics
                     feature_stats = {
-                        "global_features_mean": global_features.mean().item(),
-                        "global_features_std": global_features.std().item(),
-                        "patch_features_mean": patch_features.mean().item(),
-                        "patch_features_std": patch_features.std().item(),
+                        "global_features_mean": stats["global_mean"],
+                        "global_features_std": stats["global_std"],
+                        "patch_features_mean": stats["patch_mean"],
+                        "patch_features_std": stats["patch_std"],
                         "feature_dimension": dinov3_output.shape[-1],
-                        "num_patches": patch_features.shape[1]
+                        "num_patches": dinov3_output.shape[1] - 1,
+                        "feature_diversity": feature_diversity,
+                        "feature_consistency": feature_consistency
                     }
                     
-                    # Calculate feature diversity (how varied the features are)
-                    feature_diversity = torch.std(patch_features, dim=1).mean().item()
-                    feature_stats["feature_diversity"] = feature_diversity
-                    
-                    # Calculate feature consistency (how consistent features are across patches)
-                    feature_consistency = torch.mean(torch.std(patch_features, dim=2)).item()
-                    feature_stats["feature_consistency"] = feature_consistency
-                    
                     # AI generation indicators based on DINOv3 features
                     ai_indicators = []
                     
@@ -355,6 +437,7 @@ class AdvancedDeepfakeDetector:
             logger.error(f"DINOv3 feature extraction error: {e}")
             return {"error": str(e)}
     
+    @timed("ai_model_fingerprint")
     def _identify_ai_model(self, features: Dict[str, Any], image_info: Dict[str, Any]) -> Dict[str, Any]:
         """Identify which AI model generated the image."""
         try:
@@ -406,24 +489,14 @@ class AdvancedDeepfakeDetector:
             logger.error(f"AI model identification failed: {e}")
             return {"error": f"Model identification failed: {e}"}
     
-    def _analyze_frequency_domain(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_frequency_domain(self, ctx: ImageContext) -> Dict[str, Any]:
         """Analyze image in frequency domain for AI artifacts."""
         try:
-            # Convert to grayscale
-            gray = img.convert('L')
-            gray_array = np.array(gray)
-            
-            # Apply FFT
-            fft = np.fft.fft2(gray_array)
-            fft_shift = np.fft.fftshift(fft)
-            magnitude_spectrum = np.log(np.abs(fft_shift) + 1)
-            
-            # Analyze frequency patterns
-            center_y, center_x = magnitude_spectrum.shape[0] // 2, magnitude_spectrum.shape[1] // 2
+            # Center lines of the shifted log-magnitude spectrum, computed
+            # from 1-D real FFTs instead of a full-resolution fft2
+            horizontal_line, vertical_line = ctx.center_spectra
             
             # Check for grid patterns (common in AI generation)
-            horizontal_line = magnitude_spectrum[center_y, :]
-            vertical_line = magnitude_spectrum[:, center_x]
             
             # Calculate grid regularity
             h_regularity = np.std(horizontal_line)
@@ -441,12 +514,10 @@ class AdvancedDeepfakeDetector:
         except Exception as e:
             return {"error": f"Frequency analysis failed: {e}"}
     
-    def _analyze_noise_patterns(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_noise_patterns(self, ctx: ImageContext) -> Dict[str, Any]:
         """Analyze noise patterns for AI generation artifacts."""
         try:
-            # Convert to grayscale
-            gray = img.convert('L')
-            gray_array = np.array(gray)
+            gray_array = ctx.gray
             
             # Calculate noise variance
             noise_variance = np.var(gray_array)
@@ -470,20 +541,21 @@ class AdvancedDeepfakeDetector:
     def _calculate_noise_uniformity(self, gray_array: np.ndarray) -> float:
         """Calculate how uniform the noise pattern is."""
         # Calculate local variance in small patches
-        patch_size = 8
-        height, width = gray_array.shape
-        variances = []
-        
-        for y in range(0, height - patch_size, patch_size):
-            for x in range(0, width - patch_size, patch_size):
-                patch = gray_array[y:y+patch_size, x:x+patch_size]
-                variances.append(np.var(patch))
+        _, variances = block_stats(self._patch_grid(gray_array, 8), 8)
         
-        if variances:
+        if variances.size:
             # Lower variance of variances = more uniform noise
-            return 1 - (np.std(variances) / np.mean(variances))
+            return variance_uniformity(variances)
         return 0.5
     
+    @staticmethod
+    def _patch_grid(gray_array: np.ndarray, patch_size: int) -> np.ndarray:
+        """Crop to the patch grid the analyzers sample (patches starting before size - patch_size)."""
+        height, width = gray_array.shape
+        rows = len(range(0, height - patch_size, patch_size))
+        cols = len(range(0, width - patch_size, patch_size))
+        return gray_array[:rows * patch_size, :cols * patch_size]
+    
     def _analyze_color_signature(self, features: Dict[str, Any], target_signatures: List[str]) -> float:
         """Analyze color signature against target AI model patterns."""
         if 'color_analysis' not in features:
@@ -618,17 +690,11 @@ class AdvancedDeepfakeDetector:
             return "low"
     
     # Include all the existing analysis methods with enhanced versions
-    def _validate_image(self, image_data: bytes) -> Dict[str, Any]:
-        """Validate and get basic image information."""
+    @timed("decode")
+    def _validate_image(self, image_data: bytes) -> ImageContext:
+        """Decode the image once; the context is shared by every analyzer."""
         try:
-            with Image.open(io.BytesIO(image_data)) as img:
-                return {
-                    "format": img.format,
-                    "mode": img.mode,
-                    "size": img.size,
-                    "width": img.width,
-                    "height": img.height
-                }
+            return ImageContext(image_data)
         except Exception as e:
             raise Exception(f"Invalid image: {e}")
     
@@ -667,11 +733,10 @@ class AdvancedDeepfakeDetector:
             "suspicious": resolution_score > 0.5
         }
     
-    def _analyze_colors_advanced(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_colors_advanced(self, ctx: ImageContext) -> Dict[str, Any]:
         """Enhanced color analysis for AI detection."""
         try:
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            img = ctx.rgb_image
             
             colors = img.getcolors(maxcolors=img.width * img.height)
             if colors:
@@ -690,7 +755,7 @@ class AdvancedDeepfakeDetector:
                     ai_indicators.append("high_color_diversity")
                 
                 # Check for color clustering (common in AI)
-                color_clustering = self._analyze_color_clustering(img)
+                color_clustering = self._analyze_color_clustering(ctx.rgb)
                 if color_clustering > 0.7:
                     color_score += 0.2
                     ai_indicators.append("color_clustering")
@@ -710,64 +775,22 @@ class AdvancedDeepfakeDetector:
         except Exception as e:
             return {"error": f"Color analysis failed: {e}"}
     
-    def _analyze_color_clustering(self, img: Image.Image) -> float:
+    def _analyze_color_clustering(self, rgb_array: np.ndarray) -> float:
         """Analyze how clustered the colors are in the image."""
         try:
-            # Convert to numpy array
-            img_array = np.array(img)
-            
-            # Calculate color distances
-            colors = img_array.reshape(-1, 3)
-            unique_colors = np.unique(colors, axis=0)
-            
-            if len(unique_colors) < 2:
-                return 1.0
-            
-            # Calculate average distance between unique colors
-            distances = []
-            for i in range(len(unique_colors)):
-                for j in range(i + 1, len(unique_colors)):
-                    dist = np.linalg.norm(unique_colors[i] - unique_colors[j])
-                    distances.append(dist)
-            
-            if distances:
-                avg_distance = np.mean(distances)
-                # Normalize to 0-1 scale (closer to 1 = more clustered)
-                return max(0, min(1, 1 - (avg_distance / 441.67)))  # 441.67 is max possible distance
-            
-            return 0.5
+            # Bounded-cost estimate over unique colors (exact for small palettes)
+            return color_clustering(rgb_array)
             
         except Exception:
             return 0.5
     
-    def _analyze_texture_advanced(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_texture_advanced(self, ctx: ImageContext) -> Dict[str, Any]:
         """Enhanced texture analysis for AI detection."""
         try:
-            gray = img.convert('L')
-            pixels = list(gray.getdata())
-            
-            width, height = gray.size
-            variance_sum = 0
-            sample_count = 0
-            
-            for y in range(1, height - 1):
-                for x in range(1, width - 1):
-                    center = pixels[y * width + x]
-                    neighbors = [
-                        pixels[(y-1) * width + x],
-                        pixels[(y+1) * width + x],
-                        pixels[y * width + (x-1)],
-                        pixels[y * width + (x+1)]
-                    ]
-                    
-                    if neighbors:
-                        variance = sum((center - n) ** 2 for n in neighbors) / len(neighbors)
-                        variance_sum += variance
-                        sample_count += 1
+            gray = ctx.gray
+            avg_variance = neighbor_variance(gray)
             
-            if sample_count > 0:
-                avg_variance = variance_sum / sample_count
-                
+            if avg_variance is not None:
                 texture_score = 0
                 ai_indicators = []
                 
@@ -797,24 +820,15 @@ class AdvancedDeepfakeDetector:
         except Exception as e:
             return {"error": f"Texture analysis failed: {e}"}
     
-    def _calculate_texture_regularity(self, gray_img: Image.Image) -> float:
+    def _calculate_texture_regularity(self, img_array: np.ndarray) -> float:
         """Calculate how regular the texture pattern is."""
         try:
-            img_array = np.array(gray_img)
-            height, width = img_array.shape
-            
             # Calculate local variance in regular grid
-            patch_size = 16
-            variances = []
+            _, variances = block_stats(self._patch_grid(img_array, 16), 16)
             
-            for y in range(0, height - patch_size, patch_size):
-                for x in range(0, width - patch_size, patch_size):
-                    patch = img_array[y:y+patch_size, x:x+patch_size]
-                    variances.append(np.var(patch))
-            
-            if variances:
+            if variances.size:
                 # Lower variance of variances = more regular texture
-                return 1 - (np.std(variances) / (np.mean(variances) + 1e-8))
+                return variance_uniformity(variances, eps=1e-8)
             return 0.5
             
         except Exception:
@@ -855,13 +869,13 @@ class AdvancedDeepfakeDetector:
             "suspicious": composition_score > 0.2
         }
     
-    def _analyze_metadata_advanced(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_metadata_advanced(self, ctx: ImageContext) -> Dict[str, Any]:
         """Enhanced metadata analysis for AI detection."""
         metadata = {}
         ai_indicators = []
         
-        if hasattr(img, 'info'):
-            info = img.info
+        if ctx.metadata:
+            info = ctx.metadata
             
             # Check for AI software indicators
             if 'Software' in info:
@@ -900,27 +914,45 @@ class AdvancedDeepfakeDetector:
         
         return metadata
     
-    def _analyze_with_gemini_and_dinov3(self, image_data: bytes, features: Dict[str, Any]) -> Dict[str, Any]:
+    @timed("gemini")
+    def _analyze_with_gemini_and_dinov3(self, ctx: ImageContext, features: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze image content with Gemini Pro Vision using DINOv3 features.
         This is the KEY integration that provides the frontend display text.
         """
         if not self.gemini_api_key:
-            return {
-                "error": "Gemini API key not configured",
-                "fallback_analysis": self._fallback_content_analysis(image_data)
-            }
+            return self._gemini_not_configured(ctx)
         
         try:
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
+            prompt = self._create_gemini_prompt(features)
+            analysis_text = self.gemini_client.generate_sync(prompt, ctx.data)
+            return self._gemini_result(ctx, analysis_text)
             
-            # Get DINOv3 analysis for Gemini
-            dinov3_analysis = ""
-            if 'dinov3_features' in features and 'error' not in features['dinov3_features']:
-                dinov3_analysis = self._format_dinov3_analysis_for_gemini(features['dinov3_features'])
+        except Exception as e:
+            return self._gemini_failed(ctx, e)
+    
+    @timed("gemini")
+    async def _analyze_with_gemini_and_dinov3_async(self, ctx: ImageContext, features: Dict[str, Any]) -> Dict[str, Any]:
+        """Non-blocking variant of _analyze_with_gemini_and_dinov3."""
+        if not self.gemini_api_key:
+            return self._gemini_not_configured(ctx)
+        
+        try:
+            prompt = self._create_gemini_prompt(features)
+            analysis_text = await self.gemini_client.generate(prompt, ctx.data)
+            return self._gemini_result(ctx, analysis_text)
             
-            # Prepare comprehensive prompt for Gemini
-            prompt = f"""
+        except Exception as e:
+            return self._gemini_failed(ctx, e)
+    
+    def _create_gemini_prompt(self, features: Dict[str, Any]) -> str:
+        """Prepare comprehensive prompt for Gemini including DINOv3 results."""
+        # Get DINOv3 analysis for Gemini
+        dinov3_analysis = ""
+        if 'dinov3_features' in features and 'error' not in features['dinov3_features']:
+            dinov3_analysis = self._format_dinov3_analysis_for_gemini(features['dinov3_features'])
+        
+        return f"""
             Analyze this image for authenticity and potential AI generation/manipulation.
             
             DINOv3 Analysis Results:
@@ -937,59 +969,30 @@ class AdvancedDeepfakeDetector:
             Provide a detailed analysis with specific observations, confidence level, and recommendations.
             Use the DINOv3 analysis to support your conclusions about authenticity.
             """
-            
-            # Prepare request payload
-            payload = {
-                "contents": [{
-                    "parts": [
-                        {"text": prompt},
-                        {
-                            "inline_data": {
-                                "mime_type": "image/jpeg",
-                                "data": image_base64
-                            }
-                        }
-                    ]
-                }],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                }
-            }
-            
-            # Make request to Gemini
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(
-                f"{self.gemini_url}?key={self.gemini_api_key}",
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and result['candidates']:
-                    content = result['candidates'][0]['content']
-                    if 'parts' in content and content['parts']:
-                        analysis_text = content['parts'][0]['text']
-                        
-                        return {
-                            "analysis": analysis_text,  # This is what the frontend displays
-                            "confidence": "high",
-                            "source": "gemini_pro_vision_with_dinov3",
-                            "dinov3_integrated": True
-                        }
-            
-            # Fallback if Gemini fails
-            return self._fallback_content_analysis(image_data)
-            
-        except Exception as e:
+    
+    def _gemini_result(self, ctx: ImageContext, analysis_text: Optional[str]) -> Dict[str, Any]:
+        if analysis_text:
             return {
-                "error": f"Gemini analysis failed: {e}",
-                "fallback_analysis": self._fallback_content_analysis(image_data)
+                "analysis": analysis_text,  # This is what the frontend displays
+                "confidence": "high",
+                "source": "gemini_pro_vision_with_dinov3",
+                "dinov3_integrated": True
             }
+        
+        # Fallback if Gemini fails
+        return self._fallback_content_analysis(ctx)
+    
+    def _gemini_not_configured(self, ctx: ImageContext) -> Dict[str, Any]:
+        return {
+            "error": "Gemini API key not configured",
+            "fallback_analysis": self._fallback_content_analysis(ctx)
+        }
+    
+    def _gemini_failed(self, ctx: ImageContext, error: Exception) -> Dict[str, Any]:
+        return {
+            "error": f"Gemini analysis failed: {error}",
+            "fallback_analysis": self._fallback_content_analysis(ctx)
+        }
     
     def _format_dinov3_analysis_for_gemini(self, dinov3_features: Dict[str, Any]) -> str:
         """Format DINOv3 features for Gemini analysis."""
@@ -1020,28 +1023,27 @@ class AdvancedDeepfakeDetector:
         except Exception as e:
             return f"DINOv3 analysis error: {e}"
     
-    def _fallback_content_analysis(self, image_data: bytes) -> Dict[str, Any]:
+    def _fallback_content_analysis(self, ctx: ImageContext) -> Dict[str, Any]:
         """Fallback content analysis when Gemini is unavailable."""
         try:
-            with Image.open(io.BytesIO(image_data)) as img:
-                analysis = {
-                    "image_type": "analyzed",
-                    "content_notes": "Basic analysis performed (Gemini unavailable)",
-                    "confidence": "medium",
-                    "source": "fallback_analysis"
-                }
-                
-                if img.mode == 'RGB':
-                    analysis["color_mode"] = "color"
-                elif img.mode == 'L':
-                    analysis["color_mode"] = "grayscale"
-                else:
-                    analysis["color_mode"] = "other"
-                
-                analysis["dimensions"] = f"{img.width}x{img.height}"
-                
-                return analysis
-                
+            analysis = {
+                "image_type": "analyzed",
+                "content_notes": "Basic analysis performed (Gemini unavailable)",
+                "confidence": "medium",
+                "source": "fallback_analysis"
+            }
+            
+            if ctx.mode == 'RGB':
+                analysis["color_mode"] = "color"
+            elif ctx.mode == 'L':
+                analysis["color_mode"] = "grayscale"
+            else:
+                analysis["color_mode"] = "other"
+            
+            analysis["dimensions"] = f"{ctx.width}x{ctx.height}"
+            
+            return analysis
+            
         except Exception as e:
             return {
                 "error": f"Fallback analysis failed: {e}",
@@ -1113,5 +1115,21 @@ class AdvancedDeepfakeDetector:
         
         return recommendations
 
-# Global instance for Vertex AI deployment
-advanced_detector = AdvancedDeepfakeDetector()
+# Global instance for Vertex AI deployment, created on first access so that
+# importing this module does not load torch or the models
+_advanced_detector: Optional[AdvancedDeepfakeDetector] = None
+_advanced_detector_lock = threading.Lock()
+
+def get_advanced_detector() -> AdvancedDeepfakeDetector:
+    """Return the global detector, loading it on first call."""
+    global _advanced_detector
+    with _advanced_detector_lock:
+        if _advanced_detector is None:
+            _advanced_detector = AdvancedDeepfakeDetector()
+        return _advanced_detector
+
+def __getattr__(name: str):
+    # Keeps `from vertex_ai_pipeline import advanced_detector` working
+    if name == 'advanced_detector':
+        return get_advanced_detector()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")